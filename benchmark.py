@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量操作端到端基准测试
+在本地模拟服务器上运行真实的 WorkerThread / APIClient 代码，
+按团队规模、服务器延迟、并发数扫描，输出每种操作的吞吐量与 P50/P95/P99 延迟。
+
+用法:
+    python benchmark.py --sizes 100,1000 --latency 20,100 --concurrency 1,5,20
+"""
+
+import sys
+import argparse
+import itertools
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, Qt
+
+from team_manager import Config, APIClient, AsyncAPIClient, AsyncWorker, create_worker
+from mock_server import MockTeam, MockTeamServer, LatencyModel, ENDPOINTS
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """最近秩百分位数，没有样本时返回 None"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RequestTimer:
+    """包装 APIClient 的传输层（以及 AsyncAPIClient 的 aiohttp 发送），记录每个请求的耗时"""
+
+    def __init__(self, api_client: APIClient, async_client: Optional[AsyncAPIClient] = None):
+        self.samples: List[float] = []
+        self._lock = threading.Lock()
+        self._request = api_client.transport.request
+        api_client.transport.request = self.request
+        if async_client is not None and async_client.uses_aiohttp:
+            # 不使用 aiohttp 时异步客户端经由上面的传输层发送，已被记录
+            self._async_send = async_client._send
+            async_client._send = self.async_send
+
+    def _record(self, started: float):
+        with self._lock:
+            self.samples.append(time.perf_counter() - started)
+
+    def request(self, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._request(method, url, **kwargs)
+        finally:
+            self._record(started)
+
+    async def async_send(self, method: str, url: str, timeout: float, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._async_send(method, url, timeout, **kwargs)
+        finally:
+            self._record(started)
+
+    def reset(self) -> List[float]:
+        with self._lock:
+            samples, self.samples = self.samples, []
+        return samples
+
+
+def make_config(base_url: str, concurrency: int, async_batch: bool) -> Config:
+    """基准专用配置：不读取也不写入用户配置文件"""
+    config = Config(os.path.join(tempfile.gettempdir(), "team_manager_benchmark_config.json"))
+    config.set('api.base_url', base_url)
+    config.set('performance.concurrent_limit', concurrency)
+    config.set('performance.async_batch', async_batch)
+    config.set('performance.async_concurrent_limit', max(concurrency, 1))
+    config.set('performance.retry_count', 3)
+    return config
+
+
+def run_worker(api_client: APIClient, operation: str, async_client=None, **kwargs) -> Tuple[bool, str, Any]:
+    """与界面相同地创建工作对象并等待完成，返回 finished 信号的参数
+
+    WorkerThread 在当前线程同步执行 run()；AsyncWorker 在事件循环线程中执行，这里等待其结束，
+    再处理事件把排队的 finished 信号送达。
+    """
+    worker = create_worker(api_client, operation, async_client=async_client, **kwargs)
+    outcome = []
+    worker.finished.connect(lambda success, message, data: outcome.append((success, message, data)),
+                            Qt.ConnectionType.DirectConnection)
+    if isinstance(worker, AsyncWorker):
+        worker.start()
+        worker.wait()
+        while not outcome:
+            QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+    else:
+        worker.run()
+    return outcome[0] if outcome else (False, "没有结果", None)
+
+
+def bench_refresh(api_client: APIClient, timer: RequestTimer, repeats: int, conditional: bool) -> Dict[str, Any]:
+    """刷新团队数据；conditional=False 时每次清除缓存校验信息，模拟完整下载"""
+    durations = []
+    failures = 0
+    run_worker(api_client, "get_team_data")  # 预热连接
+    timer.reset()
+    for _ in range(repeats):
+        if not conditional:
+            api_client.invalidate_team_cache()
+        started = time.perf_counter()
+        success, _, _ = run_worker(api_client, "get_team_data")
+        durations.append(time.perf_counter() - started)
+        failures += 0 if success else 1
+    timer.reset()
+    return {'items': repeats, 'elapsed': sum(durations), 'latencies': durations, 'failures': failures}
+
+
+def bench_batch_delete(api_client: APIClient, timer: RequestTimer, team: MockTeam,
+                       async_client=None) -> Dict[str, Any]:
+    """删除全部待处理邀请"""
+    member_ids = list(team.invitations.keys())
+    timer.reset()
+    started = time.perf_counter()
+    _, _, result = run_worker(api_client, "batch_delete", async_client=async_client, member_ids=member_ids)
+    elapsed = time.perf_counter() - started
+    failures = len(result.failed) if result is not None else len(member_ids)
+    return {'items': len(member_ids), 'elapsed': elapsed, 'latencies': timer.reset(), 'failures': failures}
+
+
+def bench_invite(api_client: APIClient, timer: RequestTimer, count: int, round_id: int,
+                 async_client=None) -> Dict[str, Any]:
+    """分块邀请 count 个新邮箱"""
+    emails = [f"bench{round_id}-{i}@example.com" for i in range(count)]
+    timer.reset()
+    started = time.perf_counter()
+    _, _, result = run_worker(api_client, "invite_members", async_client=async_client, emails=emails)
+    elapsed = time.perf_counter() - started
+    failures = len(result.failed) if result is not None else count
+    return {'items': count, 'elapsed': elapsed, 'latencies': timer.reset(), 'failures': failures}
+
+
+def format_ms(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def format_row(columns: List[str], widths: List[int]) -> str:
+    return "  ".join(column.rjust(width) for column, width in zip(columns, widths))
+
+
+def parse_list(text: str, cast: Callable = int) -> List:
+    return [cast(value) for value in text.split(',') if value.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量操作端到端基准测试")
+    parser.add_argument("--sizes", default="100,500", help="团队规模（待删除邀请数 / 成员数），逗号分隔")
+    parser.add_argument("--latency", default="20,100", help="服务器延迟中位数（毫秒），逗号分隔")
+    parser.add_argument("--p99-factor", type=float, default=3.0, help="P99 延迟 = 中位数 × 该系数")
+    parser.add_argument("--concurrency", default="1,5,20", help="performance.concurrent_limit，逗号分隔")
+    parser.add_argument("--refresh-repeats", type=int, default=20, help="每组刷新次数")
+    parser.add_argument("--invite-count", type=int, default=200, help="每组邀请的邮箱数")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="模拟服务器返回 429 的比例")
+    parser.add_argument("--async-batch", action="store_true", help="批量删除和邀请使用 AsyncWorker（AsyncAPIClient）")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    columns = ["操作", "规模", "延迟ms", "并发", "数量", "耗时s", "吞吐/s", "P50ms", "P95ms", "P99ms", "失败"]
+    widths = [10, 6, 7, 5, 6, 8, 9, 8, 8, 8, 5]
+    print(format_row(columns, widths))
+    print("-" * (sum(widths) + 2 * len(widths)))
+
+    round_ids = itertools.count()
+    for size, latency_ms, concurrency in itertools.product(
+            parse_list(args.sizes), parse_list(args.latency, float), parse_list(args.concurrency)):
+        model = LatencyModel(latency_ms, latency_ms * args.p99_factor)
+        team = MockTeam(members=size, unjoined=0, invitations=size, seed=args.seed)
+        server = MockTeamServer(team, latency={endpoint: model for endpoint in ENDPOINTS},
+                                throttle_rate=args.throttle_rate, retry_after=0.2).start()
+        try:
+            config = make_config(server.base_url, concurrency, args.async_batch)
+            api_client = APIClient(config)
+            async_client = AsyncAPIClient(api_client) if args.async_batch else None
+            timer = RequestTimer(api_client, async_client)
+
+            results = [
+                ("刷新(完整)", bench_refresh(api_client, timer, args.refresh_repeats, conditional=False)),
+                ("刷新(304)", bench_refresh(api_client, timer, args.refresh_repeats, conditional=True)),
+                ("批量删除", bench_batch_delete(api_client, timer, team, async_client)),
+                ("邀请", bench_invite(api_client, timer, args.invite_count, next(round_ids), async_client)),
+            ]
+            for name, result in results:
+                latencies_ms = [value * 1000 for value in result['latencies']]
+                throughput = result['items'] / result['elapsed'] if result['elapsed'] > 0 else 0.0
+                print(format_row([
+                    name, str(size), f"{latency_ms:g}", str(concurrency), str(result['items']),
+                    f"{result['elapsed']:.2f}", f"{throughput:.1f}",
+                    format_ms(percentile(latencies_ms, 50)), format_ms(percentile(latencies_ms, 95)),
+                    format_ms(percentile(latencies_ms, 99)), str(result['failures']),
+                ], widths))
+            if async_client is not None:
+                async_client.close()
+            api_client.transport.close()
+        finally:
+            server.stop()
+
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
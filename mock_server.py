@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+团队 API 本地模拟服务器
+模拟 APIClient 调用的 /team、/team/invite、/team/invite/{id}、/put-user-on-plan 接口，
+用于在不访问正式团队的情况下压测批量删除、邀请和刷新。
+
+用法:
+    python mock_server.py --members 500 --invitations 200 --latency all=80:400 --throttle-rate 0.02
+然后把配置中的 api.base_url 设置为 http://127.0.0.1:8765/api
+"""
+
+import sys
+import json
+import math
+import random
+import re
+import argparse
+import hashlib
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Tuple, Optional
+
+
+ENDPOINTS = ("team", "invite", "delete", "plan")
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+class LatencyModel:
+    """对数正态延迟分布，由中位数和 P99 确定"""
+
+    def __init__(self, median_ms: float = 0.0, p99_ms: Optional[float] = None):
+        self.median_ms = max(0.0, median_ms)
+        p99_ms = p99_ms if p99_ms is not None else self.median_ms
+        # P99 对应标准正态分布的 2.326 倍标准差
+        self.sigma = math.log(p99_ms / self.median_ms) / 2.326 if self.median_ms > 0 and p99_ms > self.median_ms else 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> 'LatencyModel':
+        """解析 "中位数[:P99]"（毫秒）"""
+        median, _, p99 = text.partition(':')
+        return cls(float(median), float(p99) if p99 else None)
+
+    def sample(self) -> float:
+        """采样一次延迟（秒）"""
+        if self.median_ms <= 0:
+            return 0.0
+        return self.median_ms * math.exp(random.gauss(0, self.sigma)) / 1000
+
+    def __repr__(self):
+        return f"LatencyModel(median={self.median_ms}ms, sigma={self.sigma:.2f})"
+
+
+class MockTeam:
+    """模拟的团队状态，结构与 extract_users_from_data / extract_invitations_from_data 的预期一致"""
+
+    def __init__(self, members: int = 50, unjoined: int = 10, invitations: int = 20, seed: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        now_ms = int(time.time() * 1000)
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.invitations: Dict[str, Dict[str, Any]] = {}
+        self.plan_id = "orb_community_plan"
+        for i in range(members):
+            user = {
+                "id": self._new_id(),
+                "email": f"member{i}@example.com",
+                "role": "ADMIN" if i == 0 else "MEMBER",
+                "joinedAt": now_ms - self._random.randint(1, 90) * 86400000,
+            }
+            self.users[user["id"]] = user
+        for i in range(unjoined):
+            user = {"id": self._new_id(), "email": f"unjoined{i}@example.com"}
+            self.users[user["id"]] = user
+        for i in range(invitations):
+            self._add_invitation(f"invitee{i}@example.com",
+                                 now_ms - self._random.randint(0, 7 * 86400) * 1000)
+        self.version = 0
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _add_invitation(self, email: str, invited_at: int):
+        invitation = {"id": self._new_id(), "email": email, "invitedAt": invited_at}
+        self.invitations[invitation["id"]] = invitation
+
+    def snapshot(self) -> Dict[str, Any]:
+        """/team 响应体"""
+        with self._lock:
+            return {
+                "team": {
+                    "id": "mock-team",
+                    "name": "Mock Team",
+                    "planId": self.plan_id,
+                    "users": list(self.users.values()),
+                    "invitations": list(self.invitations.values()),
+                }
+            }
+
+    def invite(self, emails: List[str]) -> Tuple[int, Dict[str, Any]]:
+        """添加邀请；任何一个邮箱格式错误时整批拒绝（400），与真实接口一致"""
+        invalid = [email for email in emails if not isinstance(email, str) or not EMAIL_PATTERN.match(email)]
+        if invalid or not emails:
+            return 400, {"error": "invalid emails", "emails": invalid}
+        now_ms = int(time.time() * 1000)
+        with self._lock:
+            for email in emails:
+                self._add_invitation(email, now_ms)
+            self.version += 1
+        return 200, {"invited": len(emails)}
+
+    def delete(self, item_id: str) -> Tuple[int, Dict[str, Any]]:
+        """删除邀请或未加入的成员"""
+        with self._lock:
+            if self.invitations.pop(item_id, None) is not None:
+                self.version += 1
+                return 200, {"deleted": item_id}
+            user = self.users.get(item_id)
+            if user is not None and not user.get("role"):
+                del self.users[item_id]
+                self.version += 1
+                return 200, {"deleted": item_id}
+        return 404, {"error": "not found"}
+
+    def put_on_plan(self, plan_id: str) -> Tuple[int, Dict[str, Any]]:
+        with self._lock:
+            self.plan_id = plan_id
+            self.version += 1
+        return 200, {"planId": plan_id}
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "members": sum(1 for user in self.users.values() if user.get("role")),
+                "unjoined": sum(1 for user in self.users.values() if not user.get("role")),
+                "invitations": len(self.invitations),
+            }
+
+
+class MockTeamServer:
+    """模拟服务器：可在命令行独立运行，也可在测试/基准中后台启动"""
+
+    def __init__(self, team: Optional[MockTeam] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: Optional[Dict[str, LatencyModel]] = None,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 1.0):
+        self.team = team or MockTeam()
+        self.latency = {endpoint: LatencyModel() for endpoint in ENDPOINTS}
+        self.latency.update(latency or {})
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.stats = {endpoint: {"requests": 0, "errors": 0, "throttled": 0} for endpoint in ENDPOINTS}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """可直接用作 api.base_url"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> 'MockTeamServer':
+        """在后台线程中启动"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, endpoint: str, key: str):
+        with self._stats_lock:
+            self.stats[endpoint][key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = {endpoint: dict(values) for endpoint, values in self.stats.items()}
+        stats["state"] = self.team.counts()
+        return stats
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _route(self) -> Tuple[Optional[str], Optional[str]]:
+                """返回 (接口名, 路径参数)，路径可带 /api 前缀"""
+                path = self.path.split('?', 1)[0]
+                if path.startswith('/api/'):
+                    path = path[4:]
+                if path == '/team' and self.command == 'GET':
+                    return "team", None
+                if path == '/team/invite' and self.command == 'POST':
+                    return "invite", None
+                if path.startswith('/team/invite/') and self.command == 'DELETE':
+                    return "delete", path[len('/team/invite/'):]
+                if path == '/put-user-on-plan' and self.command == 'POST':
+                    return "plan", None
+                return None, None
+
+            def _read_json(self) -> Any:
+                length = int(self.headers.get('Content-Length') or 0)
+                if not length:
+                    return {}
+                try:
+                    return json.loads(self.rfile.read(length))
+                except ValueError:
+                    return {}
+
+            def _send(self, status: int, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                body = body or b""
+                if body:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, status: int, payload: Any):
+                self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+            def _handle(self):
+                if self.path.split('?', 1)[0] in ('/__stats', '/api/__stats'):
+                    self._send_json(200, server.get_stats())
+                    return
+                endpoint, param = self._route()
+                if endpoint is None:
+                    self._read_json()
+                    self._send_json(404, {"error": "unknown endpoint"})
+                    return
+                payload = self._read_json()
+                server._count(endpoint, "requests")
+                time.sleep(server.latency[endpoint].sample())
+
+                roll = random.random()
+                if roll < server.throttle_rate:
+                    server._count(endpoint, "throttled")
+                    self._send(429, b'{"error":"rate limited"}', {'Retry-After': f"{server.retry_after:g}"})
+                    return
+                if roll < server.throttle_rate + server.error_rate:
+                    server._count(endpoint, "errors")
+                    self._send_json(500, {"error": "internal error"})
+                    return
+
+                if endpoint == "team":
+                    body = json.dumps(server.team.snapshot(), ensure_ascii=False).encode('utf-8')
+                    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                    if self.headers.get('If-None-Match') == etag:
+                        self._send(304, headers={'ETag': etag})
+                    else:
+                        self._send(200, body, {'ETag': etag})
+                elif endpoint == "invite":
+                    self._send_json(*server.team.invite(payload.get("emails") or []))
+                elif endpoint == "delete":
+                    self._send_json(*server.team.delete(param))
+                else:
+                    self._send_json(*server.team.put_on_plan(payload.get("planId", "")))
+
+            do_GET = _handle
+            do_POST = _handle
+            do_DELETE = _handle
+
+        return Handler
+
+
+def parse_latency(values: List[str]) -> Dict[str, LatencyModel]:
+    """解析 --latency 参数：接口=中位数[:P99]，接口可为 team/invite/delete/plan/all"""
+    latency = {}
+    for value in values:
+        endpoint, _, spec = value.partition('=')
+        model = LatencyModel.parse(spec)
+        if endpoint == "all":
+            latency.update({name: model for name in ENDPOINTS})
+        elif endpoint in ENDPOINTS:
+            latency[endpoint] = model
+        else:
+            raise argparse.ArgumentTypeError(f"未知接口: {endpoint}")
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="团队 API 本地模拟服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--members", type=int, default=50, help="已加入成员数")
+    parser.add_argument("--unjoined", type=int, default=10, help="未加入成员数")
+    parser.add_argument("--invitations", type=int, default=20, help="待处理邀请数")
+    parser.add_argument("--latency", action="append", default=[], metavar="ENDPOINT=MEDIAN[:P99]",
+                        help="接口延迟（毫秒），接口为 team/invite/delete/plan/all，可重复指定")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的比例")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="返回 429 的比例")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 响应的 Retry-After（秒）")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子，固定生成的团队数据")
+    args = parser.parse_args()
+
+    team = MockTeam(args.members, args.unjoined, args.invitations, seed=args.seed)
+    server = MockTeamServer(team, args.host, args.port, latency=parse_latency(args.latency),
+                            error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                            retry_after=args.retry_after)
+    print(f"🚀 模拟服务器已启动: {server.base_url}")
+    print(f"📊 团队: {team.counts()}")
+    print("💡 把 api.base_url 设置为上面的地址即可使用，按 Ctrl+C 退出")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"📈 请求统计: {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
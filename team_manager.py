@@ -7,11 +7,37 @@
 
 import sys
 import json
+import asyncio
+import functools
+import logging
 import os
 import re
-from typing import List, Dict, Any, Tuple, Optional
-from datetime import datetime
+import time
+import base64
+import copy
+import socket
+import ssl
+import http.client
+import hashlib
+import math
+import random
+import threading
+import itertools
+import uuid
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Tuple, Optional, Callable, NamedTuple
+from datetime import datetime, date
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+try:
+    import aiohttp
+except ImportError:  # 可选依赖：未安装时异步客户端改用线程池发送请求
+    aiohttp = None
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QLineEdit, QPushButton, QTextEdit, QTableWidget,
@@ -20,10 +46,14 @@ from PyQt6.QtWidgets import (
     QScrollArea, QGridLayout, QStatusBar, QMenuBar, QMenu, QFileDialog,
     QGraphicsDropShadowEffect, QSizePolicy, QSystemTrayIcon
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QIcon, QPixmap, QAction, QPalette, QColor
 
 
+# 模块日志：级别由 configure_logging() 根据 debug.* 配置设置
+logger = logging.getLogger("team_manager")
+
+
 class StyleManager:
     """Modern design system - Version 5.0"""
 
@@ -610,12 +640,1295 @@ class Config:
         config[keys[-1]] = value
 
 
+def configure_logging(config: Config):
+    """根据调试配置设置日志级别
+
+    未开启调试时只输出警告及以上；debug.enabled 输出 INFO；
+    debug.verbose_logging 输出 DEBUG（每次请求的详细信息）。
+    日志消息使用 % 参数延迟格式化，被过滤的级别几乎没有开销。
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", "%H:%M:%S"))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+    if not config.get('debug.enabled', False):
+        logger.setLevel(logging.WARNING)
+    elif config.get('debug.verbose_logging', False):
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(logging.INFO)
+
+
+class RetryPolicy:
+    """请求重试策略：指数退避 + 随机抖动，429/503 时遵循服务器的 Retry-After
+
+    是否幂等由调用处按接口语义决定，而不是按请求方法：只有重发一个已被服务器执行的请求
+    得到同样的效果和响应时才算幂等（读取团队数据）。邀请、计划切换和按ID删除都不是——
+    删除已生效后再发一次会得到 404，被记为失败。非幂等请求可能已被服务器执行，
+    只在连接未建立、或服务器返回带 Retry-After 的 429/503 时重试。
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    RETRY_AFTER_STATUS_CODES = {429, 503}
+    RETRY_EXCEPTIONS = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    )
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 30.0, max_retry_after: float = 60.0):
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls, config: 'Config') -> 'RetryPolicy':
+        """根据 performance.retry_count 创建策略"""
+        return cls(max_retries=config.get('performance.retry_count', 3))
+
+    def should_retry(self, response: requests.Response, idempotent: bool) -> bool:
+        """响应状态码是否值得重试"""
+        if not idempotent:
+            return (response.status_code in self.RETRY_AFTER_STATUS_CODES
+                    and self.parse_retry_after(response.headers.get('Retry-After')) is not None)
+        return response.status_code in self.RETRY_STATUS_CODES
+
+    def should_retry_error(self, error: Exception, idempotent: bool) -> bool:
+        """网络异常是否值得重试"""
+        return idempotent or self.is_connect_failure(error)
+
+    @staticmethod
+    def is_connect_failure(error: Exception) -> bool:
+        """请求是否在建立连接阶段就失败（确定没有送达服务器）"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if aiohttp is not None and isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    @classmethod
+    def request_not_applied(cls, status_code: Optional[int], error: Optional[Exception]) -> bool:
+        """失败的请求是否确定没有被服务器执行（429/503 拒绝，或连接未建立），可以安全地重发非幂等请求"""
+        if status_code is not None:
+            return status_code in cls.RETRY_AFTER_STATUS_CODES
+        return error is not None and cls.is_connect_failure(error)
+
+    @classmethod
+    def request_may_have_applied(cls, status_code: Optional[int], error: Optional[Exception]) -> bool:
+        """失败的请求是否可能已被服务器执行（500/502/504，或连接建立后超时、断开）"""
+        if status_code is not None:
+            return status_code >= 500 and status_code not in cls.RETRY_AFTER_STATUS_CODES
+        return (error is not None and not cls.is_connect_failure(error)
+                and not isinstance(error, CircuitOpenError))
+
+    def compute_delay(self, attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+        """计算第 attempt 次失败后的等待时间，返回 None 表示不再重试"""
+        if response is not None and response.status_code in self.RETRY_AFTER_STATUS_CODES:
+            retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        # Full jitter: 在 [0, min(max_delay, base * 2^n)] 之间随机取值
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """解析 Retry-After 头，支持秒数（含小数）和 HTTP 日期两种格式"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            pass
+        else:
+            return seconds if math.isfinite(seconds) and seconds >= 0 else None
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at is None:
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter:
+    """自适应并发限制器（AIMD）：延迟平稳时加性增加并发，遇到 429/超时时乘性减少"""
+
+    THROTTLED = "throttled"
+    OK = "ok"
+    ERROR = "error"
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_tolerance: float = 1.5,
+                 decrease_factor: float = 0.5, rate_window: float = 10.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = max(float(self.min_limit), self.max_limit / 2)
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.rate_window = rate_window
+        self.in_flight = 0
+        self.throttle_events = 0
+        self._baseline_latency = None
+        self._last_decrease = 0.0
+        self._completions = deque()
+        self._cond = threading.Condition()
+
+    def set_max_limit(self, max_limit: int):
+        """更新并发上限（跟随 performance.concurrent_limit）"""
+        with self._cond:
+            self.max_limit = max(self.min_limit, int(max_limit))
+            self.limit = min(self.limit, float(self.max_limit))
+            self._cond.notify_all()
+
+    def acquire(self) -> float:
+        """获取一个并发槽位，返回开始时间"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    def try_acquire(self) -> Optional[float]:
+        """不等待地获取槽位，没有空闲槽位时返回 None（供事件循环轮询）"""
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return None
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, outcome: str):
+        """释放槽位，并根据结果与延迟调整并发限制"""
+        now = time.monotonic()
+        latency = now - started
+        with self._cond:
+            self.in_flight -= 1
+            self._completions.append(now)
+            if outcome == self.THROTTLED:
+                self.throttle_events += 1
+                # 同一批在途请求只触发一次减半
+                if started >= self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif outcome == self.OK:
+                if self._baseline_latency is None:
+                    self._baseline_latency = latency
+                if latency <= self._baseline_latency * self.latency_tolerance:
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self._baseline_latency = 0.9 * self._baseline_latency + 0.1 * latency
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取当前限流状态"""
+        with self._cond:
+            cutoff = time.monotonic() - self.rate_window
+            while self._completions and self._completions[0] < cutoff:
+                self._completions.popleft()
+            return {
+                'limit': self.limit,
+                'max_limit': self.max_limit,
+                'in_flight': self.in_flight,
+                'rate': len(self._completions) / self.rate_window,
+                'throttle_events': self.throttle_events,
+            }
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开期间请求被直接拒绝"""
+
+
+class CircuitBreaker:
+    """熔断器：连续出现 5xx 或网络错误后打开，冷却时间后探测；出现 401/403 时立即打开
+
+    认证失败说明会话已失效，等待冷却不会恢复，因此不计阈值、不计冷却，
+    一直打开到 Cookie 变化（保存配置时 reload_config 更新 Cookie）后才允许探测。
+    探测时（半开状态）只放行一个请求，成功则关闭，失败则重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    AUTH = "auth"
+    UPSTREAM = "upstream"
+
+    AUTH_STATUS_CODES = (401, 403)
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self._lock = threading.Lock()
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.reason: Optional[str] = None
+        self.last_status: Optional[int] = None
+        self.opened_at = 0.0
+        self._credential: Optional[str] = None
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.open_count = 0
+
+    def configure(self, failure_threshold: int, cooldown: float):
+        with self._lock:
+            self.failure_threshold = max(1, int(failure_threshold))
+            self.cooldown = cooldown
+
+    @staticmethod
+    def is_failure(status_code: Optional[int]) -> bool:
+        """计入连续失败阈值的结果：网络错误和服务器错误"""
+        return status_code is None or status_code >= 500
+
+    def _ready_to_probe(self, credential: str) -> bool:
+        if self.reason == self.AUTH:
+            return credential != self._credential
+        return time.monotonic() - self.opened_at >= self.cooldown
+
+    def blocking(self, credential: str) -> bool:
+        """当前是否会拒绝请求（已打开且尚不能探测）"""
+        with self._lock:
+            return self.state == self.OPEN and not self._ready_to_probe(credential)
+
+    def allow(self, credential: str) -> bool:
+        """请求发送前调用；返回 False 表示应直接失败"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if not self._ready_to_probe(credential):
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record(self, status_code: Optional[int], credential: str):
+        """记录一次已发送请求的结果，status_code 为 None 表示网络错误"""
+        with self._lock:
+            if status_code in self.AUTH_STATUS_CODES:
+                if self.state == self.HALF_OPEN:
+                    self._probe_in_flight = False
+                # 熔断前已发出的请求陆续返回 401/403 时不重复打开
+                if not (self.state == self.OPEN and self.reason == self.AUTH and credential == self._credential):
+                    self._open(status_code, credential)
+                return
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if self.is_failure(status_code) or status_code == 429:
+                    self._open(status_code, credential)
+                else:
+                    self.state = self.CLOSED
+                    self.failures = 0
+                    self.reason = None
+                return
+            if status_code == 429:
+                return
+            if not self.is_failure(status_code):
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open(status_code, credential)
+
+    def _open(self, status_code: Optional[int], credential: str):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.reason = self.AUTH if status_code in self.AUTH_STATUS_CODES else self.UPSTREAM
+        self.last_status = status_code
+        self._credential = credential
+        self.failures = 0
+        self.open_count += 1
+        logger.warning("熔断器已打开（%s，最后状态码 %s）", self.reason, status_code)
+
+    def retry_in(self) -> float:
+        """距离冷却结束的秒数；认证失败引起的熔断不随时间恢复，返回 0"""
+        with self._lock:
+            if self.state != self.OPEN or self.reason == self.AUTH:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def describe(self) -> str:
+        """熔断原因说明"""
+        if self.reason == self.AUTH:
+            return f"熔断中：认证失败（状态码 {self.last_status}），Cookie 可能已过期，更新 Cookie 后重试"
+        status = self.last_status if self.last_status is not None else "网络错误"
+        return f"熔断中：服务器连续出错（{status}），{self.retry_in():.0f} 秒后重试"
+
+
+class RequestRecorder:
+    """请求记录器：把每次请求/响应以紧凑 JSON 行追加写入文件，用于离线重放
+
+    Cookie、Set-Cookie 以及 URL/正文中的会话令牌在写入前脱敏。
+    """
+
+    # 记录下来的响应头，重放时条件请求与重试逻辑需要
+    KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+    SECRET_PATTERN = re.compile(
+        r'((?:_session|session_?id|access_?token|refresh_?token|token|cookie)["\']?\s*[:=]\s*["\']?)'
+        r'[^"\';,&\s}]+', re.IGNORECASE)
+    REDACTED = "<redacted>"
+
+    def __init__(self, path: str = "team_manager_requests.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def redact(cls, text: str) -> str:
+        """替换文本中的会话令牌"""
+        return cls.SECRET_PATTERN.sub(lambda m: m.group(1) + cls.REDACTED, text)
+
+    @staticmethod
+    def _request_body(kwargs: Dict[str, Any]) -> Optional[str]:
+        if kwargs.get('json') is not None:
+            return json.dumps(kwargs['json'], ensure_ascii=False, separators=(',', ':'))
+        data = kwargs.get('data')
+        if isinstance(data, bytes):
+            return data.decode('utf-8', errors='replace')
+        return data if isinstance(data, str) else None
+
+    def record(self, method: str, url: str, kwargs: Dict[str, Any], started: float,
+               response: Optional[requests.Response] = None, error: Optional[Exception] = None):
+        """追加一条记录；started 为 time.monotonic() 的发送时间"""
+        body = self._request_body(kwargs)
+        entry = {
+            't': round(time.time(), 3),
+            'method': method,
+            'url': self.redact(url),
+            'ms': round((time.monotonic() - started) * 1000, 1),
+            'req': self.redact(body) if body else None,
+        }
+        if response is not None:
+            entry['status'] = response.status_code
+            entry['headers'] = {name: response.headers[name] for name in self.KEPT_HEADERS
+                                if name in response.headers}
+            entry['body'] = self.redact(response.text)
+        else:
+            entry['error'] = type(error).__name__
+            entry['message'] = self.redact(str(error))
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write(line)
+                self._file.flush()
+            except OSError as e:
+                logger.warning("写入请求记录失败: %s", e)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class HTTPTransport:
+    """长连接 HTTP 传输层，配置变化时尽量保留已建立的 TLS 连接"""
+
+    def __init__(self, config: 'Config'):
+        self._lock = threading.Lock()
+        self.session: Optional[requests.Session] = None
+        # debug.save_requests 开启时记录每次请求
+        self.recorder: Optional[RequestRecorder] = None
+        self._transport_key = None
+        self._pool_size = 0
+        self.rebuild_count = 0
+        self._retired_stats = {'connections': 0, 'requests': 0}
+        self.configure(config)
+
+    @staticmethod
+    def transport_key(config: 'Config') -> Tuple:
+        """传输相关设置：API 主机、代理、SSL 验证"""
+        parsed = urlparse(config.get('api.base_url', '') or '')
+        proxy = None
+        if config.get('network.proxy.enabled', False):
+            proxy = (config.get('network.proxy.host', ''), config.get('network.proxy.port', 8080))
+        return parsed.scheme, parsed.netloc, proxy, bool(config.get('network.ssl_verify', True))
+
+    def configure(self, config: 'Config') -> bool:
+        """应用配置，仅在传输相关设置变化时重建会话，返回是否重建"""
+        self._configure_recorder(config)
+        key = self.transport_key(config)
+        pool_size = max(1, int(config.get('performance.concurrent_limit', 5)))
+        with self._lock:
+            if self.session is not None and key == self._transport_key:
+                if pool_size != self._pool_size:
+                    self._mount_adapters(self.session, pool_size)
+                return False
+
+            old_session = self.session
+            session = requests.Session()
+            _, _, proxy, ssl_verify = key
+            if proxy and proxy[0]:
+                proxy_url = f"http://{proxy[0]}:{proxy[1]}"
+                session.proxies = {'http': proxy_url, 'https': proxy_url}
+            session.verify = ssl_verify
+            self._mount_adapters(session, pool_size)
+
+            self.session = session
+            self._transport_key = key
+            if old_session is not None:
+                self._retire_session(old_session)
+                self.rebuild_count += 1
+            return old_session is not None
+
+    def _configure_recorder(self, config: 'Config'):
+        """按 debug.save_requests 开启或关闭请求记录"""
+        path = config.get('debug.requests_file', 'team_manager_requests.jsonl')
+        if not config.get('debug.save_requests', False):
+            if self.recorder is not None:
+                self.recorder.close()
+                self.recorder = None
+        elif self.recorder is None or self.recorder.path != path:
+            if self.recorder is not None:
+                self.recorder.close()
+            self.recorder = RequestRecorder(path)
+
+    def _mount_adapters(self, session: requests.Session, pool_size: int):
+        """按并发上限挂载连接池适配器"""
+        for prefix in ('https://', 'http://'):
+            old_adapter = session.adapters.get(prefix)
+            if old_adapter is not None:
+                self._collect_adapter_stats(old_adapter, self._retired_stats)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount(prefix, adapter)
+            if old_adapter is not None:
+                old_adapter.close()
+        self._pool_size = pool_size
+
+    def _retire_session(self, session: requests.Session):
+        """累计旧会话的连接统计后关闭"""
+        for adapter in session.adapters.values():
+            self._collect_adapter_stats(adapter, self._retired_stats)
+        session.close()
+
+    @staticmethod
+    def _collect_adapter_stats(adapter, totals: Dict[str, int]):
+        """累加适配器下所有连接池的建连数与请求数"""
+        managers = [adapter.poolmanager] + list(getattr(adapter, 'proxy_manager', {}).values())
+        for manager in managers:
+            if manager is None:
+                continue
+            for pool_key in list(manager.pools.keys()):
+                pool = manager.pools.get(pool_key)
+                if pool is None:
+                    continue
+                totals['connections'] += getattr(pool, 'num_connections', 0)
+                totals['requests'] += getattr(pool, 'num_requests', 0)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """通过当前会话发送请求"""
+        recorder = self.recorder
+        if recorder is None:
+            return self.session.request(method, url, **kwargs)
+
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            recorder.record(method, url, kwargs, started, error=e)
+            raise
+        recorder.record(method, url, kwargs, started, response=response)
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """连接复用统计：新建连接数、请求数、复用次数"""
+        with self._lock:
+            totals = dict(self._retired_stats)
+            for adapter in self.session.adapters.values():
+                self._collect_adapter_stats(adapter, totals)
+            return {
+                'connections': totals['connections'],
+                'requests': totals['requests'],
+                'reused': max(0, totals['requests'] - totals['connections']),
+                'pool_size': self._pool_size,
+                'rebuilds': self.rebuild_count,
+            }
+
+    def close(self):
+        """关闭会话"""
+        with self._lock:
+            if self.session is not None:
+                self.session.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class ReplayTransport:
+    """离线重放传输层：按 (方法, 路径) 依次返回 RequestRecorder 记录的响应
+
+    与 HTTPTransport 接口相同，可直接传给 APIClient。同一路径的记录按原顺序循环返回；
+    realtime=True 时按记录的耗时等待，以重现真实的刷新与批量操作节奏。
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self.recorder: Optional[RequestRecorder] = None
+        self._lock = threading.Lock()
+        self._recordings: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self.replayed = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def _route(method: str, url: str) -> Tuple[str, str]:
+        """匹配键：忽略主机与 API 前缀差异，只取路径最后的 /team... 部分"""
+        path = urlparse(url).path
+        marker = path.find('/team')
+        if marker < 0:
+            marker = path.rfind('/')
+        return method.upper(), path[marker:]
+
+    @staticmethod
+    def _template(route: Tuple[str, str]) -> Tuple[str, str]:
+        """带ID的路径（删除邀请）退化为通配路径，重放时可匹配任意ID"""
+        method, path = route
+        return method, re.sub(r'^(/team/invite)/[^/]+$', r'\1/*', path)
+
+    def load(self):
+        """读取记录文件，跳过损坏的行"""
+        recordings: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                route = self._route(entry['method'], entry['url'])
+                recordings.setdefault(route, []).append(entry)
+                template = self._template(route)
+                if template != route:
+                    recordings.setdefault(template, []).append(entry)
+        with self._lock:
+            self._recordings = recordings
+            self._positions = {}
+
+    def configure(self, config: 'Config') -> bool:
+        """重放不涉及网络设置"""
+        return False
+
+    def _next(self, route: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._recordings.get(route)
+            if not entries:
+                return None
+            position = self._positions.get(route, 0)
+            self._positions[route] = position + 1
+            self.replayed += 1
+            return entries[position % len(entries)]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """返回下一条匹配的记录；没有记录时按 404 处理"""
+        route = self._route(method, url)
+        entry = self._next(route)
+        if entry is None and self._template(route) != route:
+            entry = self._next(self._template(route))
+        if entry is not None and self.realtime:
+            time.sleep(entry.get('ms', 0) / 1000)
+        if entry is not None and 'error' in entry:
+            raise requests.exceptions.ConnectionError(f"[重放] {entry['error']}: {entry.get('message', '')}")
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if entry is None:
+            self.misses += 1
+            response.status_code = 404
+            response._content = b'{"error":"no recording"}'
+            response.headers = CaseInsensitiveDict()
+        else:
+            response.status_code = entry['status']
+            response._content = (entry.get('body') or '').encode('utf-8')
+            response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """重放不建立连接，请求数为已重放的记录数"""
+        return {'connections': 0, 'requests': self.replayed, 'reused': 0, 'pool_size': 0, 'rebuilds': 0}
+
+    def close(self):
+        pass
+
+
+class NotModified:
+    """团队数据自上次获取以来未发生变化的结果标记"""
+
+    def __repr__(self):
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+class SingleFlight:
+    """合并并发的相同调用：同一 key 执行期间，其他调用者等待并共享同一结果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+        self.shared_count = 0
+
+    def do(self, key: Any, func: Callable[[], Any]) -> Any:
+        """执行 func，若相同 key 的调用正在进行则直接等待其结果"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+            else:
+                self.shared_count += 1
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['event'].set()
+
+
+class LatencyHistogram:
+    """固定对数分桶的延迟直方图（1ms ~ 120s，相邻桶上限相差 25%），百分位数误差不超过一个桶"""
+
+    BOUNDS_MS = [round(1.25 ** i, 3) for i in range(53)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        index = 0
+        while index < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> float:
+        """估算百分位数（毫秒），在命中的桶内线性插值"""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.BOUNDS_MS[index - 1] if index > 0 else 0.0
+                upper = self.BOUNDS_MS[index] if index < len(self.BOUNDS_MS) else self.max_ms
+                value = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(value, self.max_ms)
+            cumulative += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """非空分桶，键为桶上限（毫秒）"""
+        buckets = {}
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                bound = self.BOUNDS_MS[index] if index < len(self.BOUNDS_MS) else "inf"
+                buckets[str(bound)] = bucket_count
+        return {'count': self.count, 'sum_ms': round(self.total_ms, 3), 'max_ms': round(self.max_ms, 3),
+                'buckets': buckets}
+
+
+class EndpointMetrics:
+    """单个接口的请求统计"""
+
+    # 近期错误率的统计窗口（秒）
+    RECENT_WINDOW = 300
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.decode_seconds = 0.0
+        self.decodes = 0
+        self.status_codes: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.recent: deque = deque(maxlen=2000)  # (时间, 是否出错)
+
+    def recent_error_rate(self, now: float) -> Tuple[float, int]:
+        """最近窗口内的 (错误率, 请求数)"""
+        while self.recent and now - self.recent[0][0] > self.RECENT_WINDOW:
+            self.recent.popleft()
+        total = len(self.recent)
+        if not total:
+            return 0.0, 0
+        return sum(1 for _, error in self.recent if error) / total, total
+
+
+class RequestMetrics:
+    """按接口统计请求数、状态码、收发字节、重试、JSON 解码耗时和延迟直方图"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def endpoint_key(method: str, path: str) -> str:
+        """接口名：带ID的路径合并为模板，如 DELETE /team/invite/{id}"""
+        path = re.sub(r'^(/team/invite)/[^/?]+', r'\1/{id}', path.split('?', 1)[0])
+        return f"{method.upper()} {path}"
+
+    def _get(self, endpoint: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record(self, endpoint: str, status_code: Optional[int], seconds: float,
+               bytes_out: int = 0, bytes_in: int = 0):
+        """记录一次请求尝试；status_code 为 None 表示网络错误"""
+        error = status_code is None or status_code >= 400
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.requests += 1
+            metrics.errors += 1 if error else 0
+            metrics.bytes_out += bytes_out
+            metrics.bytes_in += bytes_in
+            status = str(status_code) if status_code is not None else "网络错误"
+            metrics.status_codes[status] = metrics.status_codes.get(status, 0) + 1
+            metrics.latency.add(seconds * 1000)
+            metrics.recent.append((time.time(), error))
+
+    def record_retry(self, endpoint: str):
+        with self._lock:
+            self._get(endpoint).retries += 1
+
+    def record_decode(self, endpoint: str, seconds: float):
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics.decodes += 1
+            metrics.decode_seconds += seconds
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """各接口的统计摘要，按请求数降序"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for endpoint, metrics in self.endpoints.items():
+                recent_rate, recent_total = metrics.recent_error_rate(now)
+                rows.append({
+                    'endpoint': endpoint,
+                    'requests': metrics.requests,
+                    'errors': metrics.errors,
+                    'retries': metrics.retries,
+                    'recent_error_rate': recent_rate,
+                    'recent_requests': recent_total,
+                    'p50_ms': metrics.latency.percentile(50),
+                    'p95_ms': metrics.latency.percentile(95),
+                    'p99_ms': metrics.latency.percentile(99),
+                    'max_ms': metrics.latency.max_ms,
+                    'bytes_out': metrics.bytes_out,
+                    'bytes_in': metrics.bytes_in,
+                    'decode_ms_avg': metrics.decode_seconds * 1000 / metrics.decodes if metrics.decodes else 0.0,
+                    'status_codes': dict(metrics.status_codes),
+                    'histogram': metrics.latency.to_dict(),
+                })
+        rows.sort(key=lambda row: row['requests'], reverse=True)
+        return rows
+
+    def export(self, path: str):
+        """导出为 JSON 文件，供容量规划使用"""
+        data = {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'exported_at': datetime.now().isoformat(timespec='seconds'),
+            'histogram_bounds_ms': LatencyHistogram.BOUNDS_MS,
+            'endpoints': self.snapshot(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.started_at = time.time()
+
+
+class SessionInfo:
+    """从 _session Cookie 本地解码的会话信息（不校验签名，只用于估算剩余有效期）"""
+
+    def __init__(self, payload: Dict[str, Any]):
+        user = payload.get('user') if isinstance(payload.get('user'), dict) else {}
+        self.session_id = user.get('sessionId') or payload.get('sessionId')
+        self.email = user.get('email') or payload.get('email')
+        self.created_at = self._to_seconds(user.get('createdAt', payload.get('createdAt')))
+        # 令牌自带过期时间时优先使用
+        self.expires_at = self._to_seconds(payload.get('exp') or payload.get('expiresAt'))
+
+    @staticmethod
+    def _to_seconds(value: Any) -> Optional[float]:
+        """时间戳统一为秒（兼容毫秒）"""
+        if not isinstance(value, (int, float)) or value <= 0:
+            return None
+        return value / 1000 if value > 1e11 else float(value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _decode(cookie: str) -> Optional[Dict[str, Any]]:
+        match = re.search(r'(?:^|;)\s*_session=([^;]+)', cookie)
+        if not match:
+            return None
+        token = match.group(1).strip().split('.')[0]
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        except (ValueError, TypeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    @classmethod
+    def from_cookie(cls, cookie: str) -> Optional['SessionInfo']:
+        """解析 Cookie 中的 _session，无法解码时返回 None"""
+        payload = cls._decode(cookie or '')
+        return cls(payload) if payload is not None else None
+
+    def age(self) -> Optional[float]:
+        """会话已使用的秒数"""
+        return time.time() - self.created_at if self.created_at else None
+
+
+def format_duration(seconds: float) -> str:
+    """把秒数格式化为“X天Y小时”之类的简短文本"""
+    seconds = int(abs(seconds))
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes = rest // 60
+    if days:
+        return f"{days}天{hours}小时"
+    if hours:
+        return f"{hours}小时{minutes}分钟"
+    return f"{minutes}分钟"
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """解析接口返回的时间：毫秒时间戳或 ISO 字符串，无法解析时返回 None"""
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value / 1000)
+        if isinstance(value, str) and len(value) >= 10:
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return datetime.fromisoformat(value[:10])
+    except (ValueError, OverflowError, OSError) as e:
+        logger.debug("时间解析错误: %s, 值类型: %s, 值: %r", e, type(value).__name__, value)
+    return None
+
+
+def format_timestamp(value: Any, parsed: Optional[datetime], default: str) -> str:
+    """表格显示用的时间文本：时间戳格式化，字符串原样显示"""
+    if not value:
+        return default
+    if parsed is not None and isinstance(value, (int, float)):
+        return parsed.strftime('%Y-%m-%d %H:%M')
+    return str(value)
+
+
+class Member:
+    """团队成员记录"""
+
+    __slots__ = ('id', 'email', 'role', 'joined_at', 'joined_text', 'raw')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.id = str(raw.get('id') or '')
+        self.email = str(raw.get('email') or '')
+        self.role = raw.get('role') or ''
+        joined = raw.get('joinedAt')
+        self.joined_at = parse_timestamp(joined) if joined else None
+        self.joined_text = format_timestamp(joined, self.joined_at, '未加入')
+
+    @property
+    def joined(self) -> bool:
+        """有加入时间即视为活跃成员"""
+        return bool(self.raw.get('joinedAt'))
+
+    @property
+    def unjoined(self) -> bool:
+        """没有角色表示未加入"""
+        return not self.role
+
+
+class Invitation:
+    """待接受的邀请记录"""
+
+    __slots__ = ('id', 'email', 'invited_at', 'invited_text', 'raw')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.id = str(raw.get('id') or '')
+        self.email = str(raw.get('email') or '').strip()
+        invited = raw.get('invitedAt')
+        self.invited_at = parse_timestamp(invited) if invited else None
+        self.invited_text = format_timestamp(invited, self.invited_at, '未知时间')
+
+
+def extract_team(data: Any, user_keys: Tuple[str, ...],
+                 invitation_keys: Tuple[str, ...]) -> Tuple[List[Dict], List[Dict]]:
+    """一次迭代遍历同时收集用户与邀请记录，结果与分别递归收集两类记录一致
+
+    命中的列表不再收集同类记录，但仍继续向下查找另一类（如嵌在成员记录里的邀请）。
+    """
+    users: List[Dict] = []
+    invitations: List[Dict] = []
+    # 栈元素：(节点, 是否收集用户, 是否收集邀请, 输出列表)；
+    # 输出列表不为 None 时表示把已命中的记录列表按遍历顺序写入该列表
+    stack: List[Tuple[Any, bool, bool, Optional[List[Dict]]]] = [(data, True, True, None)]
+    while stack:
+        node, want_users, want_invitations, target = stack.pop()
+        if target is not None:
+            target.extend(node)
+        elif isinstance(node, dict):
+            children = []
+            for key, value in node.items():
+                if isinstance(value, list):
+                    take_users = want_users and key in user_keys
+                    take_invitations = want_invitations and key in invitation_keys
+                    if take_users:
+                        children.append((value, False, False, users))
+                    if take_invitations:
+                        children.append((value, False, False, invitations))
+                    rest_users = want_users and not take_users
+                    rest_invitations = want_invitations and not take_invitations
+                    if rest_users or rest_invitations:
+                        children.append((value, rest_users, rest_invitations, None))
+                elif isinstance(value, dict):
+                    children.append((value, want_users, want_invitations, None))
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend((item, want_users, want_invitations, None) for item in reversed(node)
+                         if isinstance(item, (dict, list)))
+    return users, invitations
+
+
+class TeamStats(NamedTuple):
+    """统计卡片的数值：在工作线程中随快照一起计算，删除或邀请成功后增量更新"""
+
+    total_members: int = 0
+    active_members: int = 0
+    # 待加入人数 = 邀请记录中的人数（未加入的人）
+    pending_members: int = 0
+    today_invited: int = 0
+    # today_invited 统计的日期
+    day: Optional[date] = None
+
+    @property
+    def total_invitations(self) -> int:
+        """邀请记录中的总邀请 = 待加入人数"""
+        return self.pending_members
+
+    @classmethod
+    def compute(cls, members: Tuple[Member, ...], invitations: Tuple[Invitation, ...],
+                today: Optional[date] = None) -> 'TeamStats':
+        today = today or date.today()
+        return cls(total_members=len(members),
+                   active_members=sum(1 for member in members if member.joined),
+                   pending_members=len(invitations),
+                   today_invited=sum(1 for invitation in invitations
+                                     if invitation.invited_at is not None and invitation.invited_at.date() == today),
+                   day=today)
+
+    def without(self, records: List[Any]) -> 'TeamStats':
+        """扣除已删除的成员或邀请记录"""
+        members = [record for record in records if isinstance(record, Member)]
+        invitations = [record for record in records if isinstance(record, Invitation)]
+        return self._replace(
+            total_members=self.total_members - len(members),
+            active_members=self.active_members - sum(1 for member in members if member.joined),
+            pending_members=self.pending_members - len(invitations),
+            today_invited=self.today_invited - sum(1 for invitation in invitations if invitation.invited_at is not None
+                                                   and invitation.invited_at.date() == self.day))
+
+    def with_invitations(self, count: int) -> 'TeamStats':
+        """加上刚发出的邀请"""
+        today_invited = self.today_invited + count if self.day == date.today() else self.today_invited
+        return self._replace(pending_members=self.pending_members + count, today_invited=today_invited)
+
+    def describe(self) -> str:
+        return (f"总成员: {self.total_members}个, 活跃: {self.active_members}个, "
+                f"待加入: {self.pending_members}个, 今日邀请: {self.today_invited}个")
+
+
+class TeamSnapshot:
+    """一次刷新得到的团队数据：在工作线程中解析一次，界面各处只读使用"""
+
+    # 支持多种字段名
+    USER_KEYS = ("users", "members")
+    INVITATION_KEYS = ("invitations", "invites")
+
+    __slots__ = ('raw', 'members', 'invitations', 'stats', 'created_at')
+
+    # 最近一次解析的 (原始数据, 快照)：合并请求的多个工作线程拿到同一份数据时只解析一次
+    _memo: Tuple[Any, Optional['TeamSnapshot']] = (None, None)
+    _memo_lock = threading.Lock()
+
+    def __init__(self, raw: Any, members: Tuple[Member, ...], invitations: Tuple[Invitation, ...]):
+        self.raw = raw
+        self.members = members
+        self.invitations = invitations
+        self.stats = TeamStats.compute(members, invitations)
+        self.created_at = time.time()
+
+    def current_stats(self) -> TeamStats:
+        """快照的统计数值；跨天后按新日期重新统计今日邀请数（时间已在解析时转换，不再逐条解析）"""
+        stats = self.stats
+        today = date.today()
+        if stats.day != today:
+            stats = self.stats = TeamStats.compute(self.members, self.invitations, today)
+        return stats
+
+    @classmethod
+    def from_payload(cls, data: Any) -> 'TeamSnapshot':
+        """解析 /team 返回的原始 JSON，同一份数据只遍历一次"""
+        with cls._memo_lock:
+            raw, snapshot = cls._memo
+            if raw is data and snapshot is not None:
+                return snapshot
+        users, invitations = extract_team(data, cls.USER_KEYS, cls.INVITATION_KEYS)
+        snapshot = cls(data,
+                       tuple(Member(user) for user in users if isinstance(user, dict)),
+                       tuple(Invitation(invitation) for invitation in invitations if isinstance(invitation, dict)))
+        with cls._memo_lock:
+            cls._memo = (data, snapshot)
+        return snapshot
+
+    def debug_report(self) -> str:
+        """调试用的数据结构报告（原始数据、提取结果与统计），在工作线程中生成"""
+        lines = ["📊 原始数据结构:", json.dumps(self.raw, indent=2, ensure_ascii=False), "", "🔍 数据提取测试:"]
+
+        # 测试用户提取
+        lines.append(f"   提取到的用户数: {len(self.members)}")
+        for i, user in enumerate(self.members):
+            joined = "已加入" if user.joined else "未加入"
+            lines.append(f"     {i+1}. {user.email or 'N/A'} - {joined}")
+
+        # 测试邀请提取
+        lines.append(f"   提取到的邀请数: {len(self.invitations)}")
+        for i, invitation in enumerate(self.invitations):
+            lines.append(f"     {i+1}. {invitation.email or 'N/A'} - {invitation.raw.get('invitedAt', 'N/A')}")
+
+        # 测试统计计算
+        total_members = len(self.members)
+        pending_members = len([u for u in self.members if not u.joined])
+        lines += ["", "📊 统计计算:",
+                  f"   总成员数: {total_members}",
+                  f"   活跃成员数: {total_members - pending_members}",
+                  f"   待加入成员数: {pending_members}",
+                  f"   邀请记录数: {len(self.invitations)}"]
+
+        # 按照正确的业务逻辑
+        lines += ["", "🎯 正确的统计逻辑:",
+                  f"   待加入人数 = 邀请记录中的人数 = {len(self.invitations)}",
+                  f"   邀请记录中的总邀请 = 待加入人数 = {len(self.invitations)}",
+                  "   说明：未加入的人就是被邀请但还没加入的人",
+                  f"   今日邀请数: {self.stats.today_invited} (今天: {self.stats.day})"]
+        return "\n".join(lines)
+
+
+def normalize_email(email: str) -> str:
+    """邮箱比较用的规范形式"""
+    return email.strip().lower()
+
+
+class TeamIndex:
+    """团队数据索引：按 (类型, ID)、规范化邮箱和状态分桶，删除成功后增量更新
+
+    成员与邀请的ID可能重复，两类记录分开索引，互不覆盖。
+    """
+
+    JOINED = "joined"
+    UNJOINED = "unjoined"
+    INVITED = "invited"
+
+    MEMBER = "member"
+    INVITATION = "invitation"
+    KIND_OF_STATUS = {JOINED: MEMBER, UNJOINED: MEMBER, INVITED: INVITATION}
+    # 可批量删除的状态
+    DELETABLE = (UNJOINED, INVITED)
+
+    def __init__(self, snapshot: Optional[TeamSnapshot] = None):
+        # (类型, ID) -> (状态, 记录)
+        self.by_key: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        self.by_email: Dict[str, Dict[Tuple[str, str], Any]] = {}
+        # 各状态的ID -> 记录，dict 保持原始顺序
+        self.buckets: Dict[str, Dict[str, Any]] = {self.JOINED: {}, self.UNJOINED: {}, self.INVITED: {}}
+        if snapshot is not None:
+            for member in snapshot.members:
+                self.add(member, self.UNJOINED if member.unjoined else self.JOINED)
+            for invitation in snapshot.invitations:
+                self.add(invitation, self.INVITED)
+
+    def add(self, record: Any, status: str):
+        """加入一条成员或邀请记录（没有ID的记录无法操作，不建索引）"""
+        if not record.id:
+            return
+        kind = self.KIND_OF_STATUS[status]
+        self.discard(kind, record.id)
+        self.by_key[(kind, record.id)] = (status, record)
+        self.buckets[status][record.id] = record
+        if record.email:
+            self.by_email.setdefault(normalize_email(record.email), {})[(kind, record.id)] = record
+
+    def discard(self, kind: str, record_id: str) -> Optional[Any]:
+        """移除一条记录，返回被移除的记录"""
+        entry = self.by_key.pop((kind, record_id), None)
+        if entry is None:
+            return None
+        status, record = entry
+        self.buckets[status].pop(record_id, None)
+        if record.email:
+            email = normalize_email(record.email)
+            records = self.by_email.get(email)
+            if records is not None:
+                records.pop((kind, record_id), None)
+                if not records:
+                    del self.by_email[email]
+        return record
+
+    def remove(self, record_ids: List[str], statuses: Tuple[str, ...] = DELETABLE) -> List[Any]:
+        """删除成功后移除这些状态下对应ID的记录，返回实际移除的记录
+
+        删除接口不区分成员和邀请，同一ID在两类中都存在时一并移除，由下次刷新校正。
+        """
+        removed = []
+        for record_id in record_ids:
+            for status in statuses:
+                if record_id in self.buckets[status]:
+                    removed.append(self.discard(self.KIND_OF_STATUS[status], record_id))
+        return removed
+
+    def get(self, kind: str, record_id: str) -> Optional[Any]:
+        entry = self.by_key.get((kind, record_id))
+        return entry[1] if entry is not None else None
+
+    def find_by_email(self, email: str) -> List[Any]:
+        """按邮箱查找成员和邀请（不区分大小写）"""
+        return list(self.by_email.get(normalize_email(email), {}).values())
+
+    def ids(self, status: str) -> List[str]:
+        """某个状态下的全部ID"""
+        return list(self.buckets[status])
+
+    def count(self, status: str) -> int:
+        return len(self.buckets[status])
+
+    def pending_emails(self) -> List[str]:
+        """未接受邀请的邮箱（按规范化邮箱去重，保持顺序）"""
+        emails: Dict[str, str] = {}
+        for invitation in self.buckets[self.INVITED].values():
+            if invitation.email:
+                emails.setdefault(normalize_email(invitation.email), invitation.email)
+        return list(emails.values())
+
+
+class RecordChanges:
+    """一类记录（成员或邀请）在两次快照之间的变化"""
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self):
+        self.added: List[Any] = []
+        self.removed: List[str] = []
+        self.changed: List[Any] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def describe(self) -> str:
+        return f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+    @classmethod
+    def compute(cls, old_records: Tuple[Any, ...], new_records: Tuple[Any, ...]) -> Optional['RecordChanges']:
+        """按ID对比两组记录；存在缺失或重复ID时无法对齐，返回 None"""
+        old = {record.id: record for record in old_records}
+        new = {record.id: record for record in new_records}
+        if '' in old or '' in new or len(old) != len(old_records) or len(new) != len(new_records):
+            return None
+        changes = cls()
+        changes.removed = [record_id for record_id in old if record_id not in new]
+        for record_id, record in new.items():
+            previous = old.get(record_id)
+            if previous is None:
+                changes.added.append(record)
+            elif previous.raw != record.raw:
+                changes.changed.append(record)
+        return changes
+
+
+class SnapshotDiff:
+    """相邻两次团队快照的差异，界面据此只更新变化的行"""
+
+    __slots__ = ('members', 'invitations')
+
+    def __init__(self, members: RecordChanges, invitations: RecordChanges):
+        self.members = members
+        self.invitations = invitations
+
+    def __bool__(self) -> bool:
+        return bool(self.members or self.invitations)
+
+    def describe(self) -> str:
+        return f"成员 {self.members.describe()}，邀请 {self.invitations.describe()}"
+
+    @classmethod
+    def compute(cls, old: TeamSnapshot, new: TeamSnapshot) -> Optional['SnapshotDiff']:
+        """计算差异；无法按ID对齐时返回 None，调用方应整表重建"""
+        members = RecordChanges.compute(old.members, new.members)
+        invitations = RecordChanges.compute(old.invitations, new.invitations)
+        if members is None or invitations is None:
+            return None
+        return cls(members, invitations)
+
+
 class APIClient:
     """API客户端类"""
-    
-    def __init__(self, config: Config):
+
+    def __init__(self, config: Config, transport: Optional[HTTPTransport] = None):
         self.config = config
-        self.session = requests.Session()
+        self.transport = transport or HTTPTransport(config)
+        # 合并本客户端并发的 /team 请求；每个实例单独一份，
+        # 因为条件请求头和内容哈希来自各自的 _team_cache，不能把一个客户端的“未变化”交给另一个
+        self._team_flight = SingleFlight()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.retry_stats = {'calls': 0, 'attempts': 0, 'retried_calls': 0, 'backoff_seconds': 0.0}
+        self.rate_limiter = AdaptiveRateLimiter(config.get('performance.concurrent_limit', 5))
+        # /team 的缓存校验信息（ETag / Last-Modified），按 URL + Cookie 区分
+        self._team_cache: Dict[str, Any] = {}
+        self.refresh_stats = {'not_modified': 0, 'unchanged': 0}
+        # 按接口统计的延迟、状态码与流量
+        self.metrics = RequestMetrics()
+        # Cookie 过期或服务器故障时快速失败
+        self.breaker = CircuitBreaker(config.get('performance.breaker_threshold', 5),
+                                      config.get('performance.breaker_cooldown', 60))
+        # 已根据 401 记录过实际有效期的会话
+        self._expired_sessions = set()
     
     def _get_headers(self) -> Dict[str, str]:
         """获取请求头"""
@@ -625,163 +1938,1092 @@ class APIClient:
             headers['content-type'] = 'application/json'
         return headers
     
+    def reload_config(self) -> bool:
+        """配置变更后调用，仅在传输相关设置变化时重建连接，返回是否重建"""
+        self.rate_limiter.set_max_limit(self.config.get('performance.concurrent_limit', 5))
+        self.breaker.configure(self.config.get('performance.breaker_threshold', 5),
+                               self.config.get('performance.breaker_cooldown', 60))
+        return self.transport.configure(self.config)
+
+    @property
+    def last_attempts(self) -> int:
+        """当前线程最近一次调用的尝试次数"""
+        return getattr(self._local, 'attempts', 0)
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        """当前线程最近一次调用最终失败的异常，收到响应时为 None"""
+        return getattr(self._local, 'error', None)
+
+    @property
+    def last_status_code(self) -> Optional[int]:
+        """当前线程最近一次调用的响应状态码，网络错误时为 None"""
+        return getattr(self._local, 'status_code', None)
+
+    def _attempt_note(self) -> str:
+        """尝试次数说明，仅在发生重试时返回"""
+        attempts = self.last_attempts
+        return f"（共尝试 {attempts} 次）" if attempts > 1 else ""
+
+    def _record_attempts(self, attempts: int, backoff: float):
+        """记录单次调用的重试开销"""
+        self._local.attempts = attempts
+        with self._stats_lock:
+            self.retry_stats['calls'] += 1
+            self.retry_stats['attempts'] += attempts
+            self.retry_stats['backoff_seconds'] += backoff
+            if attempts > 1:
+                self.retry_stats['retried_calls'] += 1
+
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """获取重试统计快照"""
+        with self._stats_lock:
+            return dict(self.retry_stats)
+
+    def _request(self, method: str, path: str, *, idempotent: bool, limited: bool = False,
+                 headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """发送请求，按重试策略处理瞬时错误，最终失败时抛出原异常
+
+        limited=True 的请求（批量删除、邀请、计划切换）受自适应限流器控制。
+        idempotent 由调用处声明（规则见 RetryPolicy）：为 False 时只重试确定未被服务器执行的请求，
+        读取超时、5xx 等请求可能已生效的失败不重发。
+        """
+        url = f"{self.config.get('api.base_url')}{path}"
+        request_headers = self._get_headers()
+        if headers:
+            request_headers.update(headers)
+        headers = request_headers
+        timeout = self.config.get('performance.request_timeout', 30)
+        policy = RetryPolicy.from_config(self.config)
+        if limited:
+            self.rate_limiter.set_max_limit(self.config.get('performance.concurrent_limit', 5))
+
+        endpoint = RequestMetrics.endpoint_key(method, path)
+        credential = self.config.get('api.headers.cookie', '')
+        attempt = 0
+        backoff = 0.0
+        self._local.status_code = None
+        self._local.error = None
+        while True:
+            attempt += 1
+            if not self.breaker.allow(credential):
+                self._record_attempts(attempt - 1, backoff)
+                self._local.error = CircuitOpenError(self.breaker.describe())
+                raise self._local.error
+            self._local.attempts = attempt
+            if attempt > 1:
+                self.metrics.record_retry(endpoint)
+            try:
+                response = self._send(method, url, limited, endpoint, headers=headers, timeout=timeout, **kwargs)
+                self._local.status_code = response.status_code
+                self.breaker.record(response.status_code, credential)
+                self.observe_session(response.status_code, credential)
+            except RetryPolicy.RETRY_EXCEPTIONS as error:
+                self.breaker.record(None, credential)
+                if attempt > policy.max_retries or not policy.should_retry_error(error, idempotent):
+                    self._record_attempts(attempt, backoff)
+                    self._local.error = error
+                    raise
+                delay = policy.compute_delay(attempt)
+            except Exception as error:
+                self.breaker.record(None, credential)
+                self._record_attempts(attempt, backoff)
+                self._local.error = error
+                raise
+            else:
+                if attempt > policy.max_retries or not policy.should_retry(response, idempotent):
+                    self._record_attempts(attempt, backoff)
+                    return response
+                delay = policy.compute_delay(attempt, response)
+                if delay is None:
+                    self._record_attempts(attempt, backoff)
+                    return response
+            backoff += delay
+            time.sleep(delay)
+
+    def _send(self, method: str, url: str, limited: bool, endpoint: str, **kwargs) -> requests.Response:
+        """发送单次请求，必要时占用限流槽位并反馈结果"""
+        if not limited:
+            return self._measured_request(endpoint, method, url, **kwargs)
+
+        started = self.rate_limiter.acquire()
+        outcome = AdaptiveRateLimiter.ERROR
+        try:
+            response = self._measured_request(endpoint, method, url, **kwargs)
+            if response.status_code in (429, 503):
+                outcome = AdaptiveRateLimiter.THROTTLED
+            elif response.status_code < 500:
+                outcome = AdaptiveRateLimiter.OK
+            return response
+        except requests.exceptions.Timeout:
+            outcome = AdaptiveRateLimiter.THROTTLED
+            raise
+        finally:
+            self.rate_limiter.release(started, outcome)
+
+    # 未观测到实际有效期时假定的会话有效期（小时），可通过 api.session_lifetime_hours 修改
+    DEFAULT_SESSION_LIFETIME_HOURS = 168
+    # 存活时间短于此值（秒）的会话收到 401 多半是注销或被撤销，不用于估算有效期
+    MIN_LEARNED_SESSION_AGE = 3600
+    # 观测到的有效期至少被这么多个会话印证后才视为可靠
+    RELIABLE_SESSION_SAMPLES = 2
+
+    def session_lifetime(self) -> Tuple[float, bool]:
+        """会话有效期（秒）以及估算是否可靠（多次观测一致）"""
+        observed = self.config.get('api.observed_session_lifetime')
+        if observed:
+            samples = self.config.get('api.observed_session_lifetime_samples', 1)
+            return float(observed), samples >= self.RELIABLE_SESSION_SAMPLES
+        return self.config.get('api.session_lifetime_hours', self.DEFAULT_SESSION_LIFETIME_HOURS) * 3600.0, False
+
+    def session_status(self) -> Tuple[Optional[SessionInfo], Optional[float], bool]:
+        """返回 (会话信息, 预计剩余秒数, 估算是否可靠)；无法解码时剩余时间为 None"""
+        info = SessionInfo.from_cookie(self.config.get('api.headers.cookie', ''))
+        if info is None:
+            return None, None, False
+        if info.expires_at:
+            return info, info.expires_at - time.time(), True
+        if not info.created_at:
+            return info, None, False
+        lifetime, reliable = self.session_lifetime()
+        return info, info.created_at + lifetime - time.time(), reliable
+
+    def session_is_stale(self) -> bool:
+        """会话是否已可靠地判断为过期（按默认有效期或单次观测估算时不算）"""
+        _, remaining, reliable = self.session_status()
+        return reliable and remaining is not None and remaining <= 0
+
+    def observe_session(self, status_code: int, credential: str):
+        """根据响应修正会话有效期估算：401 时学习，成功请求证明估算偏短时清除"""
+        if status_code == 401:
+            self._learn_session_lifetime(credential)
+        elif status_code < 400 and self.config.get('api.observed_session_lifetime'):
+            info = SessionInfo.from_cookie(credential)
+            age = info.age() if info is not None else None
+            if age is not None and age > self.config.get('api.observed_session_lifetime'):
+                # 会话活得比估算更久，之前的观测不可信
+                self.config.set('api.observed_session_lifetime', None)
+                self.config.set('api.observed_session_lifetime_samples', 0)
+                logger.info("会话已存活 %s，超过观测到的有效期，已清除估算", format_duration(age))
+
+    def _learn_session_lifetime(self, credential: str):
+        """收到 401 时记录当前会话的实际存活时间，作为之后的有效期估算"""
+        info = SessionInfo.from_cookie(credential)
+        if info is None or not info.created_at or info.session_id in self._expired_sessions:
+            return
+        self._expired_sessions.add(info.session_id)
+        lifetime = info.age()
+        if not lifetime or lifetime < self.MIN_LEARNED_SESSION_AGE:
+            return
+        observed = self.config.get('api.observed_session_lifetime')
+        samples = self.config.get('api.observed_session_lifetime_samples', 1) if observed else 0
+        # 取观测到的最长存活时间，避免过早判断会话过期
+        self.config.set('api.observed_session_lifetime', round(max(lifetime, observed or 0)))
+        self.config.set('api.observed_session_lifetime_samples', samples + 1)
+        logger.info("会话在 %s 后失效，已更新有效期估算（第 %d 次观测）", format_duration(lifetime), samples + 1)
+
+    def _measured_request(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """通过传输层发送请求并记录耗时与收发字节（不含限流等待）"""
+        started = time.perf_counter()
+        try:
+            response = self.transport.request(method, url, **kwargs)
+        except Exception:
+            self.metrics.record(endpoint, None, time.perf_counter() - started)
+            raise
+        body = getattr(response.request, 'body', None) if response.request is not None else None
+        self.metrics.record(endpoint, response.status_code, time.perf_counter() - started,
+                            len(body) if body else 0, len(response.content))
+        return response
+
+    def _conditional_headers(self, cache_key: str) -> Dict[str, str]:
+        """根据上次响应的校验信息生成条件请求头"""
+        if self._team_cache.get('key') != cache_key:
+            return {}
+        headers = {}
+        if self._team_cache.get('etag'):
+            headers['If-None-Match'] = self._team_cache['etag']
+        if self._team_cache.get('last_modified'):
+            headers['If-Modified-Since'] = self._team_cache['last_modified']
+        return headers
+
+    def _store_validators(self, cache_key: str, response: requests.Response, content_hash: str):
+        """保存服务器提供的 ETag / Last-Modified 以及响应内容哈希"""
+        self._team_cache = {
+            'key': cache_key,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': content_hash,
+        }
+
+    def account_fingerprint(self) -> str:
+        """当前账号的指纹：API 地址 + 会话用户邮箱（无法解码时用整个 Cookie）"""
+        cookie = self.config.get('api.headers.cookie', '')
+        info = SessionInfo.from_cookie(cookie)
+        identity = info.email if info is not None and info.email else cookie
+        source = f"{self.config.get('api.base_url')}\n{identity}"
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+
+    def invalidate_team_cache(self):
+        """清除 /team 的校验信息，下次刷新重新下载并解析完整数据（界面未能应用数据时调用）"""
+        self._team_cache = {}
+
+    @property
+    def team_content_hash(self) -> Optional[str]:
+        """最近一次团队数据快照的内容哈希"""
+        return self._team_cache.get('hash')
+
     def validate_email(self, email: str) -> bool:
         """验证邮箱格式"""
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         return re.match(pattern, email) is not None
     
     def get_team_data(self) -> Tuple[bool, Any]:
-        """获取团队数据"""
+        """获取团队数据，本客户端的并发调用会合并为一次请求并共享结果"""
+        flight_key = (self.config.get('api.base_url'), self.config.get('api.headers.cookie', ''))
+        return self._team_flight.do(flight_key, self._fetch_team_data)
+
+    def _fetch_team_data(self) -> Tuple[bool, Any]:
+        """请求 /team 并解析团队数据"""
         try:
             url = f"{self.config.get('api.base_url')}/team"
             headers = self._get_headers()
 
-            # 调试信息：打印请求详情
-            print(f"🔍 调试信息 - 请求URL: {url}")
-            print(f"🔍 调试信息 - 请求头数量: {len(headers)}")
-
-            # 检查Cookie是否存在
             cookie_value = headers.get('cookie', '')
-            if cookie_value:
-                print(f"🔍 调试信息 - Cookie长度: {len(cookie_value)} 字符")
-                print(f"🔍 调试信息 - Cookie前50字符: {cookie_value[:50]}...")
-                # 检查关键的认证字段
-                if '_session=' in cookie_value:
-                    print("✅ 调试信息 - 发现 _session 字段")
-                else:
-                    print("❌ 调试信息 - 缺少 _session 字段")
-            else:
-                print("❌ 调试信息 - Cookie为空")
+            logger.debug("请求 %s，请求头 %d 个，Cookie %d 字符，%s _session 字段",
+                         url, len(headers), len(cookie_value),
+                         "包含" if '_session=' in cookie_value else "缺少")
+
+            cache_key = f"{url}\n{cookie_value}"
+            conditional_headers = self._conditional_headers(cache_key)
+            response = self._request('GET', '/team', idempotent=True, headers=conditional_headers)
 
-            response = self.session.get(url, headers=headers, timeout=30)
+            logger.debug("响应状态码: %s, 尝试次数: %d", response.status_code, self.last_attempts)
+            logger.debug("响应头: %s", response.headers)
 
-            print(f"🔍 调试信息 - 响应状态码: {response.status_code}")
-            print(f"🔍 调试信息 - 响应头: {dict(response.headers)}")
+            if response.status_code == 304 and conditional_headers:
+                self.refresh_stats['not_modified'] += 1
+                logger.debug("团队数据未变化 (304 Not Modified)")
+                return True, NOT_MODIFIED
 
             if response.status_code == 200:
+                content_hash = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+                if (self._team_cache.get('key') == cache_key
+                        and self._team_cache.get('hash') == content_hash):
+                    self.refresh_stats['unchanged'] += 1
+                    self._store_validators(cache_key, response, content_hash)
+                    logger.debug("响应内容未变化 (hash %.12s)", content_hash)
+                    return True, NOT_MODIFIED
                 try:
+                    decode_started = time.perf_counter()
                     json_data = response.json()
-                    print(f"✅ 调试信息 - 成功获取JSON数据，数据类型: {type(json_data)}")
-                    if isinstance(json_data, dict):
-                        print(f"✅ 调试信息 - JSON数据键: {list(json_data.keys())}")
+                    self.metrics.record_decode('GET /team', time.perf_counter() - decode_started)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("成功获取JSON数据，数据类型: %s, 键: %s", type(json_data).__name__,
+                                     list(json_data.keys()) if isinstance(json_data, dict) else "-")
+                    self._store_validators(cache_key, response, content_hash)
                     return True, json_data
                 except Exception as json_error:
-                    print(f"❌ 调试信息 - JSON解析失败: {str(json_error)}")
-                    print(f"❌ 调试信息 - 响应内容: {response.text[:500]}...")
+                    logger.warning("JSON解析失败: %s", json_error)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("响应内容: %s...", response.text[:500])
                     return False, f"JSON解析失败: {str(json_error)}"
             else:
                 error_msg = f"请求失败，状态码: {response.status_code}"
-                print(f"❌ 调试信息 - {error_msg}")
-                print(f"❌ 调试信息 - 响应内容: {response.text[:500]}...")
-                return False, f"{error_msg}\n响应内容: {response.text[:200]}..."
+                logger.warning("%s", error_msg)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("响应内容: %s...", response.text[:500])
+                return False, f"{error_msg}{self._attempt_note()}\n响应内容: {response.text[:200]}..."
         except Exception as e:
-            error_msg = f"网络错误: {str(e)}"
-            print(f"❌ 调试信息 - {error_msg}")
+            error_msg = f"网络错误: {str(e)}{self._attempt_note()}"
+            logger.warning("%s", error_msg)
             return False, error_msg
     
     def invite_members(self, emails: List[str]) -> Tuple[bool, str]:
         """批量邀请成员"""
         try:
-            url = f"{self.config.get('api.base_url')}/team/invite"
-            headers = self._get_headers()
             data = {"emails": emails}
-            
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
-            
+
+            response = self._request('POST', '/team/invite', limited=True, idempotent=False, json=data)
+
             if response.status_code == 200:
-                return True, "邀请发送成功"
+                return True, f"邀请发送成功{self._attempt_note()}"
             else:
-                return False, f"邀请失败，状态码: {response.status_code}\n响应: {response.text}"
+                return False, f"邀请失败，状态码: {response.status_code}{self._attempt_note()}\n响应: {response.text}"
         except Exception as e:
-            return False, f"网络错误: {str(e)}"
+            return False, f"网络错误: {str(e)}{self._attempt_note()}"
     
     def delete_member(self, member_id: str) -> Tuple[bool, str]:
         """删除单个成员或邀请"""
         try:
-            url = f"{self.config.get('api.base_url')}/team/invite/{member_id}"
-            headers = self._get_headers()
-
-            response = self.session.delete(url, headers=headers, timeout=30)
+            response = self._request('DELETE', f"/team/invite/{member_id}", limited=True, idempotent=False)
 
             if response.status_code == 200:
-                return True, "删除成功"
+                return True, f"删除成功{self._attempt_note()}"
             else:
-                return False, f"删除失败，状态码: {response.status_code}"
+                return False, f"删除失败，状态码: {response.status_code}{self._attempt_note()}"
         except Exception as e:
-            return False, f"网络错误: {str(e)}"
+            return False, f"网络错误: {str(e)}{self._attempt_note()}"
 
     def put_user_on_community_plan(self) -> Tuple[bool, str]:
         """将登录账号改为 community plan"""
         try:
-            url = f"{self.config.get('api.base_url')}/put-user-on-plan"
-            headers = self._get_headers()
             data = {"planId": "orb_community_plan"}
 
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
+            response = self._request('POST', '/put-user-on-plan', limited=True, idempotent=False, json=data)
 
             if response.status_code == 200:
-                return True, "账号已成功切换到 Community Plan"
+                return True, f"账号已成功切换到 Community Plan{self._attempt_note()}"
             else:
-                return False, f"切换失败，状态码: {response.status_code}\n响应: {response.text}"
+                return False, f"切换失败，状态码: {response.status_code}{self._attempt_note()}\n响应: {response.text}"
         except Exception as e:
-            return False, f"网络错误: {str(e)}"
+            return False, f"网络错误: {str(e)}{self._attempt_note()}"
 
     def put_user_on_max_plan(self) -> Tuple[bool, str]:
         """将登录账号改为 max plan"""
         try:
-            url = f"{self.config.get('api.base_url')}/put-user-on-plan"
-            headers = self._get_headers()
             data = {"planId": "orb_max_plan"}
 
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
+            response = self._request('POST', '/put-user-on-plan', limited=True, idempotent=False, json=data)
 
             if response.status_code == 200:
-                return True, "账号已成功切换到 Max Plan"
+                return True, f"账号已成功切换到 Max Plan{self._attempt_note()}"
             else:
-                return False, f"切换失败，状态码: {response.status_code}\n响应: {response.text}"
+                return False, f"切换失败，状态码: {response.status_code}{self._attempt_note()}\n响应: {response.text}"
         except Exception as e:
-            return False, f"网络错误: {str(e)}"
+            return False, f"网络错误: {str(e)}{self._attempt_note()}"
 
     def put_user_on_plan(self, plan_id: str) -> Tuple[bool, str]:
         """将登录账号改为指定计划"""
         try:
-            url = f"{self.config.get('api.base_url')}/put-user-on-plan"
-            headers = self._get_headers()
             data = {"planId": plan_id}
 
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
+            response = self._request('POST', '/put-user-on-plan', limited=True, idempotent=False, json=data)
 
             if response.status_code == 200:
-                return True, f"账号已成功切换到 {plan_id}"
+                return True, f"账号已成功切换到 {plan_id}{self._attempt_note()}"
+            else:
+                return False, f"切换失败，状态码: {response.status_code}{self._attempt_note()}\n响应: {response.text}"
+        except Exception as e:
+            return False, f"网络错误: {str(e)}{self._attempt_note()}"
+
+
+class CancellationToken:
+    """协作式取消令牌，批量循环在两次请求之间检查"""
+
+    USER = "user"
+    SHUTDOWN = "shutdown"
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = USER):
+        """请求取消，reason 区分用户取消与程序退出"""
+        if not self._event.is_set():
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """等待至多 timeout 秒，期间被取消时提前返回 True"""
+        return self._event.wait(timeout)
+
+
+class BatchResult:
+    """批量操作结果汇总，按输入顺序整理各项结果"""
+
+    def __init__(self, item_ids: List[str], action: str = "批量删除", item_name: str = "ID"):
+        self.item_ids = list(item_ids)
+        self.action = action
+        self.item_name = item_name
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    @property
+    def processed_count(self) -> int:
+        """已处理的项目数量"""
+        return len(self.succeeded) + len(self.failed)
+
+    @property
+    def success(self) -> bool:
+        """是否全部成功"""
+        return not self.failed
+
+    def record(self, item_id: str, success: bool, message: str):
+        """记录单个项目的执行结果"""
+        with self._lock:
+            if success:
+                self.succeeded.append(item_id)
             else:
-                return False, f"切换失败，状态码: {response.status_code}\n响应: {response.text}"
+                self.failed[item_id] = message
+
+    def failed_ids(self) -> List[str]:
+        """按输入顺序返回失败的ID"""
+        return [item_id for item_id in self.item_ids if item_id in self.failed]
+
+    def processed_ids(self) -> List[str]:
+        """按输入顺序返回已处理（成功或失败）的ID"""
+        with self._lock:
+            processed = set(self.succeeded) | set(self.failed)
+        return [item_id for item_id in self.item_ids if item_id in processed]
+
+    def skipped_ids(self) -> List[str]:
+        """按输入顺序返回未处理的ID"""
+        with self._lock:
+            processed = set(self.succeeded) | set(self.failed)
+        return [item_id for item_id in self.item_ids if item_id not in processed]
+
+    def summary(self) -> str:
+        """生成批量操作结果摘要"""
+        if self.cancelled:
+            message = (f"{self.action}已取消：成功 {len(self.succeeded)} 个，失败 {len(self.failed)} 个，"
+                       f"未处理 {len(self.skipped_ids())} 个")
+        else:
+            message = f"{self.action}完成：成功 {len(self.succeeded)} 个，失败 {len(self.failed)} 个"
+        failed_ids = self.failed_ids()
+        if failed_ids:
+            message += f"\n失败的{self.item_name}: {', '.join(failed_ids)}"
+        return message
+
+
+class BatchExecutor:
+    """批量请求执行器，使用有界线程池并发执行请求"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, int(max_workers))
+
+    def run(self, item_ids: List[str], func: Callable[[str], Tuple[bool, str]],
+            on_result: Optional[Callable[[str, bool, str, BatchResult], None]] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            result: Optional[BatchResult] = None) -> BatchResult:
+        """并发执行 func(item_id)，结果完成顺序不定，回调在调用线程中执行
+
+        请求按需提交，在途数量不超过 max_workers；取消后不再提交新请求，
+        只等待在途请求完成。
+        """
+        result = result or BatchResult(item_ids)
+        if not item_ids:
+            return result
+
+        workers = min(self.max_workers, len(item_ids))
+        pending_items = iter(item_ids)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+            in_flight = {}
+
+            def submit_next():
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    return
+                item_id = next(pending_items, None)
+                if item_id is not None:
+                    in_flight[pool.submit(func, item_id)] = item_id
+
+            for _ in range(workers):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item_id = in_flight.pop(future)
+                    try:
+                        success, message = future.result()
+                    except Exception as e:
+                        success, message = False, f"操作异常: {str(e)}"
+                    result.record(item_id, success, message)
+                    if on_result:
+                        on_result(item_id, success, message, result)
+                    submit_next()
+
+        result.cancelled = cancel_token is not None and cancel_token.is_cancelled and bool(result.skipped_ids())
+        return result
+
+
+class AsyncResponse:
+    """已读取完毕的 aiohttp 响应，提供与 requests.Response 相同的常用属性"""
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncLoopThread:
+    """专用的 asyncio 事件循环线程，所有 AsyncAPIClient 实例共享"""
+
+    _instance: Optional['AsyncLoopThread'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="async-api", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @classmethod
+    def instance(cls) -> 'AsyncLoopThread':
+        """获取（必要时启动）共享的事件循环线程"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, coro):
+        """把协程提交到事件循环，返回 concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+class AsyncAPIClient:
+    """基于 asyncio 的 API 客户端，用于大量并发请求
+
+    接口与 APIClient 相同（协程版本），在共享的事件循环线程中执行，
+    在途请求数由 performance.async_concurrent_limit 控制，不需要每个请求占用一个线程。
+    界面通过 AsyncWorker 使用：结果经 Qt 信号从事件循环线程交回界面线程。
+    每个账号一个 APIClient + AsyncAPIClient，所有实例共用同一个事件循环线程。
+    与所属 APIClient 共用熔断器、请求指标和传输层（请求记录、离线重放）；
+    修改类请求经过独立的自适应限流器，上限为 async_concurrent_limit。
+    安装了 aiohttp 且使用真实网络时用 aiohttp 发送请求，否则在线程池中调用 APIClient 的传输层。
+    """
+
+    def __init__(self, api_client: APIClient):
+        self.api_client = api_client
+        self.config = api_client.config
+        self.loop_thread = AsyncLoopThread.instance()
+        self.rate_limiter = AdaptiveRateLimiter(self.concurrent_limit)
+        # 以下对象只在事件循环线程中创建和使用
+        self._session = None
+        self._session_key = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_limit = 0
+
+    @property
+    def concurrent_limit(self) -> int:
+        return max(1, int(self.config.get('performance.async_concurrent_limit', 100)))
+
+    @property
+    def uses_aiohttp(self) -> bool:
+        """是否通过 aiohttp 直接访问网络（重放模式下始终走 APIClient 的传输层）"""
+        return aiohttp is not None and isinstance(self.api_client.transport, HTTPTransport)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """在途请求上限，配置变化后新请求使用新的上限"""
+        if self._semaphore is None or self._semaphore_limit != self.concurrent_limit:
+            self._semaphore_limit = self.concurrent_limit
+            self._semaphore = asyncio.Semaphore(self._semaphore_limit)
+        return self._semaphore
+
+    def _get_session(self):
+        """获取 aiohttp 会话，传输相关设置变化时重建"""
+        key = HTTPTransport.transport_key(self.config) + (self.concurrent_limit,)
+        if self._session is None or key != self._session_key:
+            if self._session is not None:
+                asyncio.ensure_future(self._session.close())
+            connector = aiohttp.TCPConnector(limit=self.concurrent_limit, ssl=None if key[3] else False)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_key = key
+        return self._session
+
+    @staticmethod
+    def _retry_exceptions() -> Tuple:
+        if aiohttp is None:
+            return RetryPolicy.RETRY_EXCEPTIONS
+        return RetryPolicy.RETRY_EXCEPTIONS + (
+            aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+    async def _acquire_slot(self) -> float:
+        """等待限流器的空闲槽位（限流器基于线程锁，这里轮询以免阻塞事件循环）"""
+        self.rate_limiter.set_max_limit(self.concurrent_limit)
+        while True:
+            started = self.rate_limiter.try_acquire()
+            if started is not None:
+                return started
+            await asyncio.sleep(0.02)
+
+    async def _send(self, method: str, url: str, timeout: float, **kwargs):
+        """发送单次请求"""
+        if not self.uses_aiohttp:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(
+                self.api_client.transport.request, method, url, timeout=timeout, **kwargs))
+
+        session = self._get_session()
+        _, _, proxy, _ = self._session_key[:4]
+        proxy_url = f"http://{proxy[0]}:{proxy[1]}" if proxy and proxy[0] else None
+        recorder = self.api_client.transport.recorder
+        started = time.monotonic()
+        try:
+            async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                       proxy=proxy_url, **kwargs) as response:
+                content = await response.read()
+                result = AsyncResponse(response.status, response.headers, content)
+        except Exception as e:
+            if recorder is not None:
+                recorder.record(method, url, kwargs, started, error=e)
+            raise
+        if recorder is not None:
+            recorder.record(method, url, kwargs, started, response=result)
+        return result
+
+    async def _measured_send(self, method: str, url: str, timeout: float, limited: bool,
+                             endpoint: str, **kwargs):
+        """发送单次请求并记录指标；limited=True 时占用限流槽位并反馈结果"""
+        started = await self._acquire_slot() if limited else None
+        outcome = AdaptiveRateLimiter.ERROR
+        measure_started = time.perf_counter()
+        try:
+            response = await self._send(method, url, timeout, **kwargs)
+        except Exception as e:
+            self.api_client.metrics.record(endpoint, None, time.perf_counter() - measure_started)
+            if isinstance(e, (requests.exceptions.Timeout, asyncio.TimeoutError)):
+                outcome = AdaptiveRateLimiter.THROTTLED
+            raise
+        else:
+            body = RequestRecorder._request_body(kwargs)
+            self.api_client.metrics.record(endpoint, response.status_code, time.perf_counter() - measure_started,
+                                           len(body.encode('utf-8')) if body else 0, len(response.content))
+            if response.status_code in (429, 503):
+                outcome = AdaptiveRateLimiter.THROTTLED
+            elif response.status_code < 500:
+                outcome = AdaptiveRateLimiter.OK
+            return response
+        finally:
+            if started is not None:
+                self.rate_limiter.release(started, outcome)
+
+    async def _request(self, method: str, path: str, *, idempotent: bool, limited: bool = False,
+                       **kwargs) -> Tuple[Any, int]:
+        """按重试策略发送请求，返回 (响应, 尝试次数)，最终失败时抛出原异常；idempotent 同 APIClient._request"""
+        url = f"{self.config.get('api.base_url')}{path}"
+        headers = self.config.get('api.headers', {}).copy()
+        if 'content-type' not in headers:
+            headers['content-type'] = 'application/json'
+        timeout = self.config.get('performance.request_timeout', 30)
+        policy = RetryPolicy.from_config(self.config)
+        retry_exceptions = self._retry_exceptions()
+        endpoint = RequestMetrics.endpoint_key(method, path)
+        breaker = self.api_client.breaker
+        credential = self.config.get('api.headers.cookie', '')
+
+        attempt = 0
+        backoff = 0.0
+        while True:
+            attempt += 1
+            if not breaker.allow(credential):
+                self.api_client._record_attempts(attempt - 1, backoff)
+                raise CircuitOpenError(breaker.describe())
+            if attempt > 1:
+                self.api_client.metrics.record_retry(endpoint)
+            try:
+                response = await self._measured_send(method, url, timeout, limited, endpoint,
+                                                     headers=headers, **kwargs)
+                breaker.record(response.status_code, credential)
+                self.api_client.observe_session(response.status_code, credential)
+            except retry_exceptions as error:
+                breaker.record(None, credential)
+                if attempt > policy.max_retries or not policy.should_retry_error(error, idempotent):
+                    self.api_client._record_attempts(attempt, backoff)
+                    raise
+                delay = policy.compute_delay(attempt)
+            except Exception:
+                breaker.record(None, credential)
+                self.api_client._record_attempts(attempt, backoff)
+                raise
+            else:
+                if attempt > policy.max_retries or not policy.should_retry(response, idempotent):
+                    self.api_client._record_attempts(attempt, backoff)
+                    return response, attempt
+                delay = policy.compute_delay(attempt, response)
+                if delay is None:
+                    self.api_client._record_attempts(attempt, backoff)
+                    return response, attempt
+            backoff += delay
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _attempt_note(attempts: int) -> str:
+        return f"（共尝试 {attempts} 次）" if attempts > 1 else ""
+
+    async def get_team_data(self) -> Tuple[bool, Any]:
+        """获取团队数据"""
+        try:
+            response, attempts = await self._request('GET', '/team', idempotent=True)
+            if response.status_code == 200:
+                try:
+                    return True, response.json()
+                except ValueError as json_error:
+                    return False, f"JSON解析失败: {str(json_error)}"
+            return False, (f"请求失败，状态码: {response.status_code}{self._attempt_note(attempts)}\n"
+                           f"响应内容: {response.text[:200]}...")
+        except Exception as e:
+            return False, f"网络错误: {str(e) or type(e).__name__}"
+
+    async def invite_members(self, emails: List[str]) -> Tuple[bool, str]:
+        """批量邀请成员"""
+        success, message, _, _ = await self.send_invites(emails)
+        return success, message
+
+    async def send_invites(self, emails: List[str]) -> Tuple[bool, str, Optional[int], Optional[Exception]]:
+        """发送一个邀请块，返回 (是否成功, 消息, 状态码, 异常)；网络错误时状态码为 None"""
+        try:
+            response, attempts = await self._request('POST', '/team/invite', limited=True, idempotent=False,
+                                                         json={"emails": emails})
+            if response.status_code == 200:
+                return True, f"邀请发送成功{self._attempt_note(attempts)}", 200, None
+            return (False, f"邀请失败，状态码: {response.status_code}{self._attempt_note(attempts)}\n响应: {response.text}",
+                    response.status_code, None)
+        except Exception as e:
+            return False, f"网络错误: {str(e) or type(e).__name__}", None, e
+
+    async def delete_member(self, member_id: str) -> Tuple[bool, str]:
+        """删除单个成员或邀请"""
+        try:
+            response, attempts = await self._request('DELETE', f"/team/invite/{member_id}", limited=True, idempotent=False)
+            if response.status_code == 200:
+                return True, f"删除成功{self._attempt_note(attempts)}"
+            return False, f"删除失败，状态码: {response.status_code}{self._attempt_note(attempts)}"
+        except Exception as e:
+            return False, f"网络错误: {str(e) or type(e).__name__}"
+
+    async def put_user_on_community_plan(self) -> Tuple[bool, str]:
+        """将登录账号改为 community plan"""
+        return await self.put_user_on_plan("orb_community_plan", "Community Plan")
+
+    async def put_user_on_max_plan(self) -> Tuple[bool, str]:
+        """将登录账号改为 max plan"""
+        return await self.put_user_on_plan("orb_max_plan", "Max Plan")
+
+    async def put_user_on_plan(self, plan_id: str, plan_name: Optional[str] = None) -> Tuple[bool, str]:
+        """将登录账号改为指定计划"""
+        try:
+            response, attempts = await self._request('POST', '/put-user-on-plan', limited=True, idempotent=False,
+                                                         json={"planId": plan_id})
+            if response.status_code == 200:
+                return True, f"账号已成功切换到 {plan_name or plan_id}{self._attempt_note(attempts)}"
+            return False, f"切换失败，状态码: {response.status_code}{self._attempt_note(attempts)}\n响应: {response.text}"
         except Exception as e:
-            return False, f"网络错误: {str(e)}"
+            return False, f"网络错误: {str(e) or type(e).__name__}"
+
+    async def run_items(self, item_ids: List[str], func: Callable[[str], Any],
+                        on_result: Optional[Callable[[str, bool, str, BatchResult], None]] = None,
+                        cancel_token: Optional[CancellationToken] = None,
+                        result: Optional[BatchResult] = None) -> BatchResult:
+        """在事件循环中并发执行协程 func(item_id)，与 BatchExecutor.run 相同，回调在事件循环线程中执行
+
+        在途数量不超过 async_concurrent_limit；取消后尚未开始的项目不再发送，已在途的请求照常完成。
+        """
+        result = result or BatchResult(item_ids)
+
+        async def run_one(item_id):
+            async with self._get_semaphore():
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    return
+                try:
+                    success, message = await func(item_id)
+                except Exception as e:
+                    success, message = False, f"操作异常: {str(e) or type(e).__name__}"
+                result.record(item_id, success, message)
+                if on_result:
+                    on_result(item_id, success, message, result)
+
+        await asyncio.gather(*(run_one(item_id) for item_id in dict.fromkeys(item_ids)))
+        result.cancelled = cancel_token is not None and cancel_token.is_cancelled and bool(result.skipped_ids())
+        return result
+
+    def close(self, timeout: float = 2.0):
+        """关闭 aiohttp 会话（传输层由所属 APIClient 负责关闭）"""
+
+        async def close_session():
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        try:
+            self.loop_thread.submit(close_session()).result(timeout)
+        except Exception:
+            pass
 
 
-class WorkerThread(QThread):
+class BatchJournal:
+    """批量任务日志：追加写入计划ID与逐项结果，用于中断后恢复未完成的任务
+
+    每行一条 JSON 记录：plan（任务计划，含账号指纹）、done（单项结果）、end（任务结束）。
+    单项结果按批次 fsync，任务开始与结束时立即 fsync。
+    """
+
+    def __init__(self, path: str = "team_manager_jobs.journal", fsync_every: int = 20,
+                 fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._open_jobs = {job['job'] for job in self.pending_jobs()}
+
+    def begin(self, operation: str, item_ids: List[str], job_id: Optional[str] = None,
+              account: Optional[str] = None) -> str:
+        """记录任务计划；恢复已有任务时只返回原任务ID"""
+        if job_id is not None:
+            with self._lock:
+                self._open_jobs.add(job_id)
+            return job_id
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._open_jobs.add(job_id)
+            self._append({'type': 'plan', 'job': job_id, 'op': operation, 'account': account,
+                          'ids': list(item_ids), 'ts': time.time()}, force_sync=True)
+        return job_id
+
+    def record(self, job_id: str, item_id: str, success: bool):
+        """记录单项结果（批量 fsync）"""
+        with self._lock:
+            self._append({'type': 'done', 'job': job_id, 'id': item_id, 'ok': success})
+
+    def finish(self, job_id: str):
+        """标记任务结束；没有未完成任务时压缩（清空）日志文件"""
+        with self._lock:
+            self._append({'type': 'end', 'job': job_id, 'ts': time.time()}, force_sync=True)
+            self._open_jobs.discard(job_id)
+            if not self._open_jobs:
+                self._close_file()
+                open(self.path, 'w', encoding='utf-8').close()
+
+    def flush(self):
+        """立即同步到磁盘"""
+        with self._lock:
+            self._sync()
+
+    def _append(self, record: Dict[str, Any], force_sync: bool = False):
+        """追加一条记录，按条数或时间间隔批量 fsync"""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._unsynced += 1
+        if (force_sync or self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync()
+
+    def _sync(self):
+        """flush + fsync"""
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_file(self):
+        """同步并关闭文件"""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def pending_jobs(self) -> List[Dict[str, Any]]:
+        """重放日志，返回未结束的任务及其尚未成功的ID"""
+        if not os.path.exists(self.path):
+            return []
+        jobs: Dict[str, Dict[str, Any]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 崩溃时可能留下不完整的最后一行
+                job = jobs.get(record.get('job'))
+                if record.get('type') == 'plan':
+                    jobs[record['job']] = {'job': record['job'], 'op': record['op'], 'ids': record['ids'],
+                                           'ts': record.get('ts'), 'account': record.get('account'),
+                                           'completed': set()}
+                elif job is not None and record.get('type') == 'done' and record.get('ok'):
+                    job['completed'].add(record['id'])
+                elif record.get('type') == 'end':
+                    jobs.pop(record.get('job'), None)
+
+        pending = []
+        for job in jobs.values():
+            remaining = [item_id for item_id in job['ids'] if item_id not in job['completed']]
+            if remaining:
+                pending.append({'job': job['job'], 'op': job['op'], 'ts': job['ts'], 'account': job['account'],
+                                'total': len(job['ids']), 'remaining': remaining})
+        return pending
+
+    def close(self):
+        """关闭日志文件"""
+        with self._lock:
+            self._close_file()
+
+
+class BatchJobSupport:
+    """WorkerThread 与 AsyncWorker 共用的批量任务逻辑：任务日志、邀请块处理规则与重试开销说明
+
+    使用方需提供 api_client、operation、journal、kwargs、cancel_token、progress 信号。
+    """
+
+    # 支持协作式取消的操作
+    CANCELLABLE_OPERATIONS = {"batch_delete", "invite_members"}
+
+    # 请求内容被拒绝时才拆分邀请块；认证失败等其他错误拆分后结果相同
+    INVITE_SPLIT_STATUS_CODES = {400, 422}
+    AUTH_ERROR_STATUS_CODES = {401, 403}
+
+    # 邀请块的处理方式
+    INVITE_RECORD = "record"
+    INVITE_SPLIT = "split"
+    INVITE_AUTH_ERROR = "auth_error"
+    INVITE_RETRY = "retry"
+
+    # 邀请块的瞬时失败按块单独重试，次数与单个请求的重试分开计算（performance.invite_chunk_retries）。
+    # 邀请是非幂等 POST：只有确定服务器没有处理的失败（429/503 拒绝、连接未建立）才重新发送整块；
+    # 500/502/504 或连接建立后超时、断开时邀请可能已经发出，重发会产生重复邀请，
+    # 这类失败不自动重试，结果中提示刷新后确认。
+    INVITE_CHUNK_BASE_DELAY = 2.0
+    INVITE_MAY_HAVE_APPLIED_NOTE = "\n请求可能已被服务器执行，未自动重发，请刷新后确认是否已邀请"
+
+    def init_batch_state(self):
+        self.cancel_token = CancellationToken()
+        # 批量操作进行中的结果，关闭程序时用于报告已处理的ID
+        self.batch_result: Optional[BatchResult] = None
+        # 邀请时遇到的认证错误（401/403），之后的邀请块直接记为失败
+        self.auth_error: Optional[str] = None
+
+    def begin_journal(self, item_ids: List[str]) -> Optional[str]:
+        """在任务日志中登记本次操作（恢复任务时沿用原任务ID）"""
+        if self.journal is None:
+            return None
+        return self.journal.begin(self.operation, item_ids, self.kwargs.get('journal_id'),
+                                  account=self.api_client.account_fingerprint())
+
+    def end_journal(self, journal_id: Optional[str], result: BatchResult):
+        """结束任务日志；程序退出导致的中断保留任务，下次启动时可恢复"""
+        if self.journal is None:
+            return
+        if result.cancelled and self.cancel_token.reason == CancellationToken.SHUTDOWN:
+            self.journal.flush()
+        else:
+            self.journal.finish(journal_id)
+
+    def delete_progress(self, journal_id: Optional[str], total: int):
+        """批量删除的逐项回调：写任务日志并报告进度"""
+        def on_result(member_id, success, message, result):
+            if self.journal is not None:
+                self.journal.record(journal_id, member_id, success)
+            done = result.processed_count
+            self.progress.emit(int(done / total * 100), f"删除成员 {done}/{total}")
+        return on_result
+
+    def plan_invite_chunks(self, emails: List[str]) -> Dict[str, List[str]]:
+        """去重后按 performance.invite_chunk_size 切分邮箱"""
+        chunk_size = max(1, int(self.api_client.config.get('performance.invite_chunk_size', 50)))
+        return {str(index): emails[start:start + chunk_size]
+                for index, start in enumerate(range(0, len(emails), chunk_size))}
+
+    def invite_progress(self, journal_id: Optional[str], chunks: Dict[str, List[str]],
+                        email_result: BatchResult):
+        """邀请块完成回调：逐个邮箱写任务日志并报告进度"""
+        total = len(email_result.item_ids)
+
+        def on_result(chunk_key, success, message, result):
+            if self.journal is not None:
+                for email in chunks[chunk_key]:
+                    self.journal.record(journal_id, email, email not in email_result.failed)
+            done = email_result.processed_count
+            self.progress.emit(int(done / total * 100), f"发送邀请 {done}/{total}")
+        return on_result
+
+    @staticmethod
+    def chunk_outcome(emails: List[str], email_result: BatchResult) -> Tuple[bool, str]:
+        failed = [email for email in emails if email in email_result.failed]
+        return not failed, f"{len(failed)} 个邮箱失败" if failed else "邀请发送成功"
+
+    def invite_chunk_policy(self) -> RetryPolicy:
+        """邀请块级重试的次数与退避"""
+        return RetryPolicy(max_retries=self.api_client.config.get('performance.invite_chunk_retries', 2),
+                           base_delay=self.INVITE_CHUNK_BASE_DELAY)
+
+    def invite_chunk_action(self, emails: List[str], success: bool, status_code: Optional[int],
+                            error: Optional[Exception] = None, attempt: int = 1,
+                            policy: Optional[RetryPolicy] = None) -> str:
+        """根据邀请块的响应决定：记录结果、二分拆开重试、退避后整块重发，或记为认证失败并停止后续块"""
+        if success:
+            return self.INVITE_RECORD
+        if status_code in self.AUTH_ERROR_STATUS_CODES:
+            return self.INVITE_AUTH_ERROR
+        if self.cancel_token.is_cancelled:
+            return self.INVITE_RECORD
+        if status_code in self.INVITE_SPLIT_STATUS_CODES and len(emails) > 1:
+            return self.INVITE_SPLIT
+        if (policy is not None and attempt <= policy.max_retries
+                and RetryPolicy.request_not_applied(status_code, error)):
+            return self.INVITE_RETRY
+        return self.INVITE_RECORD
+
+    def invite_failure_message(self, message: str, status_code: Optional[int], error: Optional[Exception]) -> str:
+        """邀请块失败的说明，请求可能已被执行时附加提示"""
+        if RetryPolicy.request_may_have_applied(status_code, error):
+            return message + self.INVITE_MAY_HAVE_APPLIED_NOTE
+        return message
+
+    def retry_cost_note(self, before: Dict[str, Any]) -> str:
+        """根据重试统计差值生成重试开销说明"""
+        after = self.api_client.get_retry_stats()
+        extra_attempts = (after['attempts'] - before['attempts']) - (after['calls'] - before['calls'])
+        if extra_attempts <= 0:
+            return ""
+        retried_calls = after['retried_calls'] - before['retried_calls']
+        backoff = after['backoff_seconds'] - before['backoff_seconds']
+        return f"\n重试开销: {retried_calls} 个请求共额外重试 {extra_attempts} 次，退避等待 {backoff:.1f} 秒"
+
+
+class WorkerThread(BatchJobSupport, QThread):
     """工作线程类，用于执行耗时操作"""
     
     finished = pyqtSignal(bool, str, object)  # success, message, data
     progress = pyqtSignal(int, str)  # progress, status
-    
-    def __init__(self, api_client: APIClient, operation: str, **kwargs):
+
+    def __init__(self, api_client: APIClient, operation: str, journal: Optional[BatchJournal] = None, **kwargs):
         super().__init__()
         self.api_client = api_client
         self.operation = operation
+        self.journal = journal
         self.kwargs = kwargs
+        self.init_batch_state()
     
     def run(self):
         """执行操作"""
         try:
             if self.operation == "get_team_data":
                 success, result = self.api_client.get_team_data()
+                if success and result is not NOT_MODIFIED:
+                    # 在工作线程中解析一次，界面线程只读取快照
+                    try:
+                        result = TeamSnapshot.from_payload(result)
+                    except Exception:
+                        # 解析失败时不能保留校验信息，否则之后的刷新都会被判定为未变化
+                        self.api_client.invalidate_team_cache()
+                        raise
                 self.finished.emit(success, str(result) if not success else "", result if success else None)
             
             elif self.operation == "invite_members":
                 emails = self.kwargs.get('emails', [])
-                success, message = self.api_client.invite_members(emails)
-                self.finished.emit(success, message, None)
+                stats_before = self.api_client.get_retry_stats()
+                result = self.run_invite_members(emails)
+                self.finished.emit(result.success, result.summary() + self.retry_cost_note(stats_before), result)
             
             elif self.operation == "delete_member":
                 member_id = self.kwargs.get('member_id')
@@ -790,41 +3032,461 @@ class WorkerThread(QThread):
             
             elif self.operation == "batch_delete":
                 member_ids = self.kwargs.get('member_ids', [])
-                success_count = 0
-                failed_count = 0
-                failed_ids = []
+                stats_before = self.api_client.get_retry_stats()
+                result = self.run_batch_delete(member_ids)
+                self.finished.emit(result.success, result.summary() + self.retry_cost_note(stats_before), result)
+
+            elif self.operation == "put_user_on_community_plan":
+                success, message = self.api_client.put_user_on_community_plan()
+                self.finished.emit(success, message, None)
+
+            elif self.operation == "put_user_on_max_plan":
+                success, message = self.api_client.put_user_on_max_plan()
+                self.finished.emit(success, message, None)
+
+            elif self.operation == "put_user_on_plan":
+                plan_id = self.kwargs.get('plan_id', 'orb_community_plan')
+                success, message = self.api_client.put_user_on_plan(plan_id)
+                self.finished.emit(success, message, None)
+
+            elif self.operation == "debug_team_data":
+                snapshot = self.kwargs['snapshot']
+                self.finished.emit(True, "", snapshot.debug_report())
+
+            else:
+                self.finished.emit(False, f"未知操作: {self.operation}", None)
+
+        except Exception as e:
+            self.finished.emit(False, f"操作异常: {str(e)}", None)
+
+    def run_batch_delete(self, member_ids: List[str]) -> BatchResult:
+        """按 performance.concurrent_limit 并发删除，进度按完成数量计算"""
+        concurrent_limit = self.api_client.config.get('performance.concurrent_limit', 5)
+        journal_id = self.begin_journal(member_ids)
+        self.batch_result = BatchResult(member_ids)
+        executor = BatchExecutor(concurrent_limit)
+        result = executor.run(member_ids, self.api_client.delete_member,
+                              self.delete_progress(journal_id, len(member_ids)),
+                              cancel_token=self.cancel_token, result=self.batch_result)
+        self.end_journal(journal_id, result)
+        return result
+
+    def run_invite_members(self, emails: List[str]) -> BatchResult:
+        """分块并发邀请：按 performance.invite_chunk_size 切分，块之间互不影响"""
+        emails = list(dict.fromkeys(emails))
+        chunks = self.plan_invite_chunks(emails)
+        concurrent_limit = self.api_client.config.get('performance.concurrent_limit', 5)
+        journal_id = self.begin_journal(emails)
+
+        self.batch_result = BatchResult(emails, action="邀请", item_name="邮箱")
+        email_result = self.batch_result
+
+        def invite_chunk(chunk_key):
+            self.invite_chunk(chunks[chunk_key], email_result)
+            return self.chunk_outcome(chunks[chunk_key], email_result)
+
+        executor = BatchExecutor(concurrent_limit)
+        chunk_result = executor.run(list(chunks), invite_chunk, self.invite_progress(journal_id, chunks, email_result),
+                                    cancel_token=self.cancel_token)
+        email_result.cancelled = chunk_result.cancelled
+        self.end_journal(journal_id, email_result)
+        return email_result
+
+    def invite_chunk(self, emails: List[str], result: BatchResult):
+        """发送一个邀请块；被服务器拒绝（400/422）的块二分拆开重试，以隔离问题邮箱；
+        确定未被处理的瞬时失败退避后整块重发"""
+        policy = self.invite_chunk_policy()
+        attempt = 0
+        while True:
+            attempt += 1
+            auth_error = self.auth_error
+            if auth_error is not None:
+                # 其他块已遇到认证失败，不再发送请求
+                for email in emails:
+                    result.record(email, False, auth_error)
+                return
+            success, message = self.api_client.invite_members(emails)
+            status_code, error = self.api_client.last_status_code, self.api_client.last_error
+            action = self.invite_chunk_action(emails, success, status_code, error, attempt, policy)
+            if action != self.INVITE_RETRY:
+                break
+            delay = policy.compute_delay(attempt)
+            logger.info("邀请块（%d 个邮箱）第 %d 次失败，%.1f 秒后重发: %s", len(emails), attempt, delay, message)
+            if self.cancel_token.wait(delay):
+                break
+
+        if action == self.INVITE_AUTH_ERROR:
+            self.auth_error = message
+        elif action == self.INVITE_SPLIT:
+            middle = len(emails) // 2
+            self.invite_chunk(emails[:middle], result)
+            self.invite_chunk(emails[middle:], result)
+            return
+        if not success:
+            message = self.invite_failure_message(message, status_code, error)
+        for email in emails:
+            result.record(email, success, message)
+
+
+class AsyncWorker(BatchJobSupport, QObject):
+    """与 WorkerThread 接口相同的异步任务：在 AsyncAPIClient 的事件循环线程中执行，不占用工作线程
+
+    进度和结果通过 Qt 信号从事件循环线程发出，由界面线程按队列连接接收。
+    start / wait / isRunning / isFinished / terminate 与 QThread 对应，调度器可以同样对待。
+    """
+
+    finished = pyqtSignal(bool, str, object)  # success, message, data
+    progress = pyqtSignal(int, str)  # progress, status
+    # 内部信号：任务结束后经界面线程的事件循环转发为 finished
+    _completed = pyqtSignal(object)
+
+    # performance.async_batch 开启时经由异步客户端执行的操作（批量操作页的删除、邀请和计划切换）
+    OPERATIONS = {"batch_delete", "invite_members", "put_user_on_community_plan",
+                  "put_user_on_max_plan", "put_user_on_plan"}
+
+    def __init__(self, async_client: AsyncAPIClient, operation: str,
+                 journal: Optional[BatchJournal] = None, **kwargs):
+        super().__init__()
+        self.async_client = async_client
+        self.api_client = async_client.api_client
+        self.operation = operation
+        self.journal = journal
+        self.kwargs = kwargs
+        self.init_batch_state()
+        self._future = None
+        self._done = threading.Event()
+        self._completed.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    def start(self):
+        """把任务提交到事件循环"""
+        self._future = self.async_client.loop_thread.submit(self._run())
+        self._future.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        """任务结束：先标记完成再转发结果，收到 finished 时 isFinished() 已为 True。
+        任务在 start() 返回前就已结束时回调在调用线程中执行，排队转发保证 finished 不会在 start() 内发出"""
+        self._done.set()
+        if not future.cancelled():
+            self._completed.emit(future.result())
+
+    def _deliver(self, outcome: Tuple[bool, str, Any]):
+        self.finished.emit(*outcome)
+
+    def isRunning(self) -> bool:
+        return self._future is not None and not self._done.is_set()
+
+    def isFinished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, msecs: Optional[int] = None) -> bool:
+        """等待任务结束，超时返回 False"""
+        if self._future is None:
+            return True
+        return self._done.wait(None if msecs is None else msecs / 1000)
+
+    def terminate(self):
+        """取消事件循环中的任务（在途请求被中断，结果未知）"""
+        if self._future is not None:
+            self._future.cancel()
+
+    async def _run(self) -> Tuple[bool, str, Any]:
+        """执行操作，返回 finished 信号的参数"""
+        try:
+            stats_before = self.api_client.get_retry_stats()
+            if self.operation == "batch_delete":
+                result = await self.run_batch_delete(self.kwargs.get('member_ids', []))
+                return result.success, result.summary() + self.retry_cost_note(stats_before), result
+
+            elif self.operation == "invite_members":
+                result = await self.run_invite_members(self.kwargs.get('emails', []))
+                return result.success, result.summary() + self.retry_cost_note(stats_before), result
 
-                for i, member_id in enumerate(member_ids):
-                    self.progress.emit(int((i + 1) / len(member_ids) * 100), f"删除成员 {i + 1}/{len(member_ids)}")
+            elif self.operation in ("put_user_on_community_plan", "put_user_on_max_plan"):
+                success, message = await getattr(self.async_client, self.operation)()
+                return success, message, None
 
-                    success, message = self.api_client.delete_member(member_id)
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_count += 1
-                        failed_ids.append(member_id)
+            elif self.operation == "put_user_on_plan":
+                success, message = await self.async_client.put_user_on_plan(
+                    self.kwargs.get('plan_id', 'orb_community_plan'))
+                return success, message, None
 
-                result_message = f"批量删除完成：成功 {success_count} 个，失败 {failed_count} 个"
-                if failed_ids:
-                    result_message += f"\n失败的ID: {', '.join(failed_ids)}"
+            else:
+                return False, f"未知操作: {self.operation}", None
 
-                self.finished.emit(failed_count == 0, result_message, None)
+        except Exception as e:
+            return False, f"操作异常: {str(e)}", None
+
+    async def run_batch_delete(self, member_ids: List[str]) -> BatchResult:
+        """在事件循环中并发删除，在途请求数由 async_concurrent_limit 控制"""
+        journal_id = self.begin_journal(member_ids)
+        self.batch_result = BatchResult(member_ids)
+        result = await self.async_client.run_items(member_ids, self.async_client.delete_member,
+                                                   self.delete_progress(journal_id, len(member_ids)),
+                                                   cancel_token=self.cancel_token, result=self.batch_result)
+        self.end_journal(journal_id, result)
+        return result
 
-            elif self.operation == "put_user_on_community_plan":
-                success, message = self.api_client.put_user_on_community_plan()
-                self.finished.emit(success, message, None)
+    async def run_invite_members(self, emails: List[str]) -> BatchResult:
+        """分块并发邀请，规则与 WorkerThread.run_invite_members 相同"""
+        emails = list(dict.fromkeys(emails))
+        chunks = self.plan_invite_chunks(emails)
+        journal_id = self.begin_journal(emails)
+
+        self.batch_result = BatchResult(emails, action="邀请", item_name="邮箱")
+        email_result = self.batch_result
+
+        async def invite_chunk(chunk_key):
+            await self.invite_chunk(chunks[chunk_key], email_result)
+            return self.chunk_outcome(chunks[chunk_key], email_result)
+
+        chunk_result = await self.async_client.run_items(list(chunks), invite_chunk,
+                                                         self.invite_progress(journal_id, chunks, email_result),
+                                                         cancel_token=self.cancel_token)
+        email_result.cancelled = chunk_result.cancelled
+        self.end_journal(journal_id, email_result)
+        return email_result
+
+    async def invite_chunk(self, emails: List[str], result: BatchResult):
+        """发送一个邀请块，拆分、整块重发与认证失败的处理同 WorkerThread.invite_chunk"""
+        policy = self.invite_chunk_policy()
+        attempt = 0
+        while True:
+            attempt += 1
+            auth_error = self.auth_error
+            if auth_error is not None:
+                for email in emails:
+                    result.record(email, False, auth_error)
+                return
+            success, message, status_code, error = await self.async_client.send_invites(emails)
+            action = self.invite_chunk_action(emails, success, status_code, error, attempt, policy)
+            if action != self.INVITE_RETRY:
+                break
+            delay = policy.compute_delay(attempt)
+            logger.info("邀请块（%d 个邮箱）第 %d 次失败，%.1f 秒后重发: %s", len(emails), attempt, delay, message)
+            await asyncio.sleep(delay)
+            if self.cancel_token.is_cancelled:
+                break
+
+        if action == self.INVITE_AUTH_ERROR:
+            self.auth_error = message
+        elif action == self.INVITE_SPLIT:
+            middle = len(emails) // 2
+            await self.invite_chunk(emails[:middle], result)
+            await self.invite_chunk(emails[middle:], result)
+            return
+        if not success:
+            message = self.invite_failure_message(message, status_code, error)
+        for email in emails:
+            result.record(email, success, message)
 
-            elif self.operation == "put_user_on_max_plan":
-                success, message = self.api_client.put_user_on_max_plan()
-                self.finished.emit(success, message, None)
 
-            elif self.operation == "put_user_on_plan":
-                plan_id = self.kwargs.get('plan_id', 'orb_community_plan')
-                success, message = self.api_client.put_user_on_plan(plan_id)
-                self.finished.emit(success, message, None)
-            
-        except Exception as e:
-            self.finished.emit(False, f"操作异常: {str(e)}", None)
+def create_worker(api_client: APIClient, operation: str, journal: Optional[BatchJournal] = None,
+                  async_client: Optional[AsyncAPIClient] = None, **kwargs):
+    """创建执行操作的工作对象：开启 performance.async_batch 时批量操作使用 AsyncWorker，其余使用 WorkerThread"""
+    if (async_client is not None and operation in AsyncWorker.OPERATIONS
+            and api_client.config.get('performance.async_batch', False)):
+        return AsyncWorker(async_client, operation, journal=journal, **kwargs)
+    return WorkerThread(api_client, operation, journal=journal, **kwargs)
+
+
+class ScheduledJob:
+    """调度器中的一个操作"""
+
+    def __init__(self, operation: str, priority: int, seq: int, kwargs: Dict[str, Any]):
+        self.operation = operation
+        self.priority = priority
+        self.seq = seq
+        self.kwargs = kwargs
+        # 工作线程（WorkerThread 或 AsyncWorker）；submit_thread 提交的任务自带线程，结果由提交方通过线程自身的信号处理
+        self.thread: Optional[Any] = None
+        self.owns_thread = False
+        # 读操作启动时最后一个已完成修改操作的序号
+        self.baseline_seq: Optional[int] = None
+        # 启动顺序，用于判断并发读操作的先后
+        self.start_seq: Optional[int] = None
+        # 读操作运行期间有修改操作完成，结果可能已过时
+        self.stale = False
+        # 比它晚启动的读操作已先完成，结果比界面上的旧
+        self.superseded = False
+
+    def sort_key(self) -> Tuple[int, int]:
+        """排序键：优先级高（数值小）者先，同优先级先到先执行"""
+        return self.priority, self.seq
+
+
+class OperationScheduler(QObject):
+    """按优先级通道调度后台操作
+
+    - 交互通道：用户发起的操作，优先执行，同一时间只运行一个修改操作
+    - 后台通道：自动刷新等读操作，排在交互操作之后
+    - 诊断通道：连接测试、数据调试，其他通道没有排队任务时才启动
+    读操作不会阻塞修改操作，彼此之间也并发执行；修改操作运行时读操作排队，结束后读取最新数据。
+    新的读操作只合并到能看到所有已提交修改的读操作上，否则排队重新读取；
+    并发的读操作先启动的后完成时标记为 superseded，界面不再应用它的结果。
+    """
+
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_BACKGROUND = 1
+    PRIORITY_DIAGNOSTIC = 2
+
+    READ_OPERATIONS = {"get_team_data"}
+    # 诊断操作不修改数据，也不和读操作合并
+    DIAGNOSTIC_OPERATIONS = {"test_connection", "debug_team_data"}
+
+    job_started = pyqtSignal(object)
+    job_finished = pyqtSignal(object, bool, str, object)
+    job_progress = pyqtSignal(object, int, str)
+
+    def __init__(self, api_client: APIClient, journal: Optional[BatchJournal] = None,
+                 async_client: Optional[AsyncAPIClient] = None, parent=None):
+        super().__init__(parent)
+        self.api_client = api_client
+        self.async_client = async_client
+        self.journal = journal
+        self.queued: List[ScheduledJob] = []
+        self.running: List[ScheduledJob] = []
+        self._seq = itertools.count()
+        # 最后一个修改操作完成时分配的序号
+        self.last_mutation_seq = -1
+        # 已完成的读操作中最晚启动者的启动序号
+        self.last_read_start_seq = -1
+
+    def is_read(self, job: ScheduledJob) -> bool:
+        """是否为读操作"""
+        return job.operation in self.READ_OPERATIONS
+
+    def is_mutation(self, job: ScheduledJob) -> bool:
+        """是否为修改操作（读操作和诊断操作以外的都是）"""
+        return job.operation not in self.READ_OPERATIONS and job.operation not in self.DIAGNOSTIC_OPERATIONS
+
+    def submit(self, operation: str, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Tuple[ScheduledJob, bool]:
+        """提交操作，返回 (任务, 是否新建)
+
+        相同的读操作会合并到已有任务；相同参数的修改操作已在运行或排队时不会重复提交。
+        """
+        if operation in self.READ_OPERATIONS and not kwargs:
+            for job in self.running + self.queued:
+                if job.operation == operation and self._can_merge_read(job):
+                    # 用户操作可以把排队中的后台刷新提到前面
+                    if job in self.queued and priority < job.priority:
+                        job.priority = priority
+                    return job, False
+        elif operation not in self.READ_OPERATIONS:
+            for job in self.running + self.queued:
+                if job.operation == operation and job.kwargs == kwargs:
+                    return job, False
+
+        job = ScheduledJob(operation, priority, next(self._seq), kwargs)
+        self.queued.append(job)
+        self._dispatch()
+        return job, True
+
+    def submit_thread(self, operation: str, thread: QThread, priority: int = PRIORITY_DIAGNOSTIC) -> ScheduledJob:
+        """提交自带线程的任务（如配置对话框的连接测试），按通道排队后启动"""
+        job = ScheduledJob(operation, priority, next(self._seq), {})
+        job.thread = thread
+        self.queued.append(job)
+        self._dispatch()
+        return job
+
+    def withdraw(self, job: ScheduledJob) -> bool:
+        """撤回尚未启动的任务"""
+        if job in self.queued:
+            self.queued.remove(job)
+            return True
+        return False
+
+    def has_pending(self, predicate: Callable[[ScheduledJob], bool]) -> bool:
+        """是否存在满足条件的排队或运行中任务"""
+        return any(predicate(job) for job in self.running + self.queued)
+
+    def _can_merge_read(self, job: ScheduledJob) -> bool:
+        """新的读请求能否共享 job 的结果：job 必须在所有已提交的修改操作完成之后读取"""
+        if any(self.is_mutation(j) for j in self.running + self.queued):
+            return False
+        return job in self.queued or job.baseline_seq == self.last_mutation_seq
+
+    def _can_start(self, job: ScheduledJob) -> bool:
+        """判断任务当前能否启动：修改操作运行时其他任务都要等待，诊断任务排在其他通道之后"""
+        if any(self.is_mutation(j) for j in self.running):
+            return False
+        if job.priority == self.PRIORITY_DIAGNOSTIC:
+            return not any(j.priority < self.PRIORITY_DIAGNOSTIC for j in self.queued)
+        return True
+
+    def _dispatch(self):
+        """按优先级启动所有可以运行的任务"""
+        self.queued.sort(key=ScheduledJob.sort_key)
+        for job in list(self.queued):
+            if self._can_start(job):
+                self.queued.remove(job)
+                self._start(job)
+
+    def _start(self, job: ScheduledJob):
+        """为任务创建工作线程并启动"""
+        if job.thread is None:
+            job.thread = create_worker(self.api_client, job.operation, journal=self.journal,
+                                       async_client=self.async_client, **job.kwargs)
+            job.owns_thread = True
+            job.thread.finished.connect(
+                lambda success, message, data, job=job: self._on_job_finished(job, success, message, data))
+            job.thread.progress.connect(
+                lambda progress, status, job=job: self.job_progress.emit(job, progress, status))
+        else:
+            job.thread.finished.connect(lambda job=job: self._on_job_finished(job, True, "", None))
+        job.baseline_seq = self.last_mutation_seq
+        job.start_seq = next(self._seq)
+        self.running.append(job)
+        self.job_started.emit(job)
+        job.thread.start()
+
+    def _on_job_finished(self, job: ScheduledJob, success: bool, message: str, data: Any):
+        """任务完成：等待线程退出，通知结果后调度下一个任务"""
+        # finished 信号在 run() 返回前发出，等待线程真正结束
+        job.thread.wait()
+        if job in self.running:
+            self.running.remove(job)
+        if self.is_read(job):
+            job.stale = job.baseline_seq != self.last_mutation_seq
+            job.superseded = job.start_seq < self.last_read_start_seq
+            self.last_read_start_seq = max(self.last_read_start_seq, job.start_seq)
+        elif self.is_mutation(job):
+            self.last_mutation_seq = next(self._seq)
+        self.job_finished.emit(job, success, message, data)
+        self._dispatch()
+
+    def cancel(self, predicate: Callable[[ScheduledJob], bool]) -> List[ScheduledJob]:
+        """请求取消满足条件的运行中任务，返回已通知取消的任务"""
+        cancelled = []
+        for job in self.running:
+            if predicate(job) and job.owns_thread and job.operation in WorkerThread.CANCELLABLE_OPERATIONS:
+                job.thread.cancel_token.cancel()
+                cancelled.append(job)
+        return cancelled
+
+    def shutdown(self, grace_seconds: float = 5.0) -> List[Tuple[ScheduledJob, bool]]:
+        """清空队列并取消运行中的任务，在宽限期内等待在途请求完成
+
+        返回 (任务, 是否正常结束) 列表；超过宽限期仍未结束的任务会被强制终止。
+        """
+        self.queued.clear()
+        for job in self.running:
+            if job.owns_thread:
+                job.thread.cancel_token.cancel(CancellationToken.SHUTDOWN)
+            elif hasattr(job.thread, 'cancel'):
+                job.thread.cancel()
+
+        deadline = time.monotonic() + grace_seconds
+        report = []
+        for job in list(self.running):
+            remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+            drained = job.thread.wait(remaining_ms)
+            if not drained:
+                job.thread.terminate()
+                job.thread.wait()
+            report.append((job, drained))
+        self.running.clear()
+        return report
 
 
 class CustomMessageBox(QWidget):
@@ -1202,6 +3864,308 @@ class PendingEmailsDialog(QWidget):
                 CustomMessageBox.show_error(self, "导出失败", f"导出文件时发生错误:\n{str(e)}")
 
 
+class ConnectionProbe:
+    """连接诊断：分阶段计时 DNS 解析、TCP 连接、TLS 握手、首字节与正文下载
+
+    不经过 requests，直接用 socket + http.client 发送与 APIClient 相同的 GET /team，
+    以区分网络慢还是接口慢。cancel() 可从其他线程关闭连接中断等待（DNS 解析无法中断）。
+    """
+
+    PHASES = [('dns', "DNS"), ('connect', "连接"), ('tls', "TLS"), ('ttfb', "首字节"), ('download', "下载")]
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.timings: Dict[str, float] = {}
+        self.cancelled = False
+        self._sock: Optional[socket.socket] = None
+
+    def cancel(self):
+        """取消测试，关闭正在使用的连接"""
+        self.cancelled = True
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _check_cancelled(self):
+        if self.cancelled:
+            raise InterruptedError("连接测试已取消")
+
+    def _mark(self, phase: str, started: float) -> float:
+        now = time.perf_counter()
+        self.timings[phase] = (now - started) * 1000
+        self._check_cancelled()
+        return now
+
+    def run(self) -> Tuple[int, bytes]:
+        """发送请求并返回 (状态码, 响应正文)，各阶段耗时（毫秒）写入 self.timings"""
+        url = urlparse(f"{self.config.get('api.base_url', '')}/team")
+        https = url.scheme == 'https'
+        host = url.hostname or ''
+        port = url.port or (443 if https else 80)
+        timeout = self.config.get('performance.request_timeout', 30)
+        proxy = None
+        if self.config.get('network.proxy.enabled', False) and self.config.get('network.proxy.host'):
+            proxy = (self.config.get('network.proxy.host'), self.config.get('network.proxy.port', 8080))
+
+        started = time.perf_counter()
+        connect_host, connect_port = proxy or (host, port)
+        family, socktype, proto, _, address = socket.getaddrinfo(connect_host, connect_port, type=socket.SOCK_STREAM)[0]
+        phase_start = self._mark('dns', started)
+
+        sock = socket.socket(family, socktype, proto)
+        self._sock = sock
+        sock.settimeout(timeout)
+        sock.connect(address)
+        if proxy:
+            # 通过代理建立隧道，隧道时间计入连接阶段
+            sock.sendall(f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode('ascii'))
+            reply = b""
+            while b"\r\n\r\n" not in reply:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                reply += chunk
+            status_line = reply.split(b"\r\n", 1)[0].decode('latin-1')
+            if status_line.split(" ")[1:2] != ["200"]:
+                raise ConnectionError(f"代理隧道建立失败: {status_line}")
+        phase_start = self._mark('connect', phase_start)
+
+        if https:
+            context = ssl.create_default_context()
+            if not self.config.get('network.ssl_verify', True):
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=host)
+            self._sock = sock
+            phase_start = self._mark('tls', phase_start)
+
+        headers = self.config.get('api.headers', {}).copy()
+        headers.setdefault('content-type', 'application/json')
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        connection.sock = sock
+        try:
+            connection.request('GET', url.path + (f"?{url.query}" if url.query else ""), headers=headers)
+            response = connection.getresponse()
+            phase_start = self._mark('ttfb', phase_start)
+            body = response.read()
+            self._mark('download', phase_start)
+            self.timings['total'] = (time.perf_counter() - started) * 1000
+            self.timings['bytes'] = len(body)
+            return response.status, body
+        finally:
+            connection.close()
+            self._sock = None
+
+    def describe(self) -> str:
+        """各阶段耗时摘要，并判断主要耗时在网络还是服务器"""
+        if not self.timings:
+            return ""
+        parts = [f"{label} {self.timings[phase]:.0f}ms" for phase, label in self.PHASES if phase in self.timings]
+        text = " · ".join(parts)
+        if 'total' in self.timings:
+            text += f"\n总计 {self.timings['total']:.0f}ms，正文 {self.timings['bytes'] / 1024:.1f}KB"
+            network = sum(self.timings.get(phase, 0.0) for phase in ('dns', 'connect', 'tls'))
+            server = self.timings.get('ttfb', 0.0)
+            text += "\n主要耗时在网络（DNS/连接/TLS）" if network > server else "\n主要耗时在服务器处理（首字节）"
+        return text
+
+
+class ConnectionTestThread(QThread):
+    """在后台执行连接诊断，避免阻塞界面"""
+
+    # 不覆盖 QThread.finished：线程真正退出后要靠它释放脱离对话框的线程
+    test_finished = pyqtSignal(bool, str, object, object)  # success, message, data, timings
+
+    # 对话框关闭后仍在运行的线程（DNS 解析无法中断），保留引用直到线程退出
+    _detached = set()
+
+    def __init__(self, config: Config):
+        super().__init__()
+        self.probe = ConnectionProbe(config)
+
+    def cancel(self):
+        self.probe.cancel()
+
+    def detach(self):
+        """与所属对话框脱离：取消测试，线程退出后自行释放，不再阻塞对话框关闭"""
+        try:
+            self.test_finished.disconnect()
+        except TypeError:
+            pass
+        self.cancel()
+        ConnectionTestThread._detached.add(self)
+        self.finished.connect(self._release)
+        if self.isFinished():
+            self._release()
+
+    def _release(self):
+        if self in ConnectionTestThread._detached:
+            ConnectionTestThread._detached.discard(self)
+            self.deleteLater()
+
+    @classmethod
+    def shutdown_detached(cls, grace_ms: int = 2000):
+        """程序退出时等待脱离的测试线程，超时仍未结束的强制终止"""
+        for thread in list(cls._detached):
+            if not thread.wait(grace_ms):
+                thread.terminate()
+                thread.wait()
+        cls._detached.clear()
+
+    def run(self):
+        try:
+            status, body = self.probe.run()
+            if status != 200:
+                text = body.decode('utf-8', errors='replace')
+                self.test_finished.emit(False, f"请求失败，状态码: {status}\n响应内容: {text[:200]}...", None, self.probe.timings)
+                return
+            try:
+                data = json.loads(body)
+            except ValueError as json_error:
+                self.test_finished.emit(False, f"JSON解析失败: {str(json_error)}", None, self.probe.timings)
+                return
+            self.test_finished.emit(True, "", data, self.probe.timings)
+        except Exception as e:
+            if self.probe.cancelled:
+                self.test_finished.emit(False, "连接测试已取消", None, self.probe.timings)
+            else:
+                self.test_finished.emit(False, f"网络错误: {str(e) or type(e).__name__}", None, self.probe.timings)
+
+
+class MetricsDialog(QWidget):
+    """请求指标窗口：各接口的延迟百分位、近期错误率与流量"""
+
+    COLUMNS = ["接口", "请求数", "错误率(5分钟)", "P50", "P95", "P99", "最大", "重试", "发送/接收", "JSON解码", "状态码"]
+
+    def __init__(self, metrics: RequestMetrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle("📈 请求指标")
+        self.setGeometry(250, 200, 1000, 420)
+        self.setMinimumSize(760, 300)
+        self.setWindowFlags(Qt.WindowType.Window | Qt.WindowType.WindowCloseButtonHint)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化窗口界面"""
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet(f"""
+            QLabel {{
+                font-size: 14px;
+                font-weight: bold;
+                color: {StyleManager.PRIMARY_COLOR};
+            }}
+        """)
+        main_layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        main_layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(15)
+
+        reset_btn = StyleManager.create_button("🧹 清零", "warning")
+        reset_btn.clicked.connect(self.reset_metrics)
+
+        export_btn = StyleManager.create_button("💾 导出到文件", "info")
+        export_btn.clicked.connect(self.export_to_file)
+        export_btn.setToolTip("导出各接口的统计与延迟直方图（JSON）")
+
+        close_btn = StyleManager.create_button("❌ 关闭", "danger")
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(reset_btn)
+        button_layout.addWidget(export_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        main_layout.addLayout(button_layout)
+        self.setLayout(main_layout)
+
+        self.setStyleSheet(f"""
+            QWidget {{
+                background: {StyleManager.BACKGROUND_COLOR};
+            }}
+        """)
+
+    @staticmethod
+    def format_bytes(value: int) -> str:
+        if value >= 1024 * 1024:
+            return f"{value / 1024 / 1024:.1f}MB"
+        if value >= 1024:
+            return f"{value / 1024:.1f}KB"
+        return f"{value}B"
+
+    def refresh(self):
+        """刷新表格"""
+        rows = self.metrics.snapshot()
+        self.table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            status_codes = ", ".join(f"{code}×{count}" for code, count in sorted(row['status_codes'].items()))
+            values = [
+                row['endpoint'],
+                str(row['requests']),
+                f"{row['recent_error_rate'] * 100:.1f}% ({row['recent_requests']})",
+                f"{row['p50_ms']:.0f}ms",
+                f"{row['p95_ms']:.0f}ms",
+                f"{row['p99_ms']:.0f}ms",
+                f"{row['max_ms']:.0f}ms",
+                str(row['retries']),
+                f"{self.format_bytes(row['bytes_out'])} / {self.format_bytes(row['bytes_in'])}",
+                f"{row['decode_ms_avg']:.1f}ms" if row['decode_ms_avg'] else "-",
+                status_codes,
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 2 and row['recent_error_rate'] > 0.05:
+                    item.setForeground(QColor(StyleManager.DANGER_COLOR))
+                self.table.setItem(row_index, column, item)
+        total = sum(row['requests'] for row in rows)
+        since = datetime.fromtimestamp(self.metrics.started_at).strftime('%H:%M:%S')
+        self.summary_label.setText(f"自 {since} 起共 {total} 次请求，{len(rows)} 个接口")
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(2000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def reset_metrics(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def export_to_file(self):
+        """导出指标到 JSON 文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出请求指标",
+            f"request_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            "JSON文件 (*.json);;所有文件 (*)"
+        )
+        if file_path:
+            try:
+                self.metrics.export(file_path)
+                CustomMessageBox.show_success(self, "导出成功", f"请求指标已导出到:\n{file_path}")
+            except Exception as e:
+                CustomMessageBox.show_error(self, "导出失败", f"导出文件时发生错误:\n{str(e)}")
+
+
 class ConfigDialog(QWidget):
     """配置对话框"""
 
@@ -1214,6 +4178,10 @@ class ConfigDialog(QWidget):
         self.setWindowTitle("🔧 配置设置")
         self.setGeometry(200, 200, 900, 700)  # 增大窗口尺寸
         self.setMinimumSize(800, 600)  # 设置最小尺寸
+        self.test_thread: Optional[ConnectionTestThread] = None
+        # 连接测试经主窗口调度器的诊断通道运行，单独打开对话框时直接启动线程
+        self.scheduler: Optional[OperationScheduler] = getattr(parent, 'scheduler', None)
+        self.test_job: Optional[ScheduledJob] = None
         self.init_ui()
     
     def init_ui(self):
@@ -1300,6 +4268,12 @@ class ConfigDialog(QWidget):
 
         test_btn = StyleManager.create_button("🧪 测试连接", "primary")
         test_btn.clicked.connect(self.test_connection)
+        self.test_btn = test_btn
+
+        # 取消测试（仅测试进行中显示）
+        self.cancel_test_btn = StyleManager.create_button("⏹️ 取消测试", "warning")
+        self.cancel_test_btn.clicked.connect(self.cancel_connection_test)
+        self.cancel_test_btn.hide()
 
         close_btn = StyleManager.create_button("❌ 关闭", "danger")
         close_btn.clicked.connect(self.close)
@@ -1307,6 +4281,7 @@ class ConfigDialog(QWidget):
         button_layout.addWidget(save_btn)
         button_layout.addWidget(reset_btn)
         button_layout.addWidget(test_btn)
+        button_layout.addWidget(self.cancel_test_btn)
         button_layout.addStretch()
         button_layout.addWidget(close_btn)
 
@@ -1651,6 +4626,44 @@ class ConfigDialog(QWidget):
         self.concurrent_limit_spin.setValue(self.config.get('performance.concurrent_limit', 5))
         performance_layout.addRow("并发请求限制:", self.concurrent_limit_spin)
 
+        # 邀请分块大小
+        self.invite_chunk_size_spin = QSpinBox()
+        self.invite_chunk_size_spin.setRange(1, 1000)
+        self.invite_chunk_size_spin.setSuffix(" 个/块")
+        self.invite_chunk_size_spin.setValue(self.config.get('performance.invite_chunk_size', 50))
+        performance_layout.addRow("邀请分块大小:", self.invite_chunk_size_spin)
+
+        # 邀请块重试次数（只重发确定未被服务器处理的块）
+        self.invite_chunk_retries_spin = QSpinBox()
+        self.invite_chunk_retries_spin.setRange(0, 10)
+        self.invite_chunk_retries_spin.setValue(self.config.get('performance.invite_chunk_retries', 2))
+        self.invite_chunk_retries_spin.setToolTip("429/503 或连接未建立时整块重发；可能已被执行的失败不会重发")
+        performance_layout.addRow("邀请块重试次数:", self.invite_chunk_retries_spin)
+
+        # 异步批量请求
+        self.async_batch_check = QCheckBox("批量删除、邀请和计划切换使用异步请求")
+        self.async_batch_check.setChecked(self.config.get('performance.async_batch', False))
+        performance_layout.addRow("异步模式:", self.async_batch_check)
+
+        self.async_concurrent_limit_spin = QSpinBox()
+        self.async_concurrent_limit_spin.setRange(1, 500)
+        self.async_concurrent_limit_spin.setValue(self.config.get('performance.async_concurrent_limit', 100))
+        performance_layout.addRow("异步并发上限:", self.async_concurrent_limit_spin)
+
+        # 熔断器
+        self.breaker_threshold_spin = QSpinBox()
+        self.breaker_threshold_spin.setRange(1, 50)
+        self.breaker_threshold_spin.setSuffix(" 次连续失败")
+        self.breaker_threshold_spin.setValue(self.config.get('performance.breaker_threshold', 5))
+        self.breaker_threshold_spin.setToolTip("连续 5xx 或网络错误达到该次数时熔断；401/403 立即熔断，更新 Cookie 后恢复")
+        performance_layout.addRow("熔断阈值:", self.breaker_threshold_spin)
+
+        self.breaker_cooldown_spin = QSpinBox()
+        self.breaker_cooldown_spin.setRange(5, 3600)
+        self.breaker_cooldown_spin.setSuffix(" 秒")
+        self.breaker_cooldown_spin.setValue(self.config.get('performance.breaker_cooldown', 60))
+        performance_layout.addRow("熔断冷却时间:", self.breaker_cooldown_spin)
+
         performance_group.setLayout(performance_layout)
         layout.addWidget(performance_group)
 
@@ -1827,6 +4840,12 @@ class ConfigDialog(QWidget):
             self.config.set('performance.request_timeout', self.request_timeout_spin.value())
             self.config.set('performance.retry_count', self.retry_count_spin.value())
             self.config.set('performance.concurrent_limit', self.concurrent_limit_spin.value())
+            self.config.set('performance.invite_chunk_size', self.invite_chunk_size_spin.value())
+            self.config.set('performance.invite_chunk_retries', self.invite_chunk_retries_spin.value())
+            self.config.set('performance.async_batch', self.async_batch_check.isChecked())
+            self.config.set('performance.async_concurrent_limit', self.async_concurrent_limit_spin.value())
+            self.config.set('performance.breaker_threshold', self.breaker_threshold_spin.value())
+            self.config.set('performance.breaker_cooldown', self.breaker_cooldown_spin.value())
 
             # 保存高级配置
             self.config.set('debug.enabled', self.debug_mode_check.isChecked())
@@ -1865,11 +4884,13 @@ class ConfigDialog(QWidget):
         self.close()
 
     def test_connection(self):
-        """测试API连接 - 增强版调试"""
+        """测试API连接：在后台线程中分阶段计时，界面保持响应"""
+        if self.test_thread is not None and not self.test_thread.isFinished():
+            return
         try:
-            # 临时保存当前配置
+            # 临时配置（深拷贝，避免修改当前配置）
             temp_config = Config()
-            temp_config.config = self.config.config.copy()
+            temp_config.config = copy.deepcopy(self.config.config)
 
             # 更新临时配置
             temp_config.set('api.base_url', self.base_url_edit.text())
@@ -1879,17 +4900,11 @@ class ConfigDialog(QWidget):
             temp_config.set('api.headers.accept', self.accept_edit.text())
             temp_config.set('api.headers.accept-language', self.accept_language_edit.text())
 
-            # 显示详细的配置检查信息
+            # 检查基本配置
             cookie_text = self.cookie_edit.toPlainText().strip()
             base_url = self.base_url_edit.text().strip()
+            logger.info("配置连接测试开始: %s，Cookie %d 字符", base_url, len(cookie_text))
 
-            print("\n" + "="*60)
-            print("🔧 配置连接测试开始")
-            print("="*60)
-            print(f"📍 API URL: {base_url}")
-            print(f"🍪 Cookie长度: {len(cookie_text)} 字符")
-
-            # 检查基本配置
             config_issues = []
             if not base_url:
                 config_issues.append("❌ API URL为空")
@@ -1905,62 +4920,102 @@ class ConfigDialog(QWidget):
 
             if config_issues:
                 issue_text = "\n".join(config_issues)
-                print(f"配置问题:\n{issue_text}")
+                logger.warning("配置问题: %s", issue_text)
                 self.update_config_status("❌ 配置有问题", StyleManager.WARNING_COLOR)
                 CustomMessageBox.show_warning(self, "配置检查", f"⚠️ 发现配置问题：\n\n{issue_text}\n\n请修正后重试。")
                 return
 
-            # 创建临时API客户端
-            temp_api = APIClient(temp_config)
-
-            print("🚀 开始API连接测试...")
             self.update_config_status("🔄 正在测试连接...", StyleManager.PRIMARY_COLOR)
+            self.test_btn.setEnabled(False)
+            self.cancel_test_btn.setEnabled(True)
+            self.cancel_test_btn.show()
+
+            self.test_thread = ConnectionTestThread(temp_config)
+            self.test_thread.test_finished.connect(self.on_connection_test_finished)
+            if self.scheduler is not None:
+                self.test_job = self.scheduler.submit_thread("test_connection", self.test_thread)
+                if self.test_job in self.scheduler.queued:
+                    self.update_config_status("⏳ 等待其他操作完成后测试...", StyleManager.PRIMARY_COLOR)
+            else:
+                self.test_thread.start()
 
-            # 测试连接
-            success, result = temp_api.get_team_data()
+        except Exception as e:
+            logger.error("连接测试异常: %s", e)
+            self.update_config_status("❌ 测试异常", StyleManager.DANGER_COLOR)
+            CustomMessageBox.show_error(self, "连接测试", f"❌ 连接测试异常！\n\n错误信息：{str(e)}")
 
-            print("="*60)
-            print("🔧 配置连接测试结果")
-            print("="*60)
+    def cancel_connection_test(self):
+        """取消进行中的连接测试"""
+        if self.test_job is not None and self.scheduler.withdraw(self.test_job):
+            # 还在排队，直接撤回
+            self.test_thread = None
+            self.test_job = None
+            self.test_btn.setEnabled(True)
+            self.cancel_test_btn.hide()
+            self.update_config_status("⏹️ 连接测试已取消", StyleManager.WARNING_COLOR)
+        elif self.test_thread is not None and self.test_thread.isRunning():
+            self.cancel_test_btn.setEnabled(False)
+            self.update_config_status("⏹️ 正在取消测试...", StyleManager.WARNING_COLOR)
+            self.test_thread.cancel()
+
+    def on_connection_test_finished(self, success: bool, message: str, result: Any, timings: Dict[str, float]):
+        """连接测试完成回调（在界面线程中执行）"""
+        thread = self.test_thread
+        if thread is not None:
+            thread.wait()
+        self.test_btn.setEnabled(True)
+        self.cancel_test_btn.hide()
+        timing_text = thread.probe.describe() if thread is not None else ""
+        timing_block = f"\n\n⏱️ 耗时分解：\n{timing_text}" if timing_text else ""
+        logger.info("连接测试结束: success=%s, 耗时 %s", success, timings)
 
-            if success:
-                print("✅ 连接测试成功！")
-                self.update_config_status("✅ 连接测试成功", StyleManager.SUCCESS_COLOR)
-
-                # 显示团队数据摘要
-                from PyQt6.QtWidgets import QMessageBox
-                if isinstance(result, dict):
-                    team_info = []
-                    if 'members' in result:
-                        team_info.append(f"团队成员: {len(result['members'])}人")
-                    if 'pendingInvitations' in result:
-                        team_info.append(f"待处理邀请: {len(result['pendingInvitations'])}个")
-                    if 'teamName' in result:
-                        team_info.append(f"团队名称: {result['teamName']}")
-
-                    info_text = "\n".join(team_info) if team_info else "成功获取团队数据"
-                    CustomMessageBox.show_success(self, "连接测试", f"✅ API连接测试成功！\n\n{info_text}\n\n配置正确，可以正常使用。")
-                else:
-                    CustomMessageBox.show_success(self, "连接测试", "✅ API连接测试成功！\n配置正确，可以正常使用。")
+        if success:
+            self.update_config_status("✅ 连接测试成功", StyleManager.SUCCESS_COLOR)
+
+            # 显示团队数据摘要
+            if isinstance(result, dict):
+                team_info = []
+                if 'members' in result:
+                    team_info.append(f"团队成员: {len(result['members'])}人")
+                if 'pendingInvitations' in result:
+                    team_info.append(f"待处理邀请: {len(result['pendingInvitations'])}个")
+                if 'teamName' in result:
+                    team_info.append(f"团队名称: {result['teamName']}")
+
+                info_text = "\n".join(team_info) if team_info else "成功获取团队数据"
+                CustomMessageBox.show_success(self, "连接测试", f"✅ API连接测试成功！\n\n{info_text}\n\n配置正确，可以正常使用。{timing_block}")
             else:
-                print(f"❌ 连接测试失败: {result}")
-                self.update_config_status("❌ 连接测试失败", StyleManager.DANGER_COLOR)
+                CustomMessageBox.show_success(self, "连接测试", f"✅ API连接测试成功！\n配置正确，可以正常使用。{timing_block}")
+        elif thread is not None and thread.probe.cancelled:
+            self.update_config_status("⏹️ 测试已取消", StyleManager.WARNING_COLOR)
+        else:
+            self.update_config_status("❌ 连接测试失败", StyleManager.DANGER_COLOR)
 
-                # 分析错误原因
-                error_analysis = self.analyze_connection_error(result)
-                CustomMessageBox.show_error(self, "连接测试", f"❌ API连接测试失败！\n\n错误信息：{result}\n\n{error_analysis}")
+            # 分析错误原因
+            error_analysis = self.analyze_connection_error(message)
+            CustomMessageBox.show_error(self, "连接测试", f"❌ API连接测试失败！\n\n错误信息：{message}\n\n{error_analysis}{timing_block}")
 
-        except Exception as e:
-            print(f"❌ 连接测试异常: {str(e)}")
-            self.update_config_status("❌ 测试异常", StyleManager.DANGER_COLOR)
-            CustomMessageBox.show_error(self, "连接测试", f"❌ 连接测试异常！\n\n错误信息：{str(e)}")
+    def closeEvent(self, event):
+        """关闭窗口时取消进行中的连接测试；线程脱离对话框，退出后自行释放"""
+        if self.test_job is not None and self.scheduler.withdraw(self.test_job):
+            self.test_thread = None
+        elif self.test_thread is not None and self.test_thread.isRunning():
+            self.test_thread.detach()
+            self.test_thread = None
+        super().closeEvent(event)
 
     def analyze_connection_error(self, error_message: str) -> str:
         """分析连接错误并提供解决建议"""
         error_lower = error_message.lower()
 
         if "401" in error_message or "unauthorized" in error_lower:
+            session_note = ""
+            info = SessionInfo.from_cookie(self.cookie_edit.toPlainText().strip())
+            if info is not None and info.created_at:
+                created = datetime.fromtimestamp(info.created_at).strftime('%Y-%m-%d %H:%M')
+                session_note = f"📅 会话创建于 {created}，已使用 {format_duration(info.age())}\n"
             return ("🔍 错误分析：认证失败\n"
+                   f"{session_note}"
                    "💡 解决建议：\n"
                    "1. 检查Cookie是否过期\n"
                    "2. 重新从浏览器复制最新的Cookie\n"
@@ -2241,11 +5296,41 @@ class TeamManagerMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = Config()
-        self.api_client = APIClient(self.config)
+        configure_logging(self.config)
+        # debug.replay_file 指向请求记录时，离线重放记录的响应而不访问服务器
+        replay_file = self.config.get('debug.replay_file', '')
+        transport = ReplayTransport(replay_file) if replay_file and os.path.exists(replay_file) else None
+        self.api_client = APIClient(self.config, transport=transport)
+        # 异步客户端，开启异步模式时批量删除、邀请和计划切换经由它在事件循环线程中执行
+        self.async_client = AsyncAPIClient(self.api_client)
         self.team_data = None
-        self.worker_thread = None
+        self.team_snapshot: Optional[TeamSnapshot] = None
+        # 界面当前实际显示的快照，差异以它为基准计算
+        self.displayed_snapshot: Optional[TeamSnapshot] = None
+        # 按ID / 邮箱 / 状态建立的索引，删除成功后增量更新
+        self.team_index = TeamIndex()
+        # 当前显示的统计数值
+        self.team_stats = TeamStats()
+        # 表格每一行对应的记录ID，用于按差异增量更新
+        self.member_row_ids: List[str] = []
+        self.invitation_row_ids: List[str] = []
+        # 原始数据区当前显示的是哪一份数据，未变化时不重复格式化
+        self.raw_data_source: Any = None
+        # 批量任务日志，用于中断后恢复
+        self.journal = BatchJournal()
+        # 退出清理只执行一次（关闭窗口、托盘退出和 aboutToQuit 都会触发）
+        self.is_shut_down = False
+        self.pending_journal_jobs: List[Dict[str, Any]] = []
+        # 后台操作调度器（按优先级通道调度工作线程）
+        self.scheduler = OperationScheduler(self.api_client, journal=self.journal,
+                                            async_client=self.async_client, parent=self)
+        self.scheduler.job_started.connect(self.on_worker_started)
+        self.scheduler.job_finished.connect(self.on_worker_finished)
+        self.scheduler.job_progress.connect(self.on_worker_progress)
         # 记录连接状态，便于全局控制
         self.is_connected = False
+        # 熔断期间自动刷新暂停
+        self.refresh_paused = False
 
         # 定义一个主要的连接状态显示组件，其他地方引用这个
         self.connection_status = None
@@ -2293,7 +5378,7 @@ class TeamManagerMainWindow(QMainWindow):
                 border-radius: 12px;
             }
         """)
-        self.loading_container.setFixedSize(280, 160)
+        self.loading_container.setFixedSize(280, 200)
         
         # Loading layout
         loading_layout = QVBoxLayout(self.loading_container)
@@ -2326,6 +5411,12 @@ class TeamManagerMainWindow(QMainWindow):
         loading_layout.addWidget(self.loading_label)
         loading_layout.addWidget(self.loading_progress)
         loading_layout.addWidget(self.loading_status)
+
+        # 取消按钮（仅批量操作可用）
+        self.loading_cancel_btn = StyleManager.create_button("取消操作", "danger", "⏹️")
+        self.loading_cancel_btn.clicked.connect(self.cancel_running_operations)
+        self.loading_cancel_btn.hide()
+        loading_layout.addWidget(self.loading_cancel_btn)
         loading_layout.addStretch()
         
         # Apply shadow effect
@@ -2340,6 +5431,9 @@ class TeamManagerMainWindow(QMainWindow):
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.auto_refresh_data)
         self.update_refresh_timer()
+
+        # 检查上次未完成的批量任务
+        QTimer.singleShot(300, self.check_unfinished_jobs)
         
     def setup_tray_icon(self):
         """设置系统托盘图标"""
@@ -2405,8 +5499,11 @@ class TeamManagerMainWindow(QMainWindow):
         self.log_info("系统托盘", "从系统托盘恢复窗口")
         
     def quit_from_tray(self):
-        """从托盘退出程序"""
+        """从托盘退出程序（窗口隐藏在托盘时不会经过 closeEvent，这里先完成退出清理）"""
         self.log_info("系统托盘", "通过系统托盘退出应用")
+        if self.config.get('features.auto_save', True):
+            self.config.save_config()
+        self._shutdown()
         QApplication.quit()
         
     def closeEvent(self, event):
@@ -2414,20 +5511,48 @@ class TeamManagerMainWindow(QMainWindow):
         if self.config.get('features.auto_save', True):
             self.config.save_config()
 
-        if self.worker_thread and self.worker_thread.isRunning():
-            self.log_warning("退出确认", "有操作正在进行中，强制退出可能导致数据丢失")
-            self.worker_thread.terminate()
-            self.worker_thread.wait()
-
-        # 检查是否应该关闭到系统托盘
+        # 检查是否应该关闭到系统托盘（后台操作继续运行）
         if self.config.get('ui.close_to_tray', False) and self.tray_icon.isVisible():
             self.log_info("应用最小化", "已最小化到系统托盘")
             self.hide()
             event.ignore()
         else:
-            self.log_info("应用退出", "团队管理工具正在关闭...")
+            self._shutdown()
             event.accept()
 
+    def _shutdown(self):
+        """退出清理：取消并等待后台操作、报告批量处理情况、关闭客户端并刷新任务日志"""
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
+        self.shutdown_operations()
+        ConnectionTestThread.shutdown_detached()
+        self.async_client.close()
+        self.journal.close()
+        self.log_info("应用退出", "团队管理工具正在关闭...")
+
+    # 关闭程序时等待在途请求完成的宽限期（秒）
+    SHUTDOWN_GRACE_SECONDS = 5.0
+
+    def shutdown_operations(self):
+        """取消后台操作并在宽限期内等待在途请求完成，报告批量操作的处理情况"""
+        if not self.scheduler.running and not self.scheduler.queued:
+            return
+
+        self.log_warning("退出确认", f"有操作正在进行中，正在取消并等待在途请求完成（最多 {self.SHUTDOWN_GRACE_SECONDS:.0f} 秒）")
+        for job, drained in self.scheduler.shutdown(self.SHUTDOWN_GRACE_SECONDS):
+            op_name = self.OPERATION_NAMES.get(job.operation, job.operation)
+            if not drained:
+                self.log_error("强制终止", f"{op_name}未在宽限期内结束，已强制终止，最后的请求结果未知")
+            result = job.thread.batch_result if job.owns_thread else None
+            if result is not None:
+                processed = result.processed_ids()
+                skipped = result.skipped_ids()
+                self.log_warning("批量操作中断",
+                                 f"{op_name}: 已处理 {len(processed)} 个，未处理 {len(skipped)} 个\n"
+                                 f"已处理的ID: {', '.join(processed) or '无'}\n"
+                                 f"未处理的ID: {', '.join(skipped) or '无'}")
+
     def resizeEvent(self, event):
         """Handle window resize event"""
         super().resizeEvent(event)
@@ -2452,6 +5577,7 @@ class TeamManagerMainWindow(QMainWindow):
     def hide_loading(self):
         """隐藏加载覆盖层"""
         self.loading_overlay.hide()
+        self.loading_cancel_btn.hide()
 
     def init_ui(self):
         """Initialize the new user interface"""
@@ -2481,8 +5607,9 @@ class TeamManagerMainWindow(QMainWindow):
         batch_tab = self.create_batch_tab()
         self.tab_widget.addTab(batch_tab, "批量操作")
 
-        data_tab = self.create_data_tab()
-        self.tab_widget.addTab(data_tab, "数据视图")
+        self.data_tab = self.create_data_tab()
+        self.tab_widget.addTab(self.data_tab, "数据视图")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
         main_layout.addWidget(self.tab_widget, 1)
 
@@ -2715,8 +5842,8 @@ class TeamManagerMainWindow(QMainWindow):
         # 更新显示
         self._update_log_display()
 
-        # 同时输出到控制台
-        print(f"[{timestamp}] {level}: {title} - {message}")
+        # 同时输出到控制台（开启调试时）
+        logger.info("%s: %s - %s", level, title, message)
 
     def _update_log_display(self):
         """更新日志显示 - 现代化版2.0"""
@@ -3164,6 +6291,11 @@ class TeamManagerMainWindow(QMainWindow):
         refresh_action.triggered.connect(self.refresh_team_data)
         tools_menu.addAction(refresh_action)
 
+        # 请求指标
+        metrics_action = QAction("请求指标", self)
+        metrics_action.triggered.connect(self.show_metrics_dialog)
+        tools_menu.addAction(metrics_action)
+
         # 帮助菜单
         help_menu = menubar.addMenu("帮助")
 
@@ -3172,6 +6304,13 @@ class TeamManagerMainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+    def show_metrics_dialog(self):
+        """打开请求指标窗口（复用已打开的窗口）"""
+        if getattr(self, 'metrics_dialog', None) is None:
+            self.metrics_dialog = MetricsDialog(self.api_client.metrics, self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
+
     def init_status_bar(self):
         """初始化状态栏"""
         self.status_bar = QStatusBar()
@@ -3186,11 +6325,84 @@ class TeamManagerMainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         self.status_bar.addPermanentWidget(self.progress_bar)
 
+        # 添加限流状态
+        self.rate_label = QLabel()
+        self.status_bar.addPermanentWidget(self.rate_label)
+        self.rate_timer = QTimer(self)
+        self.rate_timer.timeout.connect(self.update_rate_label)
+        self.rate_timer.start(1000)
+        self.update_rate_label()
+
+        # 添加会话剩余时间
+        self.session_label = QLabel()
+        self.status_bar.addPermanentWidget(self.session_label)
+        self.rate_timer.timeout.connect(self.update_session_label)
+        self.update_session_label()
+
+        # 添加快照状态
+        self.snapshot_label = QLabel("📦 快照: -")
+        self.status_bar.addPermanentWidget(self.snapshot_label)
+
         # 添加连接状态 - 根据当前连接状态设置初始文本
         self.connection_label = QLabel("🔴 未连接")
         self.connection_label.setStyleSheet(f"color: {StyleManager.DANGER_COLOR}; font-weight: 700; padding-right: 10px;")
         self.status_bar.addPermanentWidget(self.connection_label)
 
+    def update_snapshot_label(self):
+        """刷新状态栏中的快照哈希与跳过次数"""
+        content_hash = self.api_client.team_content_hash
+        stats = self.api_client.refresh_stats
+        skipped = stats['not_modified'] + stats['unchanged']
+        self.snapshot_label.setText(f"📦 快照: {content_hash[:12] if content_hash else '-'} · 跳过 {skipped} 次")
+        self.snapshot_label.setToolTip(
+            f"快照哈希: {content_hash or '-'}\n"
+            f"304 未修改: {stats['not_modified']} 次\n"
+            f"内容未变化: {stats['unchanged']} 次"
+        )
+
+    def update_session_label(self):
+        """刷新状态栏中的 Cookie 会话剩余时间估算"""
+        info, remaining, reliable = self.api_client.session_status()
+        if remaining is None:
+            self.session_label.setText("🍪 会话: 未知")
+            self.session_label.setToolTip("无法从 _session 解码会话创建时间")
+            return
+        prefix = "" if reliable else "约 "
+        if remaining > 0:
+            self.session_label.setText(f"🍪 会话剩余 {prefix}{format_duration(remaining)}")
+        else:
+            self.session_label.setText(f"🍪 会话已过期 {prefix}{format_duration(remaining)}")
+        created = datetime.fromtimestamp(info.created_at).strftime('%Y-%m-%d %H:%M') if info.created_at else "未知"
+        lifetime, _ = self.api_client.session_lifetime()
+        samples = self.config.get('api.observed_session_lifetime_samples', 1)
+        source = f"根据 {samples} 次 401 观测" if self.config.get('api.observed_session_lifetime') else "默认值"
+        self.session_label.setToolTip(
+            f"账号: {info.email or '-'}\n会话创建于: {created}\n"
+            f"有效期估算: {format_duration(lifetime)}（{source}）"
+        )
+
+    def update_rate_label(self):
+        """刷新状态栏中的限流状态"""
+        state = self.api_client.rate_limiter.snapshot()
+        breaker = self.api_client.breaker
+        if breaker.state == CircuitBreaker.CLOSED:
+            breaker_text = ""
+        elif breaker.reason == CircuitBreaker.AUTH:
+            breaker_text = " · ⛔ 熔断 待更新 Cookie"
+        else:
+            breaker_text = f" · ⛔ 熔断 {breaker.retry_in():.0f}s"
+        self.rate_label.setText(
+            f"⚡ 并发 {state['limit']:.1f}/{state['max_limit']} · "
+            f"{state['rate']:.1f} 请求/秒 · 限流 {state['throttle_events']} 次{breaker_text}"
+        )
+        conn = self.api_client.transport.connection_stats()
+        self.rate_label.setToolTip(
+            "自适应限流器：当前并发上限 / 配置上限，以及最近10秒的请求速率\n"
+            f"连接池大小: {conn['pool_size']}，新建连接: {conn['connections']}，"
+            f"请求: {conn['requests']}，复用: {conn['reused']}，重建: {conn['rebuilds']} 次\n"
+            f"熔断器: {breaker.state}，已打开 {breaker.open_count} 次，快速失败 {breaker.rejected} 次"
+        )
+
     def create_invite_tab(self) -> QWidget:
         """创建邀请成员标签页（新UI设计）"""
         # 主容器
@@ -3765,7 +6977,16 @@ class TeamManagerMainWindow(QMainWindow):
         button_grid.addWidget(self.batch_delete_invitations_btn, 0, 1)
         button_grid.addWidget(self.batch_delete_all_btn, 1, 0)
         button_grid.addWidget(self.switch_to_community_plan_btn, 1, 1)
+        self.resume_jobs_btn = self.create_batch_button(
+            "♻️ 恢复未完成任务",
+            "继续上次中断的批量删除或邀请，跳过已完成的项目",
+            [StyleManager.SECONDARY_COLOR, StyleManager.SECONDARY_LIGHT],
+            self.resume_unfinished_jobs
+        )
+        self.resume_jobs_btn.setEnabled(False)
+
         button_grid.addWidget(self.switch_to_max_plan_btn, 2, 0)
+        button_grid.addWidget(self.resume_jobs_btn, 2, 1)
 
         batch_layout.addLayout(button_grid)
 
@@ -4123,11 +7344,11 @@ class TeamManagerMainWindow(QMainWindow):
 
         self.log_info("开始邀请", f"准备邀请 {len(valid_emails)} 个有效邮箱")
         # 启动工作线程
-        self.start_worker_thread("invite_members", emails=valid_emails)
+        self.submit_operation("invite_members", emails=valid_emails)
 
-    def load_team_data(self):
+    def load_team_data(self, priority: int = OperationScheduler.PRIORITY_INTERACTIVE):
         """加载团队数据"""
-        self.start_worker_thread("get_team_data")
+        self.submit_operation("get_team_data", priority=priority)
 
     def refresh_team_data(self):
         """刷新团队数据"""
@@ -4150,7 +7371,7 @@ class TeamManagerMainWindow(QMainWindow):
 
         self.log_warning("批量删除确认", f"准备删除 {len(unjoined_ids)} 个未加入成员，此操作不可撤销！")
         self.log_batch_operation(f"开始批量删除 {len(unjoined_ids)} 个未加入成员")
-        self.start_worker_thread("batch_delete", member_ids=unjoined_ids)
+        self.submit_operation("batch_delete", member_ids=unjoined_ids)
 
     def batch_delete_invitations(self):
         """批量删除邀请记录"""
@@ -4165,7 +7386,7 @@ class TeamManagerMainWindow(QMainWindow):
 
         self.log_warning("批量删除确认", f"准备删除 {len(invitation_ids)} 条邀请记录，此操作不可撤销！")
         self.log_batch_operation(f"开始批量删除 {len(invitation_ids)} 条邀请记录")
-        self.start_worker_thread("batch_delete", member_ids=invitation_ids)
+        self.submit_operation("batch_delete", member_ids=invitation_ids)
 
     def batch_delete_all_unconfirmed(self):
         """批量删除所有未确认的成员和邀请"""
@@ -4187,19 +7408,66 @@ class TeamManagerMainWindow(QMainWindow):
                         f"邀请记录: {len(invitation_ids)} 条, "
                         f"总计: {len(all_ids)} 项，此操作不可撤销！")
         self.log_batch_operation(f"开始批量删除所有未确认项目，共 {len(all_ids)} 项")
-        self.start_worker_thread("batch_delete", member_ids=all_ids)
+        self.submit_operation("batch_delete", member_ids=all_ids)
+
+    def check_unfinished_jobs(self):
+        """读取任务日志，提示可恢复的未完成批量任务"""
+        try:
+            jobs = self.journal.pending_jobs()
+        except Exception as e:
+            self.log_error("任务日志", f"读取任务日志失败: {str(e)}")
+            jobs = []
+
+        # 只恢复当前账号的任务，避免用另一个团队的ID继续删除或邀请
+        account = self.api_client.account_fingerprint()
+        self.pending_journal_jobs = [job for job in jobs if job.get('account') == account]
+        foreign = len(jobs) - len(self.pending_journal_jobs)
+        if foreign:
+            self.log_warning("任务日志", f"{foreign} 个未完成任务属于其他账号或无法确认账号，不会恢复")
+
+        remaining = sum(len(job['remaining']) for job in self.pending_journal_jobs)
+        self.resume_jobs_btn.setEnabled(bool(self.pending_journal_jobs) and not self.has_pending_mutations())
+        self.resume_jobs_btn.setToolTip(f"{len(self.pending_journal_jobs)} 个任务，共 {remaining} 项未完成"
+                                        if self.pending_journal_jobs else "没有未完成的任务")
+        for job in self.pending_journal_jobs:
+            op_name = self.OPERATION_NAMES.get(job['op'], job['op'])
+            started = datetime.fromtimestamp(job['ts']).strftime('%Y-%m-%d %H:%M:%S') if job.get('ts') else "未知时间"
+            self.log_warning("发现未完成任务",
+                             f"{op_name}（{started} 开始）还有 {len(job['remaining'])}/{job['total']} 项未完成，"
+                             f"可在「批量操作」中点击「恢复未完成任务」继续")
+
+    def resume_unfinished_jobs(self):
+        """恢复未完成的批量任务，只处理尚未成功的项目"""
+        if not self.pending_journal_jobs:
+            self.log_info("恢复任务", "没有未完成的任务")
+            return
+
+        account = self.api_client.account_fingerprint()
+        for job in self.pending_journal_jobs:
+            op_name = self.OPERATION_NAMES.get(job['op'], job['op'])
+            if job.get('account') != account:
+                # 检查之后切换了账号
+                self.log_warning("恢复任务", f"{op_name}属于其他账号，已跳过")
+                continue
+            self.log_batch_operation(f"恢复{op_name}，剩余 {len(job['remaining'])} 项")
+            if job['op'] == "batch_delete":
+                self.submit_operation("batch_delete", member_ids=job['remaining'], journal_id=job['job'])
+            elif job['op'] == "invite_members":
+                self.submit_operation("invite_members", emails=job['remaining'], journal_id=job['job'])
+        self.pending_journal_jobs = []
+        self.resume_jobs_btn.setEnabled(False)
 
     def switch_to_community_plan(self):
         """切换到社区计划"""
         self.log_info("计划切换", "准备将当前账号切换到社区计划...")
         self.log_batch_operation("开始切换账号到社区计划")
-        self.start_worker_thread("put_user_on_community_plan")
+        self.submit_operation("put_user_on_community_plan")
 
     def switch_to_max_plan(self):
         """切换到 Max 计划"""
         self.log_info("计划切换", "准备将当前账号切换到 Max 计划...")
         self.log_batch_operation("开始切换账号到 Max 计划")
-        self.start_worker_thread("put_user_on_max_plan")
+        self.submit_operation("put_user_on_max_plan")
 
     def export_team_data(self):
         """导出团队数据"""
@@ -4222,96 +7490,41 @@ class TeamManagerMainWindow(QMainWindow):
                 self.log_error("导出失败", f"导出失败: {str(e)}")
 
     def debug_current_data(self):
-        """调试当前数据结构"""
-        print("\n" + "="*60)
-        print("🔍 调试当前数据结构")
-        print("="*60)
-
-        if not self.team_data:
+        """调试当前数据结构（诊断通道，报告在工作线程中生成）"""
+        if not self.team_snapshot:
             print("❌ 没有数据可调试")
             self.log_warning("调试", "没有数据可调试，请先加载团队数据")
             return
+        self.submit_operation("debug_team_data", OperationScheduler.PRIORITY_DIAGNOSTIC, snapshot=self.team_snapshot)
 
-        print("📊 原始数据结构:")
-        import json
-        print(json.dumps(self.team_data, indent=2, ensure_ascii=False))
-
-        print("\n🔍 数据提取测试:")
-
-        # 测试用户提取
-        users = self.extract_users_from_data(self.team_data)
-        print(f"   提取到的用户数: {len(users)}")
-        for i, user in enumerate(users):
-            joined = "已加入" if user.get('joinedAt') else "未加入"
-            print(f"     {i+1}. {user.get('email', 'N/A')} - {joined}")
-
-        # 测试邀请提取
-        invitations = self.extract_invitations_from_data(self.team_data)
-        print(f"   提取到的邀请数: {len(invitations)}")
-        for i, invitation in enumerate(invitations):
-            print(f"     {i+1}. {invitation.get('email', 'N/A')} - {invitation.get('invitedAt', 'N/A')}")
-
-        # 测试统计计算
-        print("\n📊 统计计算:")
-        total_members = len(users)
-        pending_members = len([u for u in users if not u.get('joinedAt')])
-        active_members = total_members - pending_members
-
-        print(f"   总成员数: {total_members}")
-        print(f"   活跃成员数: {active_members}")
-        print(f"   待加入成员数: {pending_members}")
-        print(f"   邀请记录数: {len(invitations)}")
-
-        # 按照正确的业务逻辑
-        print(f"\n🎯 正确的统计逻辑:")
-        print(f"   待加入人数 = 邀请记录中的人数 = {len(invitations)}")
-        print(f"   邀请记录中的总邀请 = 待加入人数 = {len(invitations)}")
-        print(f"   说明：未加入的人就是被邀请但还没加入的人")
-
-        # 检查今日邀请
-        from datetime import datetime, date
-        today = date.today()
-        today_invited = 0
-        for invitation in invitations:
-            invited_at = invitation.get('invitedAt')
-            if invited_at:
-                try:
-                    if isinstance(invited_at, (int, float)):
-                        invite_date = datetime.fromtimestamp(invited_at / 1000).date()
-                        print(f"     邀请时间: {invite_date} (今天: {today})")
-                        if invite_date == today:
-                            today_invited += 1
-                except Exception as e:
-                    print(f"     时间解析错误: {e}")
-
-        print(f"   今日邀请数: {today_invited}")
+    def show_debug_report(self, snapshot: TeamSnapshot, report: str):
+        """输出调试报告并按快照重新显示统计"""
+        print("\n" + "="*60)
+        print("🔍 调试当前数据结构")
+        print("="*60)
+        print(report)
 
         # 手动调用统计更新
         print("\n🔄 手动更新统计...")
-        self.update_statistics(users, invitations)
+        stats = snapshot.current_stats()
+        self.update_statistics(stats)
 
-        self.log_info("调试完成", f"用户{len(users)}个，邀请{len(invitations)}个，待加入{pending_members}个")
+        pending_members = stats.total_members - stats.active_members
+        self.log_info("调试完成", f"用户{stats.total_members}个，邀请{stats.pending_members}个，待加入{pending_members}个")
         print("\n" + "="*60)
 
     def query_pending_emails(self):
         """查询未接受邀请的邮箱"""
-        if not self.team_data:
+        if not self.team_snapshot:
             self.log_warning("查询失败", "没有数据可查询，请先加载团队数据")
             return
 
-        # 获取所有邀请记录
-        invitations = self.extract_invitations_from_data(self.team_data)
-
-        if not invitations:
+        if not self.team_index.count(TeamIndex.INVITED):
             self.log_info("查询结果", "没有找到未接受的邀请记录")
             return
 
-        # 提取邮箱地址
-        pending_emails = []
-        for invitation in invitations:
-            email = invitation.get('email', '').strip()
-            if email and email not in pending_emails:
-                pending_emails.append(email)
+        # 提取邮箱地址（按规范化邮箱去重）
+        pending_emails = self.team_index.pending_emails()
 
         if not pending_emails:
             self.log_info("查询结果", "没有找到有效的邮箱地址")
@@ -4332,81 +7545,197 @@ class TeamManagerMainWindow(QMainWindow):
             self.log_info("邮箱列表", f"未接受邀请的邮箱（每行一个，方便复制）:\n{email_list}")
 
     def format_data_display(self):
-        """格式化显示数据"""
+        """格式化显示数据（已显示的就是当前数据时不重复格式化）"""
+        if self.team_data is not None and self.team_data is self.raw_data_source:
+            return
+        self.raw_data_source = self.team_data
         if self.team_data:
             formatted_data = json.dumps(self.team_data, indent=2, ensure_ascii=False)
             self.raw_data_display.setPlainText(formatted_data)
         else:
             self.raw_data_display.setPlainText("没有数据")
 
+    def on_tab_changed(self, index: int):
+        """切换到数据视图时补上延后的原始数据格式化"""
+        if self.tab_widget.widget(index) is self.data_tab:
+            self.format_data_display()
+
     # ==================== 工具方法 ====================
 
-    def start_worker_thread(self, operation: str, **kwargs):
-        """启动工作线程 - 增强版2.0"""
-        if self.worker_thread and self.worker_thread.isRunning():
-            self.log_warning("操作冲突", "有操作正在进行中，请稍候...")
+    # 操作名称映射
+    OPERATION_NAMES = {
+        "get_team_data": "获取团队数据",
+        "invite_members": "邀请成员",
+        "batch_delete": "批量删除",
+        "put_user_on_community_plan": "切换到社区计划",
+        "put_user_on_max_plan": "切换到 Max 计划",
+        "test_connection": "连接测试",
+        "debug_team_data": "调试数据"
+    }
+
+    # 操作状态文本映射
+    OPERATION_STATUS = {
+        "get_team_data": "正在连接服务器获取团队数据...",
+        "invite_members": "正在发送邀请请求...",
+        "batch_delete": "正在执行批量删除操作，请稍候...",
+        "put_user_on_community_plan": "正在切换账号计划类型...",
+        "put_user_on_max_plan": "正在切换账号计划类型...",
+        "test_connection": "正在测试连接...",
+        "debug_team_data": "正在生成调试报告..."
+    }
+
+    # 达到该数量的批量操作在提交前检查 Cookie 剩余有效期
+    SESSION_CHECK_BATCH_SIZE = 20
+    SESSION_WARNING_SECONDS = 3600
+
+    def warn_if_session_expiring(self, operation: str, count: int):
+        """大批量操作前提示 Cookie 即将或已经过期"""
+        if count < self.SESSION_CHECK_BATCH_SIZE:
             return
-
-        # 操作名称映射
-        operation_names = {
-            "get_team_data": "获取团队数据",
-            "invite_members": "邀请成员",
-            "batch_delete": "批量删除",
-            "put_user_on_community_plan": "切换到社区计划"
-        }
-        
-        # 操作状态文本映射
-        operation_status = {
-            "get_team_data": "正在连接服务器获取团队数据...",
-            "invite_members": "正在发送邀请请求...",
-            "batch_delete": "正在执行批量删除操作，请稍候...",
-            "put_user_on_community_plan": "正在切换账号计划类型..."
-        }
-        
-        # 显示加载覆盖层
-        op_name = operation_names.get(operation, operation)
-        op_status = operation_status.get(operation, "正在处理请求...")
-        self.show_loading(f"正在{op_name}", op_status)
-
-        # 创建并配置工作线程
-        self.worker_thread = WorkerThread(self.api_client, operation, **kwargs)
-        self.worker_thread.finished.connect(self.on_worker_finished)
-        self.worker_thread.progress.connect(self.on_worker_progress)
+        info, remaining, reliable = self.api_client.session_status()
+        if remaining is None or remaining > self.SESSION_WARNING_SECONDS:
+            return
+        op_name = self.OPERATION_NAMES.get(operation, operation)
+        basis = "按以往观测的有效期" if reliable else "按默认有效期"
+        if remaining <= 0:
+            message = f"{basis}估算，Cookie 会话已过期约 {format_duration(remaining)}，{op_name}（{count} 项）可能全部失败，建议先更新 Cookie"
+        else:
+            message = f"{basis}估算，Cookie 会话约 {format_duration(remaining)} 后过期，{op_name}（{count} 项）可能中途失败"
+        self.log_warning("Cookie 即将过期", message)
+        self.show_notification("⚠️ Cookie 即将过期", message, "warning")
+
+    def submit_operation(self, operation: str, priority: int = OperationScheduler.PRIORITY_INTERACTIVE, **kwargs):
+        """提交后台操作到调度器"""
+        op_name = self.OPERATION_NAMES.get(operation, operation)
+        if operation in ("batch_delete", "invite_members"):
+            self.warn_if_session_expiring(operation, len(kwargs.get('member_ids') or kwargs.get('emails') or []))
+        job, created = self.scheduler.submit(operation, priority, **kwargs)
+        if not created and not self.scheduler.is_read(job):
+            self.log_warning("操作冲突", f"相同的{op_name}已在进行或排队中，请勿重复提交")
+        elif not created:
+            self.log_info("操作合并", f"{op_name}已在进行或排队中，将共享同一结果")
+        elif job in self.scheduler.queued:
+            self.log_info("操作排队", f"{op_name}已加入队列，等待当前操作完成")
+        return job
+
+    def cancel_running_operations(self):
+        """取消运行中的交互批量操作，已发出的请求会继续完成"""
+        cancelled = self.scheduler.cancel(lambda job: job.priority == OperationScheduler.PRIORITY_INTERACTIVE)
+        if cancelled:
+            self.loading_cancel_btn.setEnabled(False)
+            self.loading_status.setText("正在取消，等待在途请求完成...")
+            self.log_warning("取消操作", "已请求取消，正在等待在途请求完成")
+
+    def has_interactive_jobs(self) -> bool:
+        """是否有运行中的交互通道任务"""
+        return any(job.priority == OperationScheduler.PRIORITY_INTERACTIVE for job in self.scheduler.running)
+
+    def has_pending_mutations(self) -> bool:
+        """是否有运行或排队中的修改操作"""
+        return self.scheduler.has_pending(self.scheduler.is_mutation)
+
+    def on_worker_started(self, job: ScheduledJob):
+        """调度器启动任务回调"""
+        op_name = self.OPERATION_NAMES.get(job.operation, job.operation)
+        op_status = self.OPERATION_STATUS.get(job.operation, "正在处理请求...")
+
+        # 只有交互操作显示加载覆盖层，后台刷新只在状态栏提示
+        if job.priority == OperationScheduler.PRIORITY_INTERACTIVE:
+            self.show_loading(f"正在{op_name}", op_status)
+            if job.operation in WorkerThread.CANCELLABLE_OPERATIONS:
+                self.loading_cancel_btn.setEnabled(True)
+                self.loading_cancel_btn.show()
 
         # 更新状态栏信息
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.status_label.setText(f"正在执行: {op_name}")
 
-        # 禁用相关按钮
-        self.set_buttons_enabled(False)
+        # 修改操作进行中时禁用相关按钮
+        if self.scheduler.is_mutation(job):
+            self.set_buttons_enabled(False)
 
         # 记录操作开始
         self.log_info("操作开始", f"正在执行: {op_name}")
 
-        # 启动线程
-        self.worker_thread.start()
-
-    def on_worker_finished(self, success: bool, message: str, data: Any):
+    def on_worker_finished(self, job: ScheduledJob, success: bool, message: str, data: Any):
         """工作线程完成回调 - 增强版2.0"""
-        # 隐藏加载覆盖层
-        self.hide_loading()
-        
+        # 没有交互操作时隐藏加载覆盖层
+        if not self.has_interactive_jobs():
+            self.hide_loading()
+
         # 重置状态栏
-        self.progress_bar.setVisible(False)
-        self.status_label.setText("就绪")
+        if not self.scheduler.running:
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("就绪")
 
-        # 启用按钮
-        self.set_buttons_enabled(True)
+        # 没有待执行的修改操作时启用按钮
+        if not self.has_pending_mutations():
+            self.set_buttons_enabled(True)
 
-        if success:
-            if data is not None:  # 获取数据操作
-                self.team_data = data
+        # 连接测试的结果由配置对话框处理
+        if job.operation == "test_connection":
+            return
+        if job.operation == "debug_team_data":
+            if success:
+                self.show_debug_report(job.kwargs['snapshot'], data)
+            else:
+                self.log_error("调试失败", message)
+            return
+        # 并发读取中更晚启动的读取已经先应用，这份结果更旧
+        if job.superseded:
+            self.log_info("数据过时", "已有更新的读取结果，忽略这次读取")
+            return
+
+        # 邀请结果逐个邮箱写入邀请历史
+        partial_invite = False
+        if job.operation == "invite_members" and isinstance(data, BatchResult):
+            self.log_invite_results(data)
+            if data.succeeded and data.failed:
+                # 部分成功：保留失败的邮箱，便于修正后重试
+                partial_invite = True
+                self.email_input.setPlainText('\n'.join(data.failed_ids() + data.skipped_ids()))
+
+        # 已删除的项目立即移出索引，刷新完成前不会被再次提交
+        if job.operation == "batch_delete" and isinstance(data, BatchResult) and data.succeeded:
+            removed = self.team_index.remove(data.succeeded)
+            if removed:
+                self.update_statistics(self.team_stats.without(removed))
+
+        # 新邀请计入统计（已在邀请记录中的邮箱不重复计数）
+        if job.operation == "invite_members" and isinstance(data, BatchResult) and data.succeeded:
+            new_invites = [email for email in data.succeeded
+                           if not any(isinstance(record, Invitation) for record in self.team_index.find_by_email(email))]
+            if new_invites and self.team_snapshot:
+                self.update_statistics(self.team_stats.with_invitations(len(new_invites)))
+            # 刷新邀请列表（后台通道）
+            if self.team_data:
+                self.load_team_data(OperationScheduler.PRIORITY_BACKGROUND)
+
+        # 批量操作被取消时记录确切的处理情况
+        if isinstance(data, BatchResult) and data.cancelled:
+            self.log_batch_operation(f"已处理的ID: {', '.join(data.processed_ids()) or '无'}")
+            self.log_batch_operation(f"未处理的ID: {', '.join(data.skipped_ids()) or '无'}")
+
+        if success and job.operation == "get_team_data" and job.stale:
+            # 读取期间有修改操作完成，丢弃这份可能包含已删除项目的数据，改用之后的读取结果
+            self.log_info("数据过时", "读取期间团队数据已被修改，等待重新读取")
+            self.api_client.invalidate_team_cache()
+            self.load_team_data(OperationScheduler.PRIORITY_BACKGROUND)
+        elif success:
+            if data is NOT_MODIFIED:  # 数据未变化，跳过解析与界面更新
+                if not self.is_connected:
+                    self.update_connection_status(True)
+                if self.team_snapshot and self.team_stats.day != date.today():
+                    # 跨天后今日邀请数按新日期统计
+                    self.update_statistics(self.team_snapshot.current_stats())
+                self.status_label.setText(f"✅ 数据未变化 ({datetime.now().strftime('%H:%M:%S')})")
+                self.update_snapshot_label()
+            elif job.operation == "get_team_data":  # 获取数据操作
                 self.log_info("数据更新", "正在处理和显示团队数据...")
                 
                 try:
-                    # 更新界面显示
-                    self.update_team_display()
+                    self.show_team_snapshot(data)
                     
                     # 更新连接状态和通知
                     self.update_connection_status(True)
@@ -4418,23 +7747,32 @@ class TeamManagerMainWindow(QMainWindow):
                     # 记录成功日志
                     self.log_success("数据加载成功", "团队数据已更新")
                 except Exception as e:
+                    # 数据没有应用到界面：清除校验信息并在下次刷新时整表重建，避免一直得到“未变化”
+                    self.api_client.invalidate_team_cache()
+                    self.displayed_snapshot = None
                     self.log_error("数据显示错误", f"显示数据时发生错误: {str(e)}")
                     print(f"显示数据时发生错误: {str(e)}")
             else:  # 其他操作
                 if "邀请" in message:
-                    self.log_invite_history(message)
                     self.log_success("邀请成功", message)
                     self.show_notification("✅ 邀请成功", message, "success")
                 elif "删除" in message:
                     self.log_batch_operation(message)
-                    self.log_success("操作完成", message)
-                    self.show_notification("✅ 操作完成", message, "success")
-                    # 自动刷新数据
+                    if isinstance(data, BatchResult) and data.cancelled:
+                        self.log_warning("操作已取消", message)
+                        self.show_notification("⏹️ 操作已取消", message, "warning")
+                    else:
+                        self.log_success("操作完成", message)
+                        self.show_notification("✅ 操作完成", message, "success")
+                    # 自动刷新数据（后台通道，排队中的刷新会被合并）
                     if self.team_data:
-                        self.load_team_data()
+                        self.load_team_data(OperationScheduler.PRIORITY_BACKGROUND)
                 else:
                     self.log_success("操作完成", message)
                     self.show_notification("✅ 操作完成", message, "success")
+        elif partial_invite:
+            self.log_warning("部分邀请失败", message)
+            self.show_notification("⚠️ 部分邀请失败", message, "warning")
         else:
             self.update_connection_status(False)
             self.log_error("操作失败", message)
@@ -4633,7 +7971,7 @@ class TeamManagerMainWindow(QMainWindow):
 
     # 通知方法已替换为日志系统
 
-    def on_worker_progress(self, progress: int, status: str):
+    def on_worker_progress(self, job: ScheduledJob, progress: int, status: str):
         """工作线程进度回调"""
         self.progress_bar.setValue(progress)
         self.status_label.setText(status)
@@ -4648,156 +7986,145 @@ class TeamManagerMainWindow(QMainWindow):
         self.batch_delete_all_btn.setEnabled(enabled)
         self.switch_to_community_plan_btn.setEnabled(enabled)
         self.switch_to_max_plan_btn.setEnabled(enabled)
+        self.resume_jobs_btn.setEnabled(enabled and bool(self.pending_journal_jobs))
 
     def get_unjoined_member_ids(self) -> List[str]:
         """获取未加入成员的ID列表"""
-        if not self.team_data:
-            return []
-
-        ids = []
-        users = self.extract_users_from_data(self.team_data)
-        for user in users:
-            if not user.get('role'):  # 没有角色表示未加入
-                ids.append(user.get('id', ''))
-
-        return [id for id in ids if id]
+        return self.team_index.ids(TeamIndex.UNJOINED)
 
     def get_invitation_ids(self) -> List[str]:
         """获取邀请记录的ID列表"""
-        if not self.team_data:
-            return []
-
-        ids = []
-        invitations = self.extract_invitations_from_data(self.team_data)
-        for invitation in invitations:
-            ids.append(invitation.get('id', ''))
-
-        return [id for id in ids if id]
-
-    def extract_users_from_data(self, data) -> List[Dict]:
-        """从数据中提取用户列表"""
-        users = []
-        if isinstance(data, dict):
-            for key, value in data.items():
-                # 支持多种字段名：users, members
-                if key in ["users", "members"] and isinstance(value, list):
-                    users.extend(value)
-                elif isinstance(value, (dict, list)):
-                    users.extend(self.extract_users_from_data(value))
-        elif isinstance(data, list):
-            for item in data:
-                users.extend(self.extract_users_from_data(item))
-        return users
-
-    def extract_invitations_from_data(self, data) -> List[Dict]:
-        """从数据中提取邀请列表"""
-        invitations = []
-        if isinstance(data, dict):
-            for key, value in data.items():
-                # 支持多种字段名：invitations, invites
-                if key in ["invitations", "invites"] and isinstance(value, list):
-                    invitations.extend(value)
-                elif isinstance(value, (dict, list)):
-                    invitations.extend(self.extract_invitations_from_data(value))
-        elif isinstance(data, list):
-            for item in data:
-                invitations.extend(self.extract_invitations_from_data(item))
-        return invitations
-
-    def update_team_display(self):
-        """更新团队数据显示"""
-        if not self.team_data:
+        return self.team_index.ids(TeamIndex.INVITED)
+
+    def show_team_snapshot(self, snapshot: TeamSnapshot):
+        """显示新快照：有上一份已显示的快照时只应用差异"""
+        previous = self.displayed_snapshot
+        self.team_snapshot = snapshot
+        self.team_data = snapshot.raw
+        self.team_index = TeamIndex(snapshot)
+        self.update_snapshot_label()
+        self.update_team_display(SnapshotDiff.compute(previous, snapshot) if previous else None)
+        self.displayed_snapshot = snapshot
+
+    def update_team_display(self, diff: Optional[SnapshotDiff] = None):
+        """更新团队数据显示；传入差异时只更新变化的行"""
+        if not self.team_snapshot:
             return
 
-        # 更新成员表格
-        users = self.extract_users_from_data(self.team_data)
-        self.update_members_table(users)
-
-        # 更新邀请表格
-        invitations = self.extract_invitations_from_data(self.team_data)
-        self.update_invitations_table(invitations)
-
-        # 更新统计卡片
-        self.update_statistics(users, invitations)
-
-        # 更新原始数据显示
-        self.format_data_display()
+        users = self.team_snapshot.members
+        invitations = self.team_snapshot.invitations
+        max_rows = self.config.get('ui.max_table_rows', 200)
 
-    def update_statistics(self, users, invitations):
-        """更新统计信息"""
-        from datetime import datetime, date
+        if diff is None:
+            # 首次加载或无法按ID对齐：整表重建
+            self.update_members_table(users)
+            self.update_invitations_table(invitations)
+            self.update_statistics(self.team_snapshot.current_stats())
+        elif diff:
+            # 超出行数限制时表格只显示前 N 行，无法增量维护，退回整表重建
+            member_row_ids = None
+            if self.table_in_sync(self.member_row_ids, users, diff.members, max_rows):
+                member_row_ids = self.patch_table(self.members_table, self.member_row_ids, users,
+                                                  diff.members, self.fill_member_row)
+            if member_row_ids is None:
+                self.update_members_table(users)
+            else:
+                self.member_row_ids = member_row_ids
+            invitation_row_ids = None
+            if self.table_in_sync(self.invitation_row_ids, invitations, diff.invitations, max_rows):
+                invitation_row_ids = self.patch_table(self.invitations_table, self.invitation_row_ids, invitations,
+                                                      diff.invitations, self.fill_invitation_row)
+            if invitation_row_ids is None:
+                self.update_invitations_table(invitations)
+            else:
+                self.invitation_row_ids = invitation_row_ids
+            self.update_statistics(self.team_snapshot.current_stats())
+            self.log_info("数据变化", diff.describe())
+
+        # 更新原始数据显示：成员和邀请都没有变化时沿用已显示的文本，
+        # 数据视图不在前台时等切换过去再格式化
+        if (diff is not None and not diff and self.displayed_snapshot is not None
+                and self.raw_data_source is self.displayed_snapshot.raw):
+            self.raw_data_source = self.team_data
+        elif self.tab_widget.currentWidget() is self.data_tab:
+            self.format_data_display()
 
-        # 调试输出数据情况
-        print(f"📋 统计数据源: 用户数量={len(users)}, 邀请数量={len(invitations)}")
-        
-        # 总成员数
-        total_members = len(users)
+    @staticmethod
+    def table_in_sync(row_ids: List[str], records: Tuple[Any, ...], changes: RecordChanges, max_rows: int) -> bool:
+        """表格当前完整显示上一份快照、且应用差异后仍不超出行数限制时才能增量更新"""
+        previous_count = len(records) - len(changes.added) + len(changes.removed)
+        return len(records) <= max_rows and len(row_ids) == previous_count
 
-        # 活跃成员数（已加入的成员）
-        active_members = len([u for u in users if u.get('joinedAt')])
+    def patch_table(self, table: QTableWidget, row_ids: List[str], records: Tuple[Any, ...],
+                    changes: RecordChanges, fill_row: Callable[[int, Any], None]) -> Optional[List[str]]:
+        """按差异增量更新表格，行顺序与整表重建一致；返回更新后的行ID列表
 
-        # 待加入人数 = 邀请记录中的人数（未加入的人）
-        pending_members = len(invitations)
+        保留下来的记录在新快照中顺序发生变化时无法增量更新，返回 None 由调用方整表重建。
+        """
+        target_ids = [record.id for record in records]
+        removed = set(changes.removed)
+        added = {record.id for record in changes.added}
+        kept_ids = [record_id for record_id in row_ids if record_id not in removed]
+        if kept_ids != [record_id for record_id in target_ids if record_id not in added]:
+            return None
+
+        removed_rows = [row for row, record_id in enumerate(row_ids) if record_id in removed]
+        for row in reversed(removed_rows):
+            table.removeRow(row)
+
+        # 按新快照中的位置从前往后插入，前面的行此时已与快照一致
+        added_rows = [row for row, record_id in enumerate(target_ids) if record_id in added]
+        for row in added_rows:
+            table.insertRow(row)
+            fill_row(row, records[row])
+
+        positions = {record_id: row for row, record_id in enumerate(target_ids)}
+        for record in changes.changed:
+            row = positions.get(record.id)
+            if row is not None:
+                fill_row(row, record)
+
+        # 删除或插入位置之后的序号重新编号
+        touched = removed_rows[:1] + added_rows[:1]
+        if touched:
+            for row in range(min(touched), len(target_ids)):
+                seq_item = table.item(row, 0)
+                if seq_item is not None:
+                    seq_item.setText(str(row + 1))
+        return target_ids
+
+    def update_statistics(self, stats: TeamStats):
+        """把统计结果显示到统计卡片，数值变化时才写日志；统计由 TeamSnapshot 计算，这里只负责显示"""
+        logger.debug("统计更新: %s", stats.describe())
 
-        # 邀请记录中的总邀请 = 待加入人数
-        total_invitations = pending_members
-        
         # 更新统计卡片颜色
-        self.update_stat_card_colors(active_members, pending_members, total_invitations)
-
-        # 今日邀请人数（邀请时间为今天的邀请记录数）
-        today = date.today()
-        today_invited = 0
-        for invitation in invitations:
-            invited_at = invitation.get('invitedAt')
-            if invited_at:
-                try:
-                    # 支持时间戳（int/float）或字符串
-                    if isinstance(invited_at, (int, float)):
-                        invite_date = datetime.fromtimestamp(invited_at / 1000).date()
-                        print(f"处理时间戳: {invited_at} -> {invite_date}")
-                    elif isinstance(invited_at, str) and len(invited_at) >= 10:
-                        invite_date = datetime.fromisoformat(invited_at[:10]).date()
-                        print(f"处理字符串时间: {invited_at} -> {invite_date}")
-                    else:
-                        continue
-                    if invite_date == today:
-                        today_invited += 1
-                except Exception as e:
-                    print(f"时间解析错误: {e}, 值类型: {type(invited_at)}, 值: {invited_at}")
-                    continue
+        self.update_stat_card_colors(stats.active_members, stats.pending_members, stats.total_invitations)
 
-        # 记录统计结果
-        print(f"📊 统计更新: 总成员={total_members}, 活跃={active_members}, 待加入={pending_members}, 邀请记录={total_invitations}, 今日邀请={today_invited}")
-        
         try:
             # 直接更新统计卡片值
             if hasattr(self, 'total_members_card') and self.total_members_card is not None:
-                self.total_members_card.value_label.setText(str(total_members))
-                print(f"已更新总成员卡片: {total_members}")
+                self.total_members_card.value_label.setText(str(stats.total_members))
                 
             if hasattr(self, 'active_members_card') and self.active_members_card is not None:
-                self.active_members_card.value_label.setText(str(active_members))
-                print(f"已更新活跃成员卡片: {active_members}")
+                self.active_members_card.value_label.setText(str(stats.active_members))
                 
             if hasattr(self, 'pending_members_card') and self.pending_members_card is not None:
-                self.pending_members_card.value_label.setText(str(pending_members))
-                print(f"已更新待加入卡片: {pending_members}")
+                self.pending_members_card.value_label.setText(str(stats.pending_members))
                 
             if hasattr(self, 'total_invitations_card') and self.total_invitations_card is not None:
-                self.total_invitations_card.value_label.setText(str(total_invitations))
-                print(f"已更新总邀请卡片: {total_invitations}")
+                self.total_invitations_card.value_label.setText(str(stats.total_invitations))
                 
             if hasattr(self, 'recent_invitations_card') and self.recent_invitations_card is not None:
-                self.recent_invitations_card.value_label.setText(str(today_invited))
-                print(f"已更新今日邀请卡片: {today_invited}")
+                self.recent_invitations_card.value_label.setText(str(stats.today_invited))
                 
         except Exception as e:
-            print(f"更新统计卡片时发生错误: {e}")
+            logger.error("更新统计卡片时发生错误: %s", e)
             self.log_error("统计更新", f"更新统计卡片时发生错误: {e}")
-            
-        # 记录统计更新成功
-        self.log_info("统计更新", f"总成员: {total_members}个, 活跃: {active_members}个, 待加入: {pending_members}个, 今日邀请: {today_invited}个")
+
+        # 数值没变时不再写日志，避免重绘整个日志区域
+        if stats != self.team_stats:
+            self.team_stats = stats
+            self.log_info("统计更新", stats.describe())
 
     def update_stat_card_value(self, card_type, value):
         """更新统计卡片的数值"""
@@ -4820,7 +8147,7 @@ class TeamManagerMainWindow(QMainWindow):
             # 强制更新UI显示
             QApplication.processEvents()
         except Exception as e:
-            print(f"更新统计卡片失败 ({card_type}): {e}")
+            logger.error("更新统计卡片失败 (%s): %s", card_type, e)
             
     def update_stat_card_colors(self, active_members, pending_members, total_invitations):
         """更新统计卡片颜色，根据数值动态调整"""
@@ -4913,7 +8240,7 @@ class TeamManagerMainWindow(QMainWindow):
                 }}
             """)
 
-    def update_members_table(self, users: List[Dict]):
+    def update_members_table(self, users: Tuple[Member, ...]):
         """更新成员表格 - 优化显示格式"""
         # 应用最大行数限制
         max_rows = self.config.get('ui.max_table_rows', 200)
@@ -4925,48 +8252,45 @@ class TeamManagerMainWindow(QMainWindow):
         self.members_table.setRowCount(len(display_users))
 
         for row, user in enumerate(display_users):
-            # 序号
-            seq_item = QTableWidgetItem(str(row + 1))
-            seq_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.members_table.setItem(row, 0, seq_item)
-
-            # ID - 截断显示但保留完整信息
-            user_id = user.get('id', '')
-            id_item = QTableWidgetItem(user_id)
-            id_item.setToolTip(user_id)  # 鼠标悬停显示完整ID
-            self.members_table.setItem(row, 1, id_item)
-
-            # 邮箱
-            email = user.get('email', '')
-            email_item = QTableWidgetItem(email)
-            email_item.setToolTip(email)  # 鼠标悬停显示完整邮箱
-            self.members_table.setItem(row, 2, email_item)
-
-            # 角色
-            role = user.get('role', '未加入')
-            role_item = QTableWidgetItem(role)
-            role_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            # 根据角色设置不同颜色
-            if role == '未加入':
-                role_item.setForeground(QColor('#dc3545'))  # 红色
-            else:
-                role_item.setForeground(QColor('#28a745'))  # 绿色
-            self.members_table.setItem(row, 3, role_item)
+            self.fill_member_row(row, user)
+        self.member_row_ids = [user.id for user in display_users]
+
+    def fill_member_row(self, row: int, user: Member):
+        """填充成员表格的一行"""
+        # 序号
+        seq_item = QTableWidgetItem(str(row + 1))
+        seq_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.members_table.setItem(row, 0, seq_item)
+
+        # ID - 截断显示但保留完整信息
+        user_id = user.id
+        id_item = QTableWidgetItem(user_id)
+        id_item.setToolTip(user_id)  # 鼠标悬停显示完整ID
+        self.members_table.setItem(row, 1, id_item)
+
+        # 邮箱
+        email = user.email
+        email_item = QTableWidgetItem(email)
+        email_item.setToolTip(email)  # 鼠标悬停显示完整邮箱
+        self.members_table.setItem(row, 2, email_item)
+
+        # 角色
+        role = user.role or '未加入'
+        role_item = QTableWidgetItem(role)
+        role_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        # 根据角色设置不同颜色
+        if role == '未加入':
+            role_item.setForeground(QColor('#dc3545'))  # 红色
+        else:
+            role_item.setForeground(QColor('#28a745'))  # 绿色
+        self.members_table.setItem(row, 3, role_item)
 
-            # 加入时间
-            joined_at = user.get('joinedAt', '')
-            if joined_at:
-                try:
-                    # 尝试格式化时间戳
-                    if isinstance(joined_at, (int, float)):
-                        joined_at = datetime.fromtimestamp(joined_at / 1000).strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
-            time_item = QTableWidgetItem(str(joined_at) if joined_at else '未加入')
-            time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.members_table.setItem(row, 4, time_item)
-
-    def update_invitations_table(self, invitations: List[Dict]):
+        # 加入时间
+        time_item = QTableWidgetItem(user.joined_text)
+        time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.members_table.setItem(row, 4, time_item)
+
+    def update_invitations_table(self, invitations: Tuple[Invitation, ...]):
         """更新邀请表格 - 优化显示格式"""
         # 应用最大行数限制
         max_rows = self.config.get('ui.max_table_rows', 200)
@@ -4978,36 +8302,33 @@ class TeamManagerMainWindow(QMainWindow):
         self.invitations_table.setRowCount(len(display_invitations))
 
         for row, invitation in enumerate(display_invitations):
-            # 序号
-            seq_item = QTableWidgetItem(str(row + 1))
-            seq_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.invitations_table.setItem(row, 0, seq_item)
-
-            # ID - 截断显示但保留完整信息
-            inv_id = invitation.get('id', '')
-            id_item = QTableWidgetItem(inv_id)
-            id_item.setToolTip(inv_id)  # 鼠标悬停显示完整ID
-            self.invitations_table.setItem(row, 1, id_item)
-
-            # 邮箱
-            email = invitation.get('email', '')
-            email_item = QTableWidgetItem(email)
-            email_item.setToolTip(email)  # 鼠标悬停显示完整邮箱
-            email_item.setForeground(QColor('#fd7e14'))  # 橙色表示待处理
-            self.invitations_table.setItem(row, 2, email_item)
-
-            # 邀请时间
-            invited_at = invitation.get('invitedAt', '')
-            if invited_at:
-                try:
-                    # 尝试格式化时间戳
-                    if isinstance(invited_at, (int, float)):
-                        invited_at = datetime.fromtimestamp(invited_at / 1000).strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
-            time_item = QTableWidgetItem(str(invited_at) if invited_at else '未知时间')
-            time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.invitations_table.setItem(row, 3, time_item)
+            self.fill_invitation_row(row, invitation)
+        self.invitation_row_ids = [invitation.id for invitation in display_invitations]
+
+    def fill_invitation_row(self, row: int, invitation: Invitation):
+        """填充邀请表格的一行"""
+        # 序号
+        seq_item = QTableWidgetItem(str(row + 1))
+        seq_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.invitations_table.setItem(row, 0, seq_item)
+
+        # ID - 截断显示但保留完整信息
+        inv_id = invitation.id
+        id_item = QTableWidgetItem(inv_id)
+        id_item.setToolTip(inv_id)  # 鼠标悬停显示完整ID
+        self.invitations_table.setItem(row, 1, id_item)
+
+        # 邮箱
+        email = invitation.email
+        email_item = QTableWidgetItem(email)
+        email_item.setToolTip(email)  # 鼠标悬停显示完整邮箱
+        email_item.setForeground(QColor('#fd7e14'))  # 橙色表示待处理
+        self.invitations_table.setItem(row, 2, email_item)
+
+        # 邀请时间
+        time_item = QTableWidgetItem(invitation.invited_text)
+        time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.invitations_table.setItem(row, 3, time_item)
 
     def log_invite_history(self, message: str):
         """记录邀请历史"""
@@ -5015,6 +8336,16 @@ class TeamManagerMainWindow(QMainWindow):
         log_entry = f"[{timestamp}] {message}\n"
         self.invite_history.append(log_entry)
 
+    def log_invite_results(self, result: BatchResult):
+        """把邀请结果逐个邮箱写入邀请历史"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        lines = [f"[{timestamp}] {result.summary().splitlines()[0]}"]
+        succeeded = set(result.succeeded)
+        lines.extend(f"    ✅ {email}" for email in result.item_ids if email in succeeded)
+        lines.extend(f"    ❌ {email} - {result.failed[email].splitlines()[0]}" for email in result.failed_ids())
+        lines.extend(f"    ⏸️ {email} - 未发送" for email in result.skipped_ids())
+        self.invite_history.append('\n'.join(lines) + '\n')
+
     def log_batch_operation(self, message: str):
         """记录批量操作日志"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -5032,9 +8363,23 @@ class TeamManagerMainWindow(QMainWindow):
             self.log_info("自动刷新", "已禁用自动刷新")
 
     def auto_refresh_data(self):
-        """自动刷新数据"""
-        if self.team_data and not (self.worker_thread and self.worker_thread.isRunning()):
-            self.load_team_data()
+        """自动刷新数据，熔断期间暂停"""
+        if not self.team_data:
+            return
+        if self.api_client.breaker.blocking(self.config.get('api.headers.cookie', '')):
+            if not self.refresh_paused:
+                self.refresh_paused = True
+                self.log_warning("自动刷新已暂停", self.api_client.breaker.describe())
+            return
+        if self.api_client.session_is_stale():
+            if not self.refresh_paused:
+                self.refresh_paused = True
+                self.log_warning("自动刷新已暂停", "Cookie 会话按以往有效期估算已过期，请更新 Cookie 后手动刷新")
+            return
+        if self.refresh_paused:
+            self.refresh_paused = False
+            self.log_info("自动刷新", "熔断已解除，尝试恢复自动刷新")
+        self.load_team_data(OperationScheduler.PRIORITY_BACKGROUND)
 
     # ==================== 菜单事件处理 ====================
 
@@ -5047,9 +8392,11 @@ class TeamManagerMainWindow(QMainWindow):
 
     def apply_config(self):
         """应用新的配置设置"""
-        print("正在应用新的配置设置...")
-        # 重新初始化API客户端
-        self.api_client = APIClient(self.config)
+        logger.info("正在应用新的配置设置...")
+        configure_logging(self.config)
+        # 保留API客户端与连接池，仅在主机/代理/SSL设置变化时重建连接
+        if self.api_client.reload_config():
+            self.log_info("连接池", "传输相关设置已变化，已重建HTTP连接")
         
         # 更新刷新定时器
         self.update_refresh_timer()
@@ -5218,6 +8565,8 @@ def main():
     try:
         # 创建主窗口
         window = TeamManagerMainWindow()
+        # 任何方式退出事件循环前都完成清理
+        app.aboutToQuit.connect(window._shutdown)
 
         # 居中显示窗口
         try:
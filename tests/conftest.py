@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""测试公共配置；缺少运行依赖（PyQt6、requests）时跳过全部测试"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 表格测试会创建主窗口，没有显示器时使用离屏平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import PyQt6  # noqa: F401
+    import requests  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture
+def config(tmp_path):
+    """写在临时目录的配置"""
+    from team_manager import Config
+    config = Config(str(tmp_path / "team_manager_config.json"))
+    config.set('api.base_url', "http://test.invalid/api")
+    config.set('api.headers.cookie', "_session=test")
+    return config
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    """重试退避不真正等待"""
+    from team_manager import RetryPolicy
+    monkeypatch.setattr(RetryPolicy, "compute_delay", lambda self, attempt, response=None: 0.0)
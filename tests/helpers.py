@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""测试用的假传输层与响应构造"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def make_response(status: int, body: Any = b"", headers: Optional[Dict[str, str]] = None) -> "requests.Response":
+    """构造一个 requests.Response；body 为 dict/list 时按 JSON 编码"""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode("utf-8")
+    elif isinstance(body, str):
+        body = body.encode("utf-8")
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+
+class FakeTransport:
+    """与 HTTPTransport 接口相同的假传输层：按 handler 返回响应或抛出异常，并记录每个请求"""
+
+    def __init__(self, handler: Callable[[str, str, Dict[str, Any]], "requests.Response"]):
+        self.handler = handler
+        self.recorder = None
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs):
+        with self._lock:
+            self.calls.append((method, url, kwargs))
+        return self.handler(method, url, kwargs)
+
+    def configure(self, config) -> bool:
+        return False
+
+    def close(self):
+        pass
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""APIClient：/team 请求合并"""
+
+import threading
+
+from team_manager import APIClient, NOT_MODIFIED
+
+from helpers import FakeTransport, make_response
+
+TEAM = {"users": [{"id": "u1", "email": "a@example.com"}], "invitations": []}
+
+
+def etag_handler(gate: threading.Event = None):
+    """/team 返回带 ETag 的数据，携带匹配的 If-None-Match 时返回 304；gate 未打开前阻塞"""
+    def handler(method, url, kwargs):
+        if gate is not None:
+            gate.wait(5)
+        if kwargs.get('headers', {}).get('If-None-Match') == '"v1"':
+            return make_response(304, headers={'ETag': '"v1"'})
+        return make_response(200, TEAM, headers={'ETag': '"v1"'})
+    return handler
+
+
+def test_team_flight_not_shared_between_clients(config):
+    """缓存已热的客户端请求进行中时，冷客户端的并发请求不会拿到它的 304"""
+    gate = threading.Event()
+    warm = APIClient(config, transport=FakeTransport(etag_handler()))
+    assert warm.get_team_data() == (True, TEAM)
+    warm.transport.handler = etag_handler(gate)
+
+    cold = APIClient(config, transport=FakeTransport(etag_handler()))
+
+    results = {}
+    warm_thread = threading.Thread(target=lambda: results.setdefault('warm', warm.get_team_data()))
+    warm_thread.start()
+    while len(warm.transport.calls) < 2:
+        threading.Event().wait(0.01)
+
+    results['cold'] = cold.get_team_data()
+    gate.set()
+    warm_thread.join(5)
+
+    assert results['warm'] == (True, NOT_MODIFIED)
+    assert results['cold'] == (True, TEAM)
+    assert len(cold.transport.calls) == 1
+
+
+def test_team_flight_coalesces_within_client(config):
+    """同一客户端的并发请求只发送一次并共享结果"""
+    gate = threading.Event()
+    client = APIClient(config, transport=FakeTransport(etag_handler(gate)))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_team_data())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while client._team_flight.shared_count < 2:
+        threading.Event().wait(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [(True, TEAM)] * 3
+    assert len(client.transport.calls) == 1
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""AsyncWorker：结果经 Qt 信号从事件循环线程交回界面线程"""
+
+import threading
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from team_manager import APIClient, AsyncAPIClient, AsyncWorker, BatchResult, WorkerThread, create_worker
+
+from helpers import FakeTransport, make_response
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def run_until_finished(worker, timeout_ms=5000):
+    """启动 worker 并运行 Qt 事件循环，直到 finished 信号在界面线程中送达"""
+    received = []
+    loop = QEventLoop()
+
+    def on_finished(success, message, data):
+        received.append((success, message, data, threading.current_thread() is threading.main_thread()))
+        loop.quit()
+
+    worker.finished.connect(on_finished)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    worker.start()
+    loop.exec()
+    assert received, "finished 信号未送达"
+    return received[0]
+
+
+def make_clients(config, handler):
+    config.set('performance.async_batch', True)
+    api_client = APIClient(config, transport=FakeTransport(handler))
+    return api_client, AsyncAPIClient(api_client)
+
+
+def test_create_worker_uses_async_worker_for_batch_operations(config):
+    api_client, async_client = make_clients(config, lambda method, url, kwargs: make_response(200))
+    for operation in ("batch_delete", "invite_members", "put_user_on_max_plan"):
+        assert isinstance(create_worker(api_client, operation, async_client=async_client), AsyncWorker)
+    assert isinstance(create_worker(api_client, "get_team_data", async_client=async_client), WorkerThread)
+
+
+def test_batch_delete_result_delivered_on_main_thread(app, config):
+    def handler(method, url, kwargs):
+        return make_response(404 if url.endswith("/bad") else 200)
+
+    api_client, async_client = make_clients(config, handler)
+    worker = create_worker(api_client, "batch_delete", async_client=async_client, member_ids=["a", "bad", "c"])
+    progress = []
+    worker.progress.connect(lambda value, status: progress.append(value))
+
+    success, message, result, on_main_thread = run_until_finished(worker)
+
+    assert on_main_thread
+    assert not success
+    assert isinstance(result, BatchResult)
+    assert sorted(result.succeeded) == ["a", "c"]
+    assert list(result.failed) == ["bad"]
+    assert worker.isFinished() and worker.wait(0)
+    QCoreApplication.processEvents()
+    assert progress and progress[-1] == 100
+
+
+def test_invites_and_plan_switch_go_through_async_client(app, config):
+    api_client, async_client = make_clients(config, lambda method, url, kwargs: make_response(200))
+    config.set('performance.invite_chunk_size', 2)
+
+    worker = create_worker(api_client, "invite_members", async_client=async_client,
+                           emails=["a@example.com", "b@example.com", "c@example.com"])
+    success, _, result, on_main_thread = run_until_finished(worker)
+    assert success and on_main_thread
+    assert sorted(result.succeeded) == ["a@example.com", "b@example.com", "c@example.com"]
+
+    worker = create_worker(api_client, "put_user_on_max_plan", async_client=async_client)
+    success, message, _, _ = run_until_finished(worker)
+    assert success and "Max Plan" in message
+    posts = [call for call in api_client.transport.calls if call[0] == "POST"]
+    assert len(posts) == 3
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""熔断器：认证失败立即熔断直到 Cookie 变化，服务器错误按阈值与冷却时间处理"""
+
+from team_manager import APIClient, CircuitBreaker
+
+from helpers import FakeTransport, make_response
+
+
+def test_auth_failure_trips_immediately_and_waits_for_new_cookie(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("team_manager.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+
+    breaker.record(401, "old")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.reason == CircuitBreaker.AUTH
+
+    now[0] += 3600
+    assert not breaker.allow("old")
+    assert breaker.allow("new")
+    breaker.record(200, "new")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_auth_failure_on_probe_keeps_breaker_open_for_that_cookie():
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+    breaker.record(403, "old")
+    assert breaker.allow("new")
+    breaker.record(403, "new")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow("new")
+    assert breaker.allow("newer")
+
+
+def test_server_errors_use_threshold_and_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("team_manager.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+
+    breaker.record(500, "c")
+    breaker.record(None, "c")
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record(502, "c")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.reason == CircuitBreaker.UPSTREAM
+
+    assert not breaker.allow("other cookie")
+    now[0] += 60
+    assert breaker.allow("c")
+
+
+def test_client_fails_fast_after_401_until_cookie_changes(config):
+    client = APIClient(config, transport=FakeTransport(lambda method, url, kwargs: make_response(401)))
+    assert not client.get_team_data()[0]
+    assert len(client.transport.calls) == 1
+    assert not client.get_team_data()[0]
+    assert len(client.transport.calls) == 1
+
+    client.transport.handler = lambda method, url, kwargs: make_response(200, {"users": [], "invitations": []})
+    config.set('api.headers.cookie', "_session=fresh")
+    client.reload_config()
+    assert client.get_team_data()[0]
+    assert len(client.transport.calls) == 2
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""extract_team：一次遍历的结果（含顺序）与分别递归收集两类记录一致"""
+
+import random
+
+import pytest
+
+from team_manager import TeamSnapshot, extract_team
+
+
+def extract_records(data, keys):
+    """原递归实现，作为对照"""
+    records = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in keys and isinstance(value, list):
+                records.extend(value)
+            elif isinstance(value, (dict, list)):
+                records.extend(extract_records(value, keys))
+    elif isinstance(data, list):
+        for item in data:
+            records.extend(extract_records(item, keys))
+    return records
+
+
+def expected(data):
+    return (extract_records(data, TeamSnapshot.USER_KEYS),
+            extract_records(data, TeamSnapshot.INVITATION_KEYS))
+
+
+# 覆盖平铺、多层嵌套、成员记录里嵌邀请、邀请记录里嵌成员、列表套列表、键对应非列表值等结构
+FIXTURES = [
+    {"users": [{"id": "u1"}, {"id": "u2"}], "invitations": [{"id": "i1"}]},
+    {"team": {"members": [{"id": "u1"}]}, "users": [{"id": "u2"}],
+     "pages": [{"invites": [{"id": "i1"}]}, {"invitations": [{"id": "i2"}]}]},
+    {"users": [{"id": "u1", "invitations": [{"id": "i1"}]},
+               {"id": "u2", "members": [{"id": "u3"}], "detail": {"invites": [{"id": "i2"}]}}],
+     "invitations": [{"id": "i3", "users": [{"id": "u4"}]}, {"id": "i4"}]},
+    [{"members": [{"id": "u1", "users": "n/a"}]}, [{"invites": [{"id": "i1", "invites": [{"id": "i2"}]}]}]],
+    {"users": {"members": [{"id": "u1"}]}, "invitations": None, "data": [[{"users": [{"id": "u2"}]}]]},
+    {},
+    [],
+]
+
+
+@pytest.mark.parametrize("data", FIXTURES)
+def test_matches_recursive_extraction(data):
+    assert extract_team(data, TeamSnapshot.USER_KEYS, TeamSnapshot.INVITATION_KEYS) == expected(data)
+
+
+def random_node(rng, depth, counter):
+    """随机生成嵌套的字典/列表，键从两类记录键和普通键中选取"""
+    keys = TeamSnapshot.USER_KEYS + TeamSnapshot.INVITATION_KEYS + ("data", "team", "detail")
+    if depth == 0 or rng.random() < 0.3:
+        counter[0] += 1
+        return {"id": f"r{counter[0]}"}
+    if rng.random() < 0.3:
+        return [random_node(rng, depth - 1, counter) for _ in range(rng.randint(0, 3))]
+    node = {}
+    for key in rng.sample(keys, rng.randint(1, 3)):
+        if rng.random() < 0.7:
+            node[key] = [random_node(rng, depth - 1, counter) for _ in range(rng.randint(0, 3))]
+        else:
+            node[key] = random_node(rng, depth - 1, counter)
+    return node
+
+
+def test_matches_recursive_extraction_on_random_nesting():
+    rng = random.Random(22)
+    for _ in range(500):
+        data = random_node(rng, 5, [0])
+        assert extract_team(data, TeamSnapshot.USER_KEYS, TeamSnapshot.INVITATION_KEYS) == expected(data)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""邀请块的重发：只重发确定未被服务器处理的块"""
+
+import requests
+
+from team_manager import APIClient, BatchResult, WorkerThread
+
+from helpers import FakeTransport, make_response
+
+EMAILS = ["a@example.com", "b@example.com"]
+
+
+def invite(config, handler, retries=2):
+    config.set('performance.invite_chunk_retries', retries)
+    api_client = APIClient(config, transport=FakeTransport(handler))
+    worker = WorkerThread(api_client, "invite_members", emails=EMAILS)
+    result = BatchResult(EMAILS, action="邀请成员", item_name="邮箱")
+    worker.invite_chunk(EMAILS, result)
+    posts = [call for call in api_client.transport.calls if call[0] == "POST"]
+    return result, posts
+
+
+def test_rejected_chunk_is_resent_until_accepted(config):
+    responses = iter([make_response(503), make_response(429), make_response(200)])
+    result, posts = invite(config, lambda method, url, kwargs: next(responses))
+    assert len(posts) == 3
+    assert sorted(result.succeeded) == EMAILS
+
+
+def test_chunk_retries_have_their_own_budget(config):
+    result, posts = invite(config, lambda method, url, kwargs: make_response(503), retries=1)
+    assert len(posts) == 2
+    assert sorted(result.failed) == EMAILS
+
+
+def test_chunk_that_may_have_been_applied_is_not_resent(config):
+    def timeout(method, url, kwargs):
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+    for handler in (lambda method, url, kwargs: make_response(502), timeout):
+        result, posts = invite(config, handler)
+        assert len(posts) == 1
+        assert sorted(result.failed) == EMAILS
+        assert "刷新后确认" in result.failed[EMAILS[0]]
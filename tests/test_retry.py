@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""重试策略：是否重发由调用处声明的幂等性决定"""
+
+import requests
+
+from team_manager import APIClient
+
+from helpers import FakeTransport, make_response
+
+
+def failing_client(config, error):
+    config.set('performance.retry_count', 3)
+
+    def handler(method, url, kwargs):
+        raise error
+    return APIClient(config, transport=FakeTransport(handler))
+
+
+def test_post_with_timed_out_response_is_not_retried(config):
+    client = failing_client(config, requests.exceptions.ReadTimeout("read timed out"))
+    success, _ = client.invite_members(["a@example.com"])
+    assert not success
+    assert len(client.transport.calls) == 1
+
+
+def test_delete_with_timed_out_response_is_not_retried(config):
+    client = failing_client(config, requests.exceptions.ReadTimeout("read timed out"))
+    success, _ = client.delete_member("m1")
+    assert not success
+    assert len(client.transport.calls) == 1
+
+
+def test_post_that_never_connected_is_retried(config):
+    client = failing_client(config, requests.exceptions.ConnectTimeout("connect timed out"))
+    client.invite_members(["a@example.com"])
+    assert len(client.transport.calls) == 4
+
+
+def test_read_is_retried_after_timeout(config):
+    responses = [requests.exceptions.ReadTimeout("read timed out"),
+                 make_response(200, {"users": [], "invitations": []})]
+
+    def handler(method, url, kwargs):
+        item = responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    client = APIClient(config, transport=FakeTransport(handler))
+    success, _ = client.get_team_data()
+    assert success
+    assert len(client.transport.calls) == 2
+
+
+def test_rejected_delete_is_retried_after_fractional_retry_after(config):
+    responses = [make_response(429, headers={'Retry-After': '0.2'}), make_response(200)]
+    client = APIClient(config, transport=FakeTransport(lambda method, url, kwargs: responses.pop(0)))
+    success, _ = client.delete_member("m1")
+    assert success
+    assert len(client.transport.calls) == 2
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""按差异增量更新的表格与整表重建的结果一致（行顺序、行数限制）"""
+
+import copy
+import random
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from team_manager import TeamManagerMainWindow, TeamSnapshot
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def windows(app, tmp_path, monkeypatch):
+    """两个主窗口：patched 按差异更新，rebuilt 每次整表重建"""
+    monkeypatch.chdir(tmp_path)
+    patched, rebuilt = TeamManagerMainWindow(), TeamManagerMainWindow()
+    for window in (patched, rebuilt):
+        # 日志区每条记录都重新渲染整段 HTML，与表格无关
+        window._update_log_display = lambda: None
+    yield patched, rebuilt
+    for window in (patched, rebuilt):
+        window._shutdown()
+
+
+def table_rows(table):
+    """表格每个单元格的文本、提示、颜色和对齐方式"""
+    rows = []
+    for row in range(table.rowCount()):
+        cells = []
+        for column in range(table.columnCount()):
+            item = table.item(row, column)
+            cells.append(None if item is None else
+                         (item.text(), item.toolTip(), item.foreground().color().name(), int(item.textAlignment())))
+        rows.append(cells)
+    return rows
+
+
+def table_state(window):
+    return (table_rows(window.members_table), window.member_row_ids,
+            table_rows(window.invitations_table), window.invitation_row_ids)
+
+
+class TeamGenerator:
+    """随机增删改成员与邀请，偶尔打乱顺序"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.next_id = 0
+        self.users = [self.new_user() for _ in range(rng.randint(0, 8))]
+        self.invitations = [self.new_invitation() for _ in range(rng.randint(0, 8))]
+
+    def new_id(self, prefix):
+        self.next_id += 1
+        return f"{prefix}{self.next_id}"
+
+    def timestamp(self):
+        return f"2026-10-{self.rng.randint(1, 28):02d}T{self.rng.randint(0, 23):02d}:00:00Z"
+
+    def new_user(self):
+        user_id = self.new_id("u")
+        joined = self.rng.random() < 0.7
+        return {"id": user_id, "email": f"{user_id}@example.com",
+                "role": "member" if joined else None, "joinedAt": self.timestamp() if joined else None}
+
+    def new_invitation(self):
+        invitation_id = self.new_id("i")
+        return {"id": invitation_id, "email": f"{invitation_id}@example.com", "invitedAt": self.timestamp()}
+
+    def mutate(self, records, make):
+        rng = self.rng
+        for _ in range(rng.randint(0, 2)):
+            if records:
+                records.pop(rng.randrange(len(records)))
+        for _ in range(rng.randint(0, 3)):
+            records.insert(rng.randint(0, len(records)), make())
+        for _ in range(rng.randint(0, 2)):
+            if records:
+                index = rng.randrange(len(records))
+                records[index] = dict(records[index], email=f"changed{self.new_id('e')}@example.com")
+        if len(records) > 1 and rng.random() < 0.1:
+            first, second = rng.sample(range(len(records)), 2)
+            records[first], records[second] = records[second], records[first]
+
+    def step(self):
+        self.mutate(self.users, self.new_user)
+        self.mutate(self.invitations, self.new_invitation)
+        return TeamSnapshot.from_payload(copy.deepcopy({"users": self.users, "invitations": self.invitations}))
+
+
+def test_patched_tables_match_full_rebuild(windows):
+    patched, rebuilt = windows
+    rng = random.Random(24)
+    patch_results = []
+    original_patch_table = patched.patch_table
+
+    def counting_patch_table(*args):
+        row_ids = original_patch_table(*args)
+        patch_results.append(row_ids is not None)
+        return row_ids
+
+    patched.patch_table = counting_patch_table
+
+    for sequence in range(20):
+        generator = TeamGenerator(rng)
+        patched.displayed_snapshot = None
+        for step in range(15):
+            if rng.random() < 0.1:
+                # 修改行数限制后与设置界面相同，按当前快照整表重建
+                max_rows = rng.randint(3, 15)
+                for window in (patched, rebuilt):
+                    window.config.set('ui.max_table_rows', max_rows)
+                    window.apply_table_row_limit()
+            snapshot = generator.step()
+            patched.show_team_snapshot(snapshot)
+            rebuilt.displayed_snapshot = None
+            rebuilt.show_team_snapshot(snapshot)
+            assert table_state(patched) == table_state(rebuilt), f"序列 {sequence} 第 {step} 步"
+
+    # 增量路径确实被走到，而不是每次都退回整表重建
+    assert sum(patch_results) > 100
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""TeamStats 由 TeamSnapshot 计算，跨天后按新日期统计今日邀请数"""
+
+from datetime import date, datetime, timedelta
+
+import team_manager
+from team_manager import TeamSnapshot
+
+TODAY = date(2026, 10, 17)
+
+
+class FakeDate(date):
+    today_value = TODAY
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_snapshot_stats_follow_the_day(monkeypatch):
+    monkeypatch.setattr(team_manager, "date", FakeDate)
+    FakeDate.today_value = TODAY
+    invited = [datetime(2026, 10, 17, 9).isoformat(), datetime(2026, 10, 18, 9).isoformat()]
+    snapshot = TeamSnapshot.from_payload({
+        "users": [{"id": "u1", "email": "a@example.com", "role": "member", "joinedAt": invited[0]},
+                  {"id": "u2", "email": "b@example.com"}],
+        "invitations": [{"id": "i1", "email": "c@example.com", "invitedAt": invited[0]},
+                        {"id": "i2", "email": "d@example.com", "invitedAt": invited[1]}],
+    })
+
+    stats = snapshot.current_stats()
+    assert (stats.total_members, stats.active_members, stats.pending_members) == (2, 1, 2)
+    assert stats.today_invited == 1 and stats.day == TODAY
+    assert snapshot.current_stats() is stats
+
+    FakeDate.today_value = TODAY + timedelta(days=1)
+    next_day = snapshot.current_stats()
+    assert next_day.today_invited == 1 and next_day.day == TODAY + timedelta(days=1)
+    assert next_day._replace(today_invited=0, day=None) == stats._replace(today_invited=0, day=None)